@@ -33,11 +33,118 @@ class Config:
     # YouTube OAuth2
     CLIENT_SECRET_FILE: Path = CREDENTIALS_DIR / "client_secret.json"
     TOKEN_FILE: Path = CREDENTIALS_DIR / "token.json"
+    DISCOVERY_CACHE_FILE: Path = CREDENTIALS_DIR / "youtube-v3-discovery.json"
+
+    # 트렌드 소스 (modules/trend_sources.SOURCE_TYPES의 type + 어댑터 생성자 인자)
+    # 소스별로 limit / concurrency(동시 요청 수) / timeout(초) 지정 가능
+    TREND_SOURCES: list[dict] = [
+        {"type": "hackernews", "limit": 30, "concurrency": 16, "timeout": 20},
+        *(
+            {"type": "reddit", "subreddit": sub, "limit": 10}
+            for sub in (
+                "devops", "MachineLearning", "kubernetes",
+                "LocalLLaMA", "programming", "aws",
+            )
+        ),
+    ]
 
     # Veo 비용 (달러/초)
     VEO_COST_FAST: float = 0.10
     VEO_COST_FULL: float = 0.30
     VEO_CLIP_DURATION: int = 8
+    VEO_DURATIONS: tuple[int, ...] = (4, 6, 8)  # Veo 3.1 지원 클립 길이(초)
+
+    # Remotion 렌더링 전 프록시 변환 (장면 길이로 트리밍 + 짧은 GOP 재인코딩)
+    RENDER_PROXIES: bool = True
+    PROXY_GOP: int = 1  # 1 = all-intra
+    PROXY_CRF: int = 16
+    PROXY_WORKERS: int = os.cpu_count() or 4
+
+    # 프레임 구간 샤드 렌더링 (0 = 코어/메모리 기준 자동, 1 = 단일 프로세스)
+    RENDER_SHARDS: int = int(os.getenv("RENDER_SHARDS", "0"))
+    RENDER_CORES_PER_SHARD: int = 2
+    RENDER_MEMORY_PER_SHARD: int = 2 * 1024**3  # Chrome + 인코더 1세트
+    RENDER_MIN_FRAMES_PER_SHARD: int = 300
+    RENDER_SHARD_RETRIES: int = 1
+
+    # Veo 첫 프레임 준비: 키프레임을 Veo 해상도(720p 9:16)로 맞춰 JPEG 재인코딩
+    # (원본 PNG는 보관, KEYFRAME_PREP=0이면 원본 그대로 전송)
+    KEYFRAME_PREP: bool = os.getenv("KEYFRAME_PREP", "1") == "1"
+    KEYFRAME_SIZE: tuple[int, int] = (720, 1280)
+    KEYFRAME_JPEG_QSCALE: int = 2  # ffmpeg mjpeg -q:v (2 = 최고 품질, 31 = 최저)
+
+    # 검토용 드래프트 렌더링 (540x960, 15fps)
+    DRAFT_SCALE: float = 0.5
+    DRAFT_FPS: int = 15
+    DRAFT_CRF: int = 30
+
+    # 업로드 전 트랜스코드 (YouTube 1080p 30fps SDR 권장: 영상 8Mbps, 오디오 128kbps)
+    UPLOAD_TRANSCODE: bool = os.getenv("UPLOAD_TRANSCODE", "") == "1"
+    UPLOAD_VIDEO_BITRATE: int = 8_000_000
+    UPLOAD_AUDIO_BITRATE: int = 128_000
+    UPLOAD_CRF: int = 20
+    UPLOAD_PRESET: str = "medium"
+    UPLOAD_MIN_SAVING: float = 0.2  # 예상 절감률이 이보다 작으면 원본 업로드
+
+    # 나레이션 길이 추정 (TTS 전): 분당 300자 기준 + 여유 배수
+    NARRATION_CHARS_PER_SEC: float = 5.0
+    NARRATION_DURATION_MARGIN: float = 1.15
+
+    # 비용 원장 + 예산 (0 = 한도 없음)
+    COST_LEDGER_FILE: Path = OUTPUTS_DIR / "cost_ledger.db"
+    DAILY_BUDGET_USD: float = float(os.getenv("DAILY_BUDGET_USD", "0"))
+    MONTHLY_BUDGET_USD: float = float(os.getenv("MONTHLY_BUDGET_USD", "0"))
+
+    # 단계별 프롬프트 입력 토큰 예산 (modules/prompt_builder.py)
+    # PROMPT_TOKEN_COUNTER=api면 절감량 보고에 SDK count_tokens 사용 (기본: 로컬 추정)
+    PROMPT_TOKEN_BUDGETS: dict[str, int] = {"topic": 1500, "script": 400, "seo": 1200}
+    PROMPT_TOKEN_COUNTER: str = os.getenv("PROMPT_TOKEN_COUNTER", "estimate")
+
+    # 시스템 프롬프트 컨텍스트 캐시 (PROMPT_CACHE=0이면 항상 인라인)
+    PROMPT_CACHE: bool = os.getenv("PROMPT_CACHE", "1") == "1"
+    PROMPT_CACHE_TTL: int = 3600
+    PROMPT_CACHE_REFRESH_MARGIN: int = 300  # 만료까지 이보다 적게 남으면 TTL 연장
+
+    # 작업 큐 (enqueue / worker): 리스 만료 전 하트비트로 연장, 만료되면 다른 워커가 회수
+    JOB_QUEUE_FILE: Path = OUTPUTS_DIR / "jobs.db"
+    JOB_LEASE_SECONDS: int = 300
+    JOB_HEARTBEAT_SECONDS: int = 60
+    JOB_MAX_ATTEMPTS: int = 3
+    JOB_POLL_SECONDS: float = 5.0
+
+    # 출력 정리 (gc): 업로드 후 N일 지난 중간 산출물(frames/clips/proxies) 삭제 +
+    # 하루 이상 수정이 없고 큐 작업이 남지 않은 디렉토리의 같은 내용 파일 하드링크.
+    # GC_AUTO=1이면 업로드 후 자동 실행
+    OUTPUT_INDEX_FILE: Path = OUTPUTS_DIR / "index.db"
+    GC_AUTO: bool = os.getenv("GC_AUTO", "") == "1"
+    GC_INTERMEDIATE_DAYS: int = int(os.getenv("GC_INTERMEDIATE_DAYS", "7"))
+    GC_DEDUP_MIN_AGE_DAYS: int = 1
+    GC_DEDUP_MIN_SIZE: int = 64 * 1024
+
+    # --profile 샘플링 간격(초)
+    PROFILE_INTERVAL: float = float(os.getenv("PROFILE_INTERVAL", "0.01"))
+
+    # 과금 단위당 비용 (달러): (모델, 단위) → 단가
+    UNIT_COSTS: dict[tuple[str, str], float] = {
+        ("veo-3.1-fast-generate-preview", "video_seconds"): VEO_COST_FAST,
+        ("veo-3.1-generate-preview", "video_seconds"): VEO_COST_FULL,
+        ("gemini-2.5-flash-image", "images"): 0.039,
+        ("gemini-2.5-flash", "input_tokens"): 0.30 / 1e6,
+        ("gemini-2.5-flash", "output_tokens"): 2.50 / 1e6,
+        ("gemini-2.5-flash", "cached_tokens"): 0.03 / 1e6,
+        # 오디오 출력 ~$10/1M 토큰, 한국어 1자 ≈ 5 오디오 토큰
+        ("gemini-2.5-flash-preview-tts", "tts_chars"): 0.00005,
+    }
+
+    # 모델별 요청 한도: (분당 요청 수, 최대 동시 요청 수)
+    RATE_LIMITS: dict[str, tuple[int, int]] = {
+        "gemini-2.5-flash": (60, 8),
+        "gemini-2.5-flash-image": (10, 4),
+        "gemini-2.5-flash-preview-tts": (10, 2),
+        "veo-3.1-fast-generate-preview": (10, 4),
+        "veo-3.1-generate-preview": (10, 4),
+    }
+    DEFAULT_RATE_LIMIT: tuple[int, int] = (30, 4)
 
     @classmethod
     def validate(cls, need_gemini=False, need_youtube=False):
@@ -10,19 +10,16 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent))
 
 from config import Config, log
-from modules.trends import collect_trends
-from modules.topic_selector import select_topics
-from modules.script_writer import write_script
-from modules.image_generator import generate_frames
-from modules.video_generator import generate_clips, concat_clips, estimate_cost
-from modules.tts_generator import generate_narration
-from modules.compositor import render as remotion_render
-from modules.seo_packager import generate_seo
-from modules.youtube_uploader import upload_from_dir
+from modules import profiler
+
+# 무거운 SDK(google.genai, googleapiclient 등)를 끌어오는 모듈은
+# 각 서브커맨드 안에서 import — trends/upload가 불필요한 SDK 로딩 없이 바로 시작
 
 
 def cmd_trends(args):
     """트렌드 수집만 실행"""
+    from modules.trends import collect_trends
+
     trends = collect_trends(top_n=args.top)
 
     output = Path(args.output)
@@ -36,40 +33,53 @@ def cmd_trends(args):
 
 def cmd_generate(args):
     """특정 주제로 콘텐츠 생성"""
+    from modules import cost_ledger
+    from modules.video_generator import generate_clips, concat_clips, estimate_cost
+    from modules.compositor import render as remotion_render
+
     topic = args.topic
+    cost_ledger.start_run(topic)
 
     # 슬러그 생성
     slug = topic.lower().replace(" ", "-")[:30]
     output_dir = Config.make_output_dir(slug)
+    profiler.set_output_dir(output_dir)
     print(f"\n출력 디렉토리: {output_dir}")
 
-    # 스크립트 작성
-    print("\n--- 스크립트 작성 ---")
-    script = write_script(topic)
-    script_path = output_dir / "script.json"
-    with open(script_path, "w", encoding="utf-8") as f:
-        json.dump(script, f, ensure_ascii=False, indent=2)
-    print(f"스크립트 저장: {script_path}")
-
+    # 스크립트 작성 + 키프레임 이미지 + TTS 나레이션 (스트리밍으로 겹쳐 실행)
+    print("\n--- 스크립트 작성 + 키프레임 이미지 + TTS 나레이션 ---")
+    stages = _script_frames_narration(topic, output_dir, args)
+    script, frames, narration = stages["script"], stages["frames"], stages["narration"]
+    durations, clip_jobs = stages["durations"], stages["clip_jobs"]
     if "raw_response" in script:
         print("스크립트 JSON 파싱 실패. script.json을 확인하세요.")
         return
-
-    # 이미지 생성
-    print("\n--- 키프레임 이미지 생성 ---")
-    frames = generate_frames(script, output_dir)
     if not frames:
         print("이미지 생성 실패. 파이프라인 중단.")
         return
 
-    # 비용 체크포인트
+    if args.draft:
+        _render_draft(script, frames, narration, output_dir)
+
+    # 비용 체크포인트 (장면별 계획된 클립 길이 기준)
     quality = args.quality
     num_clips = len(frames)
-    cost = estimate_cost(num_clips, quality)
+    planned = [durations[f["scene"] - 1] for f in frames]
+    cost = estimate_cost(planned, quality)
     print(f"\n--- 비용 체크포인트 ---")
     print(f"  클립 수: {num_clips}")
+    print(f"  클립 길이: {', '.join(f'{d}초' for d in planned)} (총 {sum(planned)}초)")
     print(f"  품질: {quality}")
     print(f"  예상 비용: ${cost:.2f}")
+    # --auto로 이미 시작된 클립은 시작 전에 예산을 확인했고, 일부는 이미 원장에
+    # 기록됐을 수 있으므로 다시 확인하지 않음 (중복 계산으로 지불한 클립을 버리게 됨)
+    if not clip_jobs:
+        try:
+            cost_ledger.check_budget(cost)
+        except cost_ledger.BudgetExceeded as e:
+            print(f"  {e}. 영상 생성 중단.")
+            _generate_seo_and_save(script, output_dir)
+            return
 
     if not args.auto:
         confirm = input("  영상 생성을 진행하시겠습니까? (y/N): ").strip().lower()
@@ -78,22 +88,23 @@ def cmd_generate(args):
             _generate_seo_and_save(script, output_dir)
             return
 
-    # 영상 클립 생성
+    # 영상 클립 생성 (--auto면 키프레임 완성 즉시 이미 시작됨)
     print("\n--- 영상 클립 생성 ---")
-    clips = generate_clips(frames, script, output_dir, quality=quality)
-
-    # TTS 나레이션 생성
-    print("\n--- TTS 나레이션 생성 ---")
-    narration = generate_narration(script, output_dir)
-    if narration:
-        print(f"나레이션: {narration['path']} ({narration['duration']:.1f}초)")
+    profiler.stage("clips")
+    if clip_jobs:
+        clips = clip_jobs.results()
     else:
-        print("나레이션 생성 실패. 나레이션 없이 계속 진행.")
+        clips = generate_clips(
+            frames, script, output_dir, quality=quality, durations=durations
+        )
 
     # Remotion 합성 (Veo 클립 + 자막 + 나레이션)
     if clips:
         print("\n--- Remotion 영상 합성 ---")
-        final = remotion_render(script, clips, narration, output_dir)
+        profiler.stage("render")
+        final = remotion_render(
+            script, clips, narration, output_dir, force=args.force_render
+        )
         if final:
             print(f"최종 영상: {final}")
         else:
@@ -111,12 +122,118 @@ def cmd_generate(args):
     # 업로드
     if args.upload:
         privacy = "public" if args.public else "private"
-        cmd_upload_dir(str(output_dir), privacy)
+        cmd_upload_dir(str(output_dir), privacy, optimize=args.optimize_upload)
+
+
+def _script_frames_narration(
+    topic: str, output_dir: Path, args, source_url: str = "", summary: str = ""
+) -> dict:
+    """스크립트 스트리밍 → 장면이 완성되는 즉시 키프레임 생성 + TTS 나레이션
+
+    나레이션은 키프레임 생성과 겹쳐 실행되고, 그 길이로 장면별 Veo 클립 길이를
+    계획한다. --auto 모드에서는 비용 확인이 없으므로 키프레임이 나오는 대로
+    Veo 클립 생성까지 바로 시작한다.
+
+    Returns:
+        {"script", "frames", "narration", "durations", "clip_jobs"}
+        — clip_jobs는 --auto가 아니면 None
+    """
+    from modules.script_writer import write_script
+    from modules.image_generator import FrameJobs
+    from modules import cost_ledger
+    from modules.video_generator import ClipJobs, estimate_cost
+    from modules.tts_generator import generate_narration
+    from modules.scene_timing import plan_clip_durations
+
+    clip_jobs = ClipJobs(output_dir, quality=args.quality) if args.auto else None
+    frame_jobs = FrameJobs(
+        output_dir, on_frame=clip_jobs.submit if clip_jobs else None
+    )
+    result = {
+        "script": None, "frames": [], "narration": None,
+        "durations": [], "clip_jobs": clip_jobs,
+    }
+
+    # 중간에 예외가 나면 작업을 취소 (--auto의 클립 작업은 set_durations()까지
+    # 대기하므로 취소하지 않으면 종료 시 스레드가 끝나지 않음)
+    try:
+        profiler.stage("script")
+        script = write_script(
+            topic, source_url=source_url, summary=summary, on_scene=frame_jobs.submit
+        )
+        result["script"] = script
+        script_path = output_dir / "script.json"
+        with open(script_path, "w", encoding="utf-8") as f:
+            json.dump(script, f, ensure_ascii=False, indent=2)
+        print(f"스크립트 저장: {script_path}")
+
+        if "raw_response" in script:
+            frame_jobs.cancel()
+            if clip_jobs:
+                clip_jobs.cancel()
+            result["clip_jobs"] = None
+            return result
+
+        # 스트리밍 중 놓친 장면이 있으면 마저 제출
+        frame_jobs.submit_remaining(script.get("scenes", []))
+
+        # TTS 나레이션 (키프레임 생성과 겹쳐 실행)
+        profiler.stage("narration")
+        narration = generate_narration(script, output_dir)
+        if narration:
+            print(f"나레이션: {narration['path']} ({narration['duration']:.1f}초)")
+        else:
+            print("나레이션 생성 실패. 나레이션 없이 계속 진행.")
+        result["narration"] = narration
+
+        # 나레이션 길이(없으면 스크립트 추정)로 장면별 Veo 길이 계획
+        durations = plan_clip_durations(
+            script,
+            narration["duration"] if narration else None,
+            num_scenes=max(len(script.get("scenes", [])), frame_jobs.submitted),
+        )
+        result["durations"] = durations
+        if clip_jobs:
+            # --auto: 계획된 Veo 비용이 예산을 넘으면 시작 전에 취소 (체크포인트에서 안내)
+            try:
+                cost_ledger.check_budget(estimate_cost(durations, args.quality))
+                clip_jobs.set_durations(durations)
+            except cost_ledger.BudgetExceeded:
+                clip_jobs.cancel()
+                result["clip_jobs"] = None
+
+        profiler.stage("frames")
+        result["frames"] = frame_jobs.results()
+    except BaseException:
+        if clip_jobs:
+            clip_jobs.cancel()
+        frame_jobs.cancel()
+        raise
+    return result
+
+
+def _render_draft(script: dict, frames: list[dict], narration, output_dir: Path):
+    """Veo 생성 전 키프레임 정지 화면으로 검토용 드래프트 렌더링"""
+    from modules.compositor import render as remotion_render
+
+    print("\n--- 드래프트 렌더링 (키프레임 정지 화면) ---")
+    profiler.stage("draft")
+    draft = remotion_render(
+        script, [f["path"] for f in frames], narration, output_dir,
+        draft=True, stills=True,
+    )
+    if draft:
+        print(f"드래프트: {draft}")
+    else:
+        print("드래프트 렌더링 실패.")
 
 
 def _generate_seo_and_save(script: dict, output_dir: Path):
     """SEO 메타데이터 생성 및 저장"""
+    from modules.seo_packager import generate_seo
+
     print("\n--- SEO 패키지 생성 ---")
+    profiler.stage("seo")
     seo = generate_seo(script)
     seo_path = output_dir / "seo.json"
     with open(seo_path, "w", encoding="utf-8") as f:
@@ -125,29 +242,102 @@ def _generate_seo_and_save(script: dict, output_dir: Path):
 
 
 def cmd_upload(args):
-    """기존 영상 업로드"""
+    """기존 영상 업로드 (여러 디렉토리 지정 시 인증/서비스 1회 생성 후 재사용)"""
     privacy = "public" if args.public else "private"
-    cmd_upload_dir(args.dir, privacy)
+    for output_dir in args.dir:
+        cmd_upload_dir(output_dir, privacy, optimize=args.optimize_upload)
 
 
-def cmd_upload_dir(output_dir: str, privacy: str = "private"):
+def cmd_upload_dir(output_dir: str, privacy: str = "private", optimize: bool = False):
     """디렉토리에서 업로드 실행"""
+    from modules.youtube_uploader import upload_from_dir
+
     print(f"\n--- YouTube 업로드 ({privacy}) ---")
-    video_id = upload_from_dir(output_dir, privacy=privacy)
+    profiler.stage("upload")
+    video_id = upload_from_dir(
+        output_dir, privacy=privacy, optimize=optimize or Config.UPLOAD_TRANSCODE
+    )
     if video_id:
         print(f"업로드 성공: https://youtu.be/{video_id}")
+        _auto_gc()
     else:
         print("업로드 실패.")
 
 
+def _auto_gc():
+    """GC_AUTO=1이면 업로드 후 출력 디렉토리 정리"""
+    if Config.GC_AUTO:
+        from modules.output_gc import auto_collect
+
+        auto_collect()
+
+
+def cmd_draft(args):
+    """기존 출력 디렉토리로 드래프트 렌더링 (클립 없으면 키프레임 사용)"""
+    from modules.compositor import render as remotion_render, load_narration
+
+    output_dir = Path(args.dir).resolve()
+    script_path = output_dir / "script.json"
+    if not script_path.exists():
+        print(f"스크립트가 없습니다: {script_path}")
+        return
+    with open(script_path, encoding="utf-8") as f:
+        script = json.load(f)
+
+    clips = sorted(str(p) for p in (output_dir / "clips").glob("clip_*.mp4"))
+    stills = args.stills or not clips
+    if stills:
+        manifest_path = output_dir / "frames" / "frames_manifest.json"
+        if not manifest_path.exists():
+            print(f"키프레임이 없습니다: {manifest_path}")
+            return
+        with open(manifest_path, encoding="utf-8") as f:
+            clips = [frame["path"] for frame in json.load(f)]
+
+    draft = remotion_render(
+        script, clips, load_narration(output_dir), output_dir,
+        force=args.force_render, draft=True, stills=stills,
+    )
+    if draft:
+        print(f"드래프트: {draft}")
+    else:
+        print("드래프트 렌더링 실패.")
+
+
+def cmd_costs(args):
+    """비용 원장 집계"""
+    from modules import cost_ledger
+
+    rows = cost_ledger.summarize(group_by=args.by, since=args.since)
+    if not rows:
+        print("기록된 비용이 없습니다.")
+        return
+
+    print(f"\n{args.by:<40} {'호출':>6} {'비용':>10}")
+    for row in rows:
+        print(f"{str(row['key'] or '-'):<40} {row['calls']:>6} ${row['cost']:>9.4f}")
+    total = sum(row["cost"] for row in rows)
+    print(f"{'합계':<40} {sum(r['calls'] for r in rows):>6} ${total:>9.4f}")
+
+
 def cmd_full_pipeline(args):
     """전체 파이프라인 실행"""
+    from modules import cost_ledger
+    from modules.trends import collect_trends
+    from modules.topic_selector import select_topics
+    from modules.video_generator import generate_clips, concat_clips, estimate_cost
+    from modules.compositor import render as remotion_render
+
+    cost_ledger.start_run()
+
     # 1. 트렌드 수집
     print("=== 1/9 트렌드 수집 ===")
+    profiler.stage("trends")
     trends = collect_trends()
 
     # 2. 주제 선정
     print("\n=== 2/9 주제 선정 ===")
+    profiler.stage("topic")
     candidates = select_topics(trends)
 
     # 3. 주제 선택
@@ -174,8 +364,10 @@ def cmd_full_pipeline(args):
             return
 
     topic = selected["topic"]
+    cost_ledger.set_topic(topic)
     slug = selected.get("slug", topic.lower().replace(" ", "-")[:30])
     output_dir = Config.make_output_dir(slug)
+    profiler.set_output_dir(output_dir)
     print(f"\n출력 디렉토리: {output_dir}")
 
     # 트렌드 저장
@@ -183,33 +375,47 @@ def cmd_full_pipeline(args):
     with open(trends_path, "w", encoding="utf-8") as f:
         json.dump(trends, f, ensure_ascii=False, indent=2)
 
-    # 4. 스크립트 작성
+    # 4-6. 스크립트 작성 + 이미지 생성 + TTS (장면 스트리밍으로 겹쳐 실행)
     print("\n=== 3/9 스크립트 작성 ===")
-    script = write_script(
+    print("=== 4/9 이미지 생성 (장면 완성 즉시 시작) ===")
+    print("=== 5/9 TTS 나레이션 ===")
+    stages = _script_frames_narration(
         topic,
+        output_dir,
+        args,
         source_url=selected.get("source_url", ""),
         summary=selected.get("summary", ""),
     )
-    script_path = output_dir / "script.json"
-    with open(script_path, "w", encoding="utf-8") as f:
-        json.dump(script, f, ensure_ascii=False, indent=2)
-
+    script, frames, narration = stages["script"], stages["frames"], stages["narration"]
+    durations, clip_jobs = stages["durations"], stages["clip_jobs"]
     if "raw_response" in script:
         print("스크립트 JSON 파싱 실패. script.json을 확인하세요.")
         return
-
-    # 5. 이미지 생성
-    print("\n=== 4/9 이미지 생성 ===")
-    frames = generate_frames(script, output_dir)
     if not frames:
         print("이미지 생성 실패.")
         return
 
-    # 비용 체크포인트
+    if args.draft:
+        _render_draft(script, frames, narration, output_dir)
+
+    # 비용 체크포인트 (장면별 계획된 클립 길이 기준)
     quality = args.quality
-    cost = estimate_cost(len(frames), quality)
+    planned = [durations[f["scene"] - 1] for f in frames]
+    cost = estimate_cost(planned, quality)
     print(f"\n--- 비용 체크포인트 ---")
-    print(f"  클립 수: {len(frames)}, 품질: {quality}, 예상 비용: ${cost:.2f}")
+    print(
+        f"  클립 수: {len(frames)} (총 {sum(planned)}초), "
+        f"품질: {quality}, 예상 비용: ${cost:.2f}"
+    )
+    # --auto로 이미 시작된 클립은 시작 전에 예산을 확인했고, 일부는 이미 원장에
+    # 기록됐을 수 있으므로 다시 확인하지 않음 (중복 계산으로 지불한 클립을 버리게 됨)
+    if not clip_jobs:
+        try:
+            cost_ledger.check_budget(cost)
+        except cost_ledger.BudgetExceeded as e:
+            print(f"  {e}. 영상 생성 중단.")
+            _generate_seo_and_save(script, output_dir)
+            return
 
     if not args.auto:
         confirm = input("  영상 생성 진행? (y/N): ").strip().lower()
@@ -218,22 +424,23 @@ def cmd_full_pipeline(args):
             print(f"\n영상 생성 건너뜀. 출력: {output_dir}")
             return
 
-    # 6. 영상 생성
-    print("\n=== 5/9 영상 생성 ===")
-    clips = generate_clips(frames, script, output_dir, quality=quality)
-
-    # 7. TTS 나레이션
-    print("\n=== 6/9 TTS 나레이션 ===")
-    narration = generate_narration(script, output_dir)
-    if narration:
-        print(f"나레이션: {narration['duration']:.1f}초")
+    # 7. 영상 생성
+    print("\n=== 6/9 영상 생성 ===")
+    profiler.stage("clips")
+    if clip_jobs:
+        clips = clip_jobs.results()
     else:
-        print("나레이션 생성 실패. 나레이션 없이 계속 진행.")
+        clips = generate_clips(
+            frames, script, output_dir, quality=quality, durations=durations
+        )
 
     # 8. Remotion 합성
     if clips:
         print("\n=== 7/9 Remotion 합성 ===")
-        final = remotion_render(script, clips, narration, output_dir)
+        profiler.stage("render")
+        final = remotion_render(
+            script, clips, narration, output_dir, force=args.force_render
+        )
         if not final:
             print("Remotion 실패. FFmpeg 폴백...")
             final = concat_clips(clips, output_dir)
@@ -248,7 +455,203 @@ def cmd_full_pipeline(args):
     # 업로드
     if args.upload:
         privacy = "public" if args.public else "private"
-        cmd_upload_dir(str(output_dir), privacy)
+        cmd_upload_dir(str(output_dir), privacy, optimize=args.optimize_upload)
+
+
+def cmd_enqueue(args):
+    """작업 큐에 주제 추가 (워커가 script 단계부터 처리)"""
+    from modules import job_queue
+
+    options = {
+        "quality": args.quality,
+        "upload": args.upload,
+        "public": args.public,
+        "optimize_upload": args.optimize_upload,
+        "force_render": args.force_render,
+    }
+    for topic in args.topic:
+        job_id = job_queue.enqueue(topic, options=options)
+        print(f"작업 #{job_id} 추가: {topic}")
+
+
+def cmd_jobs(args):
+    """작업 큐 상태"""
+    from modules import job_queue
+
+    jobs = job_queue.list_jobs(status=args.status, limit=args.limit)
+    if not jobs:
+        print("작업이 없습니다.")
+        return
+    print(f"\n{'ID':>5} {'단계':<7} {'상태':<8} {'시도':>4}  주제")
+    for job in jobs:
+        print(
+            f"{job['id']:>5} {job['stage']:<7} {job['status']:<8} {job['attempts']:>4}"
+            f"  {job['topic']}" + (f"  ({job['error']})" if job["error"] else "")
+        )
+
+
+def cmd_worker(args):
+    """작업 큐 워커 — 지정한 단계의 작업을 가져와 처리"""
+    from modules import job_queue
+
+    handlers = {
+        "script": _job_script,
+        "video": _job_video,
+        "render": _job_render,
+        "upload": _job_upload,
+    }
+    stages = tuple(args.stages.split(",")) if args.stages else job_queue.STAGES
+    unknown = set(stages) - set(job_queue.STAGES)
+    if unknown:
+        print(f"지원하지 않는 단계: {', '.join(sorted(unknown))}")
+        return
+    job_queue.run_worker(handlers, stages=stages, once=args.once)
+
+
+def _load_script(output_dir: Path) -> dict:
+    with open(output_dir / "script.json", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _job_script(job: dict) -> str:
+    """script 단계: 스크립트 + 키프레임 + TTS 나레이션"""
+    from modules import cost_ledger
+
+    cost_ledger.start_run(job["topic"])
+    if job["output_dir"]:
+        output_dir = Path(job["output_dir"])
+    else:
+        # 같은 날 같은 주제가 여러 번 들어와도 디렉토리가 겹치지 않게 작업 ID 추가
+        slug = job["topic"].lower().replace(" ", "-")[:30]
+        output_dir = Config.make_output_dir(f"{slug}-{job['id']}")
+
+    args = argparse.Namespace(quality=job["options"].get("quality", "fast"), auto=False)
+    stages = _script_frames_narration(job["topic"], output_dir, args)
+    if "raw_response" in stages["script"]:
+        raise RuntimeError("스크립트 JSON 파싱 실패")
+    if not stages["frames"]:
+        raise RuntimeError("키프레임 생성 실패")
+    return str(output_dir)
+
+
+def _job_video(job: dict) -> str:
+    """video 단계: 나레이션 길이로 클립 길이 계획 후 Veo 클립 생성"""
+    from modules import cost_ledger
+    from modules.compositor import load_narration
+    from modules.scene_timing import plan_clip_durations
+    from modules.video_generator import generate_clips, estimate_cost
+
+    cost_ledger.start_run(job["topic"])
+    output_dir = Path(job["output_dir"])
+    quality = job["options"].get("quality", "fast")
+    script = _load_script(output_dir)
+    with open(output_dir / "frames" / "frames_manifest.json", encoding="utf-8") as f:
+        frames = json.load(f)
+    narration = load_narration(output_dir)
+
+    durations = plan_clip_durations(
+        script,
+        narration["duration"] if narration else None,
+        num_scenes=max(len(script.get("scenes", [])), len(frames)),
+    )
+    cost_ledger.check_budget(
+        estimate_cost([durations[f["scene"] - 1] for f in frames], quality)
+    )
+    clips = generate_clips(frames, script, output_dir, quality=quality, durations=durations)
+    if not clips:
+        raise RuntimeError("영상 클립 생성 실패")
+    return str(output_dir)
+
+
+def _job_render(job: dict) -> str:
+    """render 단계: Remotion 합성 (실패 시 FFmpeg 폴백) + SEO"""
+    from modules import cost_ledger
+    from modules.compositor import render as remotion_render, load_narration
+    from modules.video_generator import concat_clips
+
+    cost_ledger.start_run(job["topic"])
+    output_dir = Path(job["output_dir"])
+    script = _load_script(output_dir)
+    clips = sorted(str(p) for p in (output_dir / "clips").glob("clip_*.mp4"))
+    if not clips:
+        raise RuntimeError(f"클립이 없습니다: {output_dir / 'clips'}")
+
+    final = remotion_render(
+        script, clips, load_narration(output_dir), output_dir,
+        force=job["options"].get("force_render", False),
+    )
+    if not final:
+        print("Remotion 실패. FFmpeg 폴백으로 클립 결합...")
+        final = concat_clips(clips, output_dir)
+    if not final:
+        raise RuntimeError("영상 합성 실패")
+
+    _generate_seo_and_save(script, output_dir)
+    return str(output_dir)
+
+
+def _job_upload(job: dict) -> str:
+    """upload 단계: YouTube 업로드"""
+    from modules.youtube_uploader import upload_from_dir
+
+    options = job["options"]
+    video_id = upload_from_dir(
+        job["output_dir"],
+        privacy="public" if options.get("public") else "private",
+        optimize=options.get("optimize_upload") or Config.UPLOAD_TRANSCODE,
+    )
+    if not video_id:
+        raise RuntimeError("업로드 실패")
+    print(f"업로드 성공: https://youtu.be/{video_id}")
+    _auto_gc()
+    return job["output_dir"]
+
+
+def cmd_gc(args):
+    """출력 디렉토리 정리 + 인덱스 갱신"""
+    from modules import output_gc
+
+    report = output_gc.collect(days=args.days, dedup=not args.no_dedup, dry_run=args.dry_run)
+    prefix = "(dry-run) " if args.dry_run else ""
+    print(f"\n{prefix}출력 디렉토리 {report.dirs}개, 파일 {report.files}개 ({report.bytes / 1e6:.1f}MB)")
+    print(f"  하드링크: {report.linked}개 ({report.linked_bytes / 1e6:.1f}MB 회수, 새로 해시 {report.hashed}개)")
+    print(f"  중간 산출물 삭제: {len(report.pruned_dirs)}개 디렉토리 ({report.pruned_bytes / 1e6:.1f}MB)")
+    for name in report.pruned_dirs:
+        print(f"    {name}")
+    if args.list and not args.dry_run:
+        print(f"\n{'디렉토리':<45} {'크기':>9}  영상")
+        for row in output_gc.list_outputs(limit=args.list):
+            video = f"https://youtu.be/{row['video_id']}" if row["video_id"] else "-"
+            print(f"{row['dir']:<45} {row['bytes'] / 1e6:>7.1f}MB  {video}")
+
+
+def cmd_serve(args):
+    """상주 모드 — 스케줄/HTTP 트리거로 파이프라인 반복 실행 (클라이언트 재사용)"""
+    from modules.daemon import serve
+    from modules.gemini_client import get_client
+    from modules.compositor import warm_up as warm_up_remotion
+
+    # --at/--interval 둘 다 없으면 HTTP 트리거로만 실행
+    at_times = [t.strip() for t in args.at.split(",") if t.strip()] if args.at else []
+
+    # 첫 실행 전에 미리 데워두기: Gemini 클라이언트, YouTube 서비스, Remotion 설치 확인
+    get_client()
+    if args.upload:
+        from modules.youtube_uploader import _get_authenticated_service
+        _get_authenticated_service()
+    warm_up_remotion()
+
+    def run_pipeline(topic: str | None):
+        run_args = argparse.Namespace(**{**vars(args), "auto": True, "topic": topic})
+        if topic:
+            cmd_generate(run_args)
+        else:
+            cmd_full_pipeline(run_args)
+
+    serve(
+        run_pipeline, at_times=at_times, interval_min=args.interval,
+        host=args.host, port=args.port,
+    )
 
 
 def main():
@@ -264,6 +667,17 @@ def main():
   python main.py trends                 트렌드 수집만
   python main.py generate --topic "K8s" 특정 주제로 생성
   python main.py upload --dir outputs/  기존 영상 업로드
+  python main.py draft --dir outputs/   저해상도 드래프트 렌더링
+  python main.py costs --by topic       비용 원장 집계 (day/topic/model/stage)
+  python main.py --upload serve --at 09:00,18:00
+                                        상주 모드 (매일 09:00/18:00 실행)
+  python main.py --upload enqueue --topic "K8s" "Rust"
+                                        작업 큐에 주제 추가
+  python main.py worker --stages render 렌더링 작업만 처리하는 워커
+  python main.py jobs                   작업 큐 상태
+  python main.py gc --dry-run           출력 디렉토리 정리 미리보기
+  python main.py --profile generate --topic "K8s"
+                                        단계별 프로파일 (출력 디렉토리/profile/)
 """,
     )
 
@@ -275,6 +689,22 @@ def main():
         "--quality", choices=["fast", "full"], default="fast",
         help="Veo 품질 (fast=$0.10/s, full=$0.30/s)",
     )
+    parser.add_argument(
+        "--optimize-upload", action="store_true",
+        help="업로드 전 YouTube 권장 비트레이트로 트랜스코드 (절감이 클 때만)",
+    )
+    parser.add_argument(
+        "--draft", action="store_true",
+        help="Veo 생성 전 키프레임으로 저해상도 드래프트 렌더링 (draft_shorts.mp4)",
+    )
+    parser.add_argument(
+        "--force-render", action="store_true",
+        help="입력이 이전 렌더링과 같아도 Remotion 다시 렌더링",
+    )
+    parser.add_argument(
+        "--profile", action="store_true",
+        help="단계별 CPU/I/O 대기/자식 프로세스 시간 + 플레임그래프 (출력 디렉토리/profile/)",
+    )
 
     subparsers = parser.add_subparsers(dest="command")
 
@@ -289,16 +719,86 @@ def main():
 
     # upload 서브커맨드
     p_upload = subparsers.add_parser("upload", help="기존 영상 업로드")
-    p_upload.add_argument("--dir", required=True, help="출력 디렉토리 경로")
+    p_upload.add_argument("--dir", required=True, nargs="+", help="출력 디렉토리 경로 (여러 개 가능)")
+
+    # draft 서브커맨드
+    p_draft = subparsers.add_parser("draft", help="저해상도 드래프트 렌더링")
+    p_draft.add_argument("--dir", required=True, help="출력 디렉토리 경로")
+    p_draft.add_argument(
+        "--stills", action="store_true", help="Veo 클립이 있어도 키프레임 정지 화면 사용"
+    )
+
+    # costs 서브커맨드
+    p_costs = subparsers.add_parser("costs", help="비용 원장 집계")
+    p_costs.add_argument(
+        "--by", choices=["day", "topic", "model", "stage"], default="day",
+        help="집계 기준",
+    )
+    p_costs.add_argument("--since", help="시작 날짜 (YYYY-MM-DD)")
+
+    # serve 서브커맨드
+    p_serve = subparsers.add_parser("serve", help="상주 모드 (스케줄 실행 + 로컬 상태/트리거)")
+    p_serve.add_argument("--at", help="매일 실행 시각 (HH:MM, 쉼표 구분)")
+    p_serve.add_argument("--interval", type=int, default=0, help="실행 간격 (분)")
+    p_serve.add_argument("--host", default="127.0.0.1", help="상태/트리거 HTTP 주소")
+    p_serve.add_argument("--port", type=int, default=8765, help="상태/트리거 HTTP 포트")
+
+    # enqueue / worker / jobs 서브커맨드 (작업 큐)
+    p_enqueue = subparsers.add_parser("enqueue", help="작업 큐에 주제 추가")
+    p_enqueue.add_argument("--topic", required=True, nargs="+", help="주제 (여러 개 가능)")
+
+    p_worker = subparsers.add_parser("worker", help="작업 큐 워커 실행")
+    p_worker.add_argument(
+        "--stages",
+        help="처리할 단계 (쉼표 구분: script,video,render,upload — 기본: 전체)",
+    )
+    p_worker.add_argument("--once", action="store_true", help="대기 작업이 없으면 종료")
+
+    p_jobs = subparsers.add_parser("jobs", help="작업 큐 상태")
+    p_jobs.add_argument("--status", choices=["pending", "leased", "done", "failed"])
+    p_jobs.add_argument("--limit", type=int, default=50)
+
+    # gc 서브커맨드
+    p_gc = subparsers.add_parser("gc", help="출력 디렉토리 정리 (하드링크 중복 제거 + 중간 산출물 삭제)")
+    p_gc.add_argument(
+        "--days", type=int, default=Config.GC_INTERMEDIATE_DAYS,
+        help="업로드 후 이 일수가 지난 디렉토리의 frames/clips/proxies 삭제 (음수면 삭제 안 함)",
+    )
+    p_gc.add_argument("--no-dedup", action="store_true", help="같은 내용 파일 하드링크 안 함")
+    p_gc.add_argument("--dry-run", action="store_true", help="파일은 건드리지 않고 결과만 출력")
+    p_gc.add_argument("--list", type=int, nargs="?", const=50, help="인덱스의 출력 디렉토리 목록")
 
     args = parser.parse_args()
 
+    if args.profile:
+        profiler.start(first_stage=args.command or "pipeline")
+    try:
+        _dispatch(args)
+    finally:
+        profiler.stop()
+
+
+def _dispatch(args):
     if args.command == "trends":
         cmd_trends(args)
     elif args.command == "generate":
         cmd_generate(args)
     elif args.command == "upload":
         cmd_upload(args)
+    elif args.command == "draft":
+        cmd_draft(args)
+    elif args.command == "costs":
+        cmd_costs(args)
+    elif args.command == "serve":
+        cmd_serve(args)
+    elif args.command == "enqueue":
+        cmd_enqueue(args)
+    elif args.command == "worker":
+        cmd_worker(args)
+    elif args.command == "jobs":
+        cmd_jobs(args)
+    elif args.command == "gc":
+        cmd_gc(args)
     else:
         cmd_full_pipeline(args)
 
@@ -1,15 +1,152 @@
 """Remotion 기반 영상 합성 — Veo 클립 + 자막 + 나레이션"""
+import os
 import json
+import hashlib
+import time
 import subprocess
 import logging
 import math
+import wave
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
 from config import Config
+from modules.scene_timing import plan_clip_durations
 
 log = logging.getLogger("shorts.compositor")
 
 FPS = 30
 REMOTION_DIR = Path(__file__).parent.parent / "remotion"
+WIDTH, HEIGHT = 1080, 1920
+
+
+def _transcode_proxy(src: str, dst: str, duration_frames: int) -> bool:
+    """클립 1개를 장면 길이로 자르고 탐색이 빠른 프록시로 변환
+
+    Veo 출력은 GOP가 길어 Remotion 프레임 추출 시 매번 긴 디코딩이 필요하다.
+    1080x1920 / 30fps / 짧은 GOP(기본 all-intra)로 다시 인코딩한다.
+    ProcessPoolExecutor에서 실행되므로 모듈 최상위 함수로 둔다.
+    """
+    cmd = [
+        "ffmpeg", "-y", "-v", "error",
+        "-i", src,
+        # 프레임 올림 오차 대비 1프레임 여유
+        "-t", f"{(duration_frames + 1) / FPS:.3f}",
+        "-vf", (
+            f"scale={WIDTH}:{HEIGHT}:force_original_aspect_ratio=increase,"
+            f"crop={WIDTH}:{HEIGHT},fps={FPS}"
+        ),
+        "-c:v", "libx264", "-preset", "veryfast",
+        "-crf", str(Config.PROXY_CRF),
+        "-g", str(Config.PROXY_GOP), "-bf", "0",
+        "-pix_fmt", "yuv420p",
+        "-c:a", "aac", "-b:a", "128k",
+        "-movflags", "+faststart",
+        dst,
+    ]
+    try:
+        subprocess.run(cmd, check=True, capture_output=True, text=True)
+        return True
+    except (FileNotFoundError, subprocess.CalledProcessError):
+        return False
+
+
+def _prepare_proxies(props: dict, output_dir: Path) -> dict:
+    """장면별 클립을 병렬로 트리밍 + 프록시 변환 → props의 clipFile을 프록시로 교체
+
+    변환에 실패한 장면은 원본 클립을 그대로 사용한다.
+    """
+    proxies_dir = output_dir / "proxies"
+    proxies_dir.mkdir(exist_ok=True)
+
+    started = time.monotonic()
+    jobs = {}
+    with ProcessPoolExecutor(max_workers=Config.PROXY_WORKERS) as pool:
+        for i, scene in enumerate(props["scenes"]):
+            dst = proxies_dir / f"proxy_{i + 1:02d}.mp4"
+            jobs[i] = dst, pool.submit(
+                _transcode_proxy,
+                str(output_dir / scene["clipFile"]),
+                str(dst),
+                scene["durationFrames"],
+            )
+
+        converted = 0
+        for i, (dst, future) in jobs.items():
+            if future.result():
+                props["scenes"][i]["clipFile"] = str(dst.relative_to(output_dir))
+                converted += 1
+            else:
+                log.warning(
+                    "프록시 변환 실패, 원본 클립 사용: %s", props["scenes"][i]["clipFile"]
+                )
+
+    log.info(
+        "프록시 변환 %d/%d개 (%.1f초)",
+        converted, len(jobs), time.monotonic() - started,
+    )
+    return props
+
+
+def load_narration(output_dir: Path) -> dict | None:
+    """출력 디렉토리의 narration.wav → {"path", "duration"} (없으면 None)"""
+    path = output_dir / "narration.wav"
+    if not path.exists():
+        return None
+    with wave.open(str(path), "rb") as wf:
+        duration = wf.getnframes() / wf.getframerate()
+    return {"path": str(path), "duration": duration}
+
+
+def _clip_frames(clip_path: str, fps: int) -> int | None:
+    """ffprobe로 클립 길이(프레임) 조회 (실패하면 None — 길이 제한 없음)"""
+    cmd = [
+        "ffprobe", "-v", "error",
+        "-show_entries", "format=duration",
+        "-of", "default=noprint_wrappers=1:nokey=1",
+        clip_path,
+    ]
+    try:
+        result = subprocess.run(cmd, check=True, capture_output=True, text=True)
+        return math.floor(float(result.stdout) * fps)
+    except (FileNotFoundError, subprocess.CalledProcessError, ValueError):
+        return None
+
+
+def _split_frames(
+    total_frames: int, num_scenes: int, limits: list[int | None] | None
+) -> list[int]:
+    """총 프레임을 장면 수로 균등 분배하되 클립 길이(limits)를 넘지 않게 조정
+
+    클립이 빠져 남은 클립으로 나레이션을 채워야 할 때, 짧은 클립에 배정된 초과분을
+    여유가 있는 클립으로 넘긴다. 클립을 모두 채워도 모자라면 균등 분배한다.
+    """
+    base, remainder = divmod(total_frames, num_scenes)
+    even = [base + (1 if i < remainder else 0) for i in range(num_scenes)]
+    if not limits or None in limits:
+        return even
+    if sum(limits) < total_frames:
+        log.warning(
+            "클립 길이 합(%d프레임)이 나레이션(%d프레임)보다 짧음 — 균등 분배",
+            sum(limits), total_frames,
+        )
+        return even
+
+    # 길이 제한에 걸리는 클립부터 고정하고 나머지를 남은 클립에 다시 균등 분배
+    frames = [0] * num_scenes
+    open_scenes = list(range(num_scenes))
+    left = total_frames
+    while open_scenes:
+        share, extra = divmod(left, len(open_scenes))
+        capped = [i for i in open_scenes if limits[i] < share + (1 if extra else 0)]
+        if not capped:
+            for n, i in enumerate(open_scenes):
+                frames[i] = share + (1 if n < extra else 0)
+            break
+        for i in capped:
+            frames[i] = limits[i]
+            left -= limits[i]
+        open_scenes = [i for i in open_scenes if i not in capped]
+    return frames
 
 
 def _build_props(
@@ -17,19 +154,24 @@ def _build_props(
     clips: list[str],
     narration: dict | None,
     output_dir: Path,
+    fps: int = FPS,
+    stills: bool = False,
 ) -> dict:
-    """Remotion composition-props.json 생성"""
+    """Remotion composition-props.json 생성
+
+    stills=True면 clips 대신 키프레임 이미지 경로를 받아 정지 화면으로 배치한다.
+    """
     scenes_data = []
     scenes = script.get("scenes", [])
     subtitles = script.get("subtitles", [])
 
-    # 나레이션 duration 기반 총 프레임 계산 (없으면 클립 합산)
+    # 나레이션 duration 기반 총 프레임 계산 (없으면 계획된 클립 길이 합산)
     if narration:
         total_duration_sec = narration["duration"]
     else:
-        total_duration_sec = len(clips) * Config.VEO_CLIP_DURATION
+        total_duration_sec = sum(plan_clip_durations(script, num_scenes=len(clips)))
 
-    total_frames = math.ceil(total_duration_sec * FPS)
+    total_frames = math.ceil(total_duration_sec * fps)
 
     # 씬별 프레임 균등 분배
     num_scenes = len(clips)
@@ -37,18 +179,19 @@ def _build_props(
         log.error("합성할 클립이 없습니다")
         return {}
 
-    base_frames = total_frames // num_scenes
-    remainder = total_frames % num_scenes
+    limits = None if stills else [_clip_frames(path, fps) for path in clips]
+    frames_per_scene = _split_frames(total_frames, num_scenes, limits)
 
     for i, clip_path in enumerate(clips):
         scene = scenes[i] if i < len(scenes) else {}
-        duration_frames = base_frames + (1 if i < remainder else 0)
+        duration_frames = frames_per_scene[i]
 
         # 클립 경로를 output_dir 기준 상대 경로로 변환
         rel_clip = str(Path(clip_path).relative_to(output_dir))
 
         scenes_data.append({
-            "clipFile": rel_clip,
+            "clipFile": "" if stills else rel_clip,
+            "stillFile": rel_clip if stills else "",
             "textOverlay": scene.get("text_overlay", ""),
             "durationFrames": duration_frames,
         })
@@ -63,18 +206,65 @@ def _build_props(
         "subtitles": subtitles,
         "narrationFile": narration_file,
         "totalDurationFrames": total_frames,
+        "fps": fps,
     }
     return props
 
 
+def _hash_file(h, path: Path):
+    """파일 내용을 해시에 누적 (없는 파일은 표시만)"""
+    try:
+        with open(path, "rb") as f:
+            while chunk := f.read(1024 * 1024):
+                h.update(chunk)
+    except FileNotFoundError:
+        h.update(b"<missing>")
+
+
+def _render_fingerprint(props: dict, output_dir: Path, settings: dict) -> str:
+    """렌더링 입력 지문 — props + 참조 미디어 바이트 + Remotion 템플릿 소스 + 설정"""
+    h = hashlib.sha256()
+    h.update(json.dumps([props, settings], sort_keys=True, ensure_ascii=False).encode())
+
+    media = [scene["clipFile"] or scene["stillFile"] for scene in props["scenes"]]
+    if props.get("narrationFile"):
+        media.append(props["narrationFile"])
+    for rel in media:
+        h.update(rel.encode())
+        _hash_file(h, output_dir / rel)
+
+    template_files = sorted((REMOTION_DIR / "src").rglob("*"))
+    template_files.append(REMOTION_DIR / "package.json")
+    for path in template_files:
+        if path.is_file():
+            h.update(str(path.relative_to(REMOTION_DIR)).encode())
+            _hash_file(h, path)
+    return h.hexdigest()
+
+
 def render(
     script: dict,
     clips: list[str],
     narration: dict | None,
     output_dir: Path,
+    use_proxies: bool = Config.RENDER_PROXIES,
+    shards: int | None = None,
+    force: bool = False,
+    draft: bool = False,
+    stills: bool = False,
 ) -> str | None:
     """Remotion으로 최종 영상 합성
 
+    Args:
+        use_proxies: 클립을 장면 길이로 자른 짧은 GOP 프록시로 변환 후 렌더링
+        shards: 프레임 구간 병렬 렌더링 수 (None이면 Config.RENDER_SHARDS,
+            0이면 코어/메모리 기준 자동)
+        force: 입력 지문이 이전 렌더링과 같아도 다시 렌더링
+        draft: 검토용 저해상도/저fps 빠른 렌더링 → draft_shorts.mp4
+            (프록시/샤드 없이 단일 프로세스)
+        stills: clips 자리에 frames/ 키프레임 이미지를 받아 정지 화면으로 합성
+            (Veo 생성 전 스크립트 비주얼 확인용)
+
     Returns:
         최종 영상 경로 또는 실패 시 None
     """
@@ -82,53 +272,244 @@ def render(
         log.error("합성할 클립이 없습니다")
         return None
 
+    if draft:
+        name, fps, use_proxies, shards = "draft_shorts", Config.DRAFT_FPS, False, 1
+        extra = [
+            f"--scale={Config.DRAFT_SCALE}",
+            "--x264-preset=ultrafast",
+            f"--crf={Config.DRAFT_CRF}",
+            "--jpeg-quality=60",
+        ]
+    else:
+        name, fps, extra = "final_shorts", FPS, []
+
     # 1. Props 생성
-    props = _build_props(script, clips, narration, output_dir)
+    props = _build_props(script, clips, narration, output_dir, fps=fps, stills=stills)
     if not props:
         return None
+    if stills:
+        use_proxies = False
+
+    # 입력(props, 미디어, 템플릿)이 이전 렌더링과 같으면 건너뜀
+    output_path = output_dir / f"{name}.mp4"
+    fingerprint_path = output_dir / f"{name}.fingerprint"
+    settings = {
+        "width": WIDTH, "height": HEIGHT, "extra": extra,
+        "proxies": [use_proxies, Config.PROXY_GOP, Config.PROXY_CRF],
+    }
+    fingerprint = _render_fingerprint(props, output_dir, settings)
+    if (
+        not force
+        and output_path.exists()
+        and fingerprint_path.exists()
+        and fingerprint_path.read_text().strip() == fingerprint
+    ):
+        log.info("입력 변경 없음, 렌더링 건너뜀: %s", output_path)
+        return str(output_path)
+    fingerprint_path.unlink(missing_ok=True)
+
+    if use_proxies:
+        props = _prepare_proxies(props, output_dir)
 
-    props_path = output_dir / "composition-props.json"
+    props_path = output_dir / ("draft-props.json" if draft else "composition-props.json")
     with open(props_path, "w", encoding="utf-8") as f:
         json.dump(props, f, ensure_ascii=False, indent=2)
     log.info("Remotion props 저장: %s", props_path)
 
     # 2. Remotion 렌더링
-    output_path = output_dir / "final_shorts.mp4"
+    total_frames = props["totalDurationFrames"]
+    if shards is None:
+        shards = Config.RENDER_SHARDS or _auto_shard_count(total_frames)
+    shards = max(1, min(shards, total_frames))
 
-    cmd = [
+    log.info(
+        "Remotion 렌더링 시작 (프록시 %s, 샤드 %d개)...",
+        "사용" if use_proxies else "미사용", shards,
+    )
+    started = time.monotonic()
+
+    if shards > 1:
+        rendered = _render_sharded(
+            props_path, output_dir, output_path, total_frames, shards, fps
+        )
+        if not rendered:
+            log.warning("샤드 렌더링 실패, 단일 프로세스 렌더링으로 재시도")
+    else:
+        rendered = False
+
+    if not rendered:
+        cmd = _remotion_cmd(output_path, props_path, output_dir, fps, extra)
+        if not _run_remotion(cmd, timeout=1200):
+            return None
+
+    fingerprint_path.write_text(fingerprint)
+    log.info("렌더링 완료: %s (%.1f초)", output_path, time.monotonic() - started)
+    return str(output_path)
+
+
+def _remotion_cmd(
+    output_path: Path,
+    props_path: Path,
+    output_dir: Path,
+    fps: int = FPS,
+    extra: list[str] | None = None,
+) -> list[str]:
+    """npx remotion render 명령 구성"""
+    return [
         "npx", "remotion", "render",
         "src/Root.tsx",
         "ShortsVideo",
         str(output_path),
         f"--props={props_path}",
         f"--public-dir={output_dir}",
-        "--width=1080",
-        "--height=1920",
-        f"--fps={FPS}",
+        f"--width={WIDTH}",
+        f"--height={HEIGHT}",
+        f"--fps={fps}",
+        *(extra or []),
     ]
 
-    log.info("Remotion 렌더링 시작...")
+
+def _run_remotion(cmd: list[str], timeout: int) -> bool:
+    """Remotion 프로세스 실행 (실패 원인 로깅)"""
     try:
-        result = subprocess.run(
+        subprocess.run(
             cmd,
             cwd=str(REMOTION_DIR),
             check=True,
             capture_output=True,
             text=True,
-            timeout=1200,
+            timeout=timeout,
         )
-        log.info("렌더링 완료: %s", output_path)
-        return str(output_path)
-
+        return True
     except FileNotFoundError:
         log.error(
             "npx를 찾을 수 없습니다. Node.js가 설치되어 있는지 확인하세요.\n"
             "  → brew install node && cd remotion && npm install"
         )
-        return None
+        return False
     except subprocess.CalledProcessError as e:
         log.error("Remotion 렌더링 실패:\n%s", e.stderr)
-        return None
+        return False
     except subprocess.TimeoutExpired:
-        log.error("Remotion 렌더링 타임아웃 (20분 초과)")
-        return None
+        log.error("Remotion 렌더링 타임아웃 (%d분 초과)", timeout // 60)
+        return False
+
+
+def warm_up() -> bool:
+    """상주 모드 시작 시 Remotion CLI와 헤드리스 브라우저를 미리 준비
+
+    번들은 출력 디렉토리마다 --public-dir이 달라 미리 만들어 둘 수 없으므로,
+    npx 해석 + 브라우저 다운로드만 첫 렌더링 전에 끝내 둔다.
+    """
+    started = time.monotonic()
+    ok = _run_remotion(["npx", "remotion", "browser", "ensure"], timeout=600)
+    if ok:
+        log.info("Remotion 준비 완료 (%.1f초)", time.monotonic() - started)
+    return ok
+
+
+def _available_memory_bytes() -> int:
+    """사용 가능한 메모리 (Linux: MemAvailable, 그 외: 물리 메모리)"""
+    try:
+        with open("/proc/meminfo") as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    try:
+        return os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES")
+    except (ValueError, OSError, AttributeError):
+        return 0
+
+
+def _auto_shard_count(total_frames: int) -> int:
+    """코어 수 / 메모리 / 최소 샤드 길이로 샤드 수 결정"""
+    by_cpu = (os.cpu_count() or 1) // Config.RENDER_CORES_PER_SHARD
+    memory = _available_memory_bytes()
+    by_memory = memory // Config.RENDER_MEMORY_PER_SHARD if memory else by_cpu
+    by_length = total_frames // Config.RENDER_MIN_FRAMES_PER_SHARD
+    return max(1, min(by_cpu, by_memory, by_length))
+
+
+def _render_sharded(
+    props_path: Path,
+    output_dir: Path,
+    output_path: Path,
+    total_frames: int,
+    shards: int,
+    fps: int = FPS,
+) -> bool:
+    """프레임 구간별 병렬 렌더링 → 스트림 복사 concat → 오디오 1회 mux
+
+    각 샤드는 무음 영상으로 렌더링하고, 오디오(나레이션 + 클립 소리)는
+    전체 구간을 한 번만 렌더링해 마지막에 합친다. 실패한 샤드만 재시도한다.
+    """
+    shards_dir = output_dir / "shards"
+    shards_dir.mkdir(exist_ok=True)
+
+    bounds = [total_frames * i // shards for i in range(shards + 1)]
+    concurrency = max(1, (os.cpu_count() or 1) // shards)
+    jobs = {}
+    for i in range(shards):
+        shard_path = shards_dir / f"shard_{i:02d}.mp4"
+        jobs[i] = shard_path, _remotion_cmd(
+            shard_path, props_path, output_dir, fps,
+            [
+                f"--frames={bounds[i]}-{bounds[i + 1] - 1}",
+                "--muted",
+                f"--concurrency={concurrency}",
+            ],
+        )
+    audio_path = shards_dir / "audio.aac"
+    audio_cmd = _remotion_cmd(audio_path, props_path, output_dir, fps, ["--codec=aac"])
+
+    with ThreadPoolExecutor(max_workers=shards + 1) as pool:
+        audio_future = pool.submit(_run_remotion, audio_cmd, 1200)
+        pending = dict(jobs)
+        for attempt in range(Config.RENDER_SHARD_RETRIES + 1):
+            futures = {
+                i: pool.submit(_run_remotion, cmd, 1200)
+                for i, (_, cmd) in pending.items()
+            }
+            pending = {i: jobs[i] for i, f in futures.items() if not f.result()}
+            if not pending:
+                break
+            log.warning(
+                "샤드 %s 실패 (%d/%d회)",
+                ", ".join(str(i) for i in pending),
+                attempt + 1, Config.RENDER_SHARD_RETRIES + 1,
+            )
+        audio_ok = audio_future.result()
+
+    if pending or not audio_ok:
+        return False
+    return _concat_and_mux([p for p, _ in jobs.values()], audio_path, output_path)
+
+
+def _concat_and_mux(shard_paths: list[Path], audio_path: Path, output_path: Path) -> bool:
+    """샤드 영상을 재인코딩 없이 이어붙이고 오디오 트랙 합치기"""
+    concat_list = shard_paths[0].parent / "concat_list.txt"
+    with open(concat_list, "w") as f:
+        for path in shard_paths:
+            f.write(f"file '{path}'\n")
+
+    cmd = [
+        "ffmpeg", "-y", "-v", "error",
+        "-f", "concat", "-safe", "0", "-i", str(concat_list),
+        "-i", str(audio_path),
+        "-map", "0:v:0", "-map", "1:a:0",
+        "-c", "copy",
+        "-movflags", "+faststart",
+        "-shortest",
+        str(output_path),
+    ]
+    try:
+        subprocess.run(cmd, check=True, capture_output=True, text=True)
+        return True
+    except FileNotFoundError:
+        log.error("ffmpeg가 설치되어 있지 않습니다. brew install ffmpeg")
+        return False
+    except subprocess.CalledProcessError as e:
+        log.error("샤드 결합 실패: %s", e.stderr)
+        return False
@@ -0,0 +1,179 @@
+"""비용 원장 — 호출별 실제 과금 단위를 SQLite에 누적 + 일/월 예산 사전 검사"""
+import uuid
+import contextvars
+import sqlite3
+import logging
+import threading
+from contextlib import contextmanager
+from datetime import datetime, date
+from config import Config
+
+log = logging.getLogger("shorts.cost")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS calls (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    ts TEXT NOT NULL,
+    day TEXT NOT NULL,
+    run_id TEXT,
+    topic TEXT,
+    stage TEXT NOT NULL,
+    model TEXT NOT NULL,
+    unit TEXT NOT NULL,
+    quantity REAL NOT NULL,
+    cost_usd REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_calls_day ON calls(day);
+"""
+
+_lock = threading.Lock()
+
+# 시작했지만 아직 record()하지 않은 호출의 예상 비용 합 (이 프로세스 안에서만)
+_reserved = 0.0
+
+# 현재 실행 (ID, 주제). asyncio 태스크 / asyncio.to_thread는 컨텍스트를 이어받아
+# 한 프로세스에서 동시에 진행되는 실행(Pipeline.produce)이 서로 섞이지 않는다.
+# ThreadPoolExecutor에 넘기는 작업은 contextvars.copy_context().run으로 감싼다
+# (FrameJobs / ClipJobs). 컨텍스트 밖에서 기록하면 마지막으로 시작한 실행을 쓴다.
+_run_var: contextvars.ContextVar[dict | None] = contextvars.ContextVar("cost_run", default=None)
+_last_run = {"id": None, "topic": None}
+
+
+def _current_run() -> dict:
+    return _run_var.get() or _last_run
+
+
+class BudgetExceeded(Exception):
+    """일/월 예산 초과 — 비싼 호출 전에 발생"""
+
+
+@contextmanager
+def _db():
+    """원장 DB 연결 (트랜잭션 커밋 후 닫힘)"""
+    Config.COST_LEDGER_FILE.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(str(Config.COST_LEDGER_FILE), timeout=30)
+    try:
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(_SCHEMA)
+        with conn:
+            yield conn
+    finally:
+        conn.close()
+
+
+def start_run(topic: str | None = None) -> str:
+    """이후 기록을 묶을 실행 ID 발급 (주제가 정해지면 set_topic으로 갱신)"""
+    global _last_run
+    run = {"id": uuid.uuid4().hex[:12], "topic": topic}
+    _run_var.set(run)
+    _last_run = run
+    return run["id"]
+
+
+def set_topic(topic: str):
+    """현재 실행의 주제 설정"""
+    _current_run()["topic"] = topic
+
+
+def unit_cost(model: str, unit: str) -> float:
+    """단위당 비용 (Config.UNIT_COSTS, 없으면 0)"""
+    return Config.UNIT_COSTS.get((model, unit), 0.0)
+
+
+def record(model: str, unit: str, quantity: float, stage: str) -> float:
+    """호출 1건의 과금 단위 기록 (추가만, 수정/삭제 없음) → 비용(USD)"""
+    cost = unit_cost(model, unit) * quantity
+    now = datetime.now()
+    run = _current_run()
+    with _lock:
+        try:
+            with _db() as conn:
+                conn.execute(
+                    "INSERT INTO calls (ts, day, run_id, topic, stage, model, unit,"
+                    " quantity, cost_usd) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        now.isoformat(timespec="seconds"), now.date().isoformat(),
+                        run["id"], run["topic"], stage, model, unit, quantity, cost,
+                    ),
+                )
+        except sqlite3.Error as e:
+            log.warning("비용 원장 기록 실패: %s", e)
+    return cost
+
+
+def _spent_since(day: str) -> float:
+    with _db() as conn:
+        row = conn.execute(
+            "SELECT COALESCE(SUM(cost_usd), 0) FROM calls WHERE day >= ?", (day,)
+        ).fetchone()
+    return row[0]
+
+
+def spent_since(day: str) -> float:
+    """day(YYYY-MM-DD) 이후 누적 비용"""
+    with _lock:
+        return _spent_since(day)
+
+
+def _check_budget(estimated_cost: float):
+    """check_budget 본체 (_lock을 잡은 상태에서 호출)"""
+    today = date.today()
+    caps = [
+        ("일", Config.DAILY_BUDGET_USD, today.isoformat()),
+        ("월", Config.MONTHLY_BUDGET_USD, today.replace(day=1).isoformat()),
+    ]
+    for label, cap, since in caps:
+        if not cap:
+            continue
+        spent = _spent_since(since) + _reserved
+        if spent + estimated_cost > cap:
+            raise BudgetExceeded(
+                f"{label} 예산 초과 예상: 사용 ${spent:.2f} + 예상 ${estimated_cost:.2f}"
+                f" > 한도 ${cap:.2f}"
+            )
+
+
+def check_budget(estimated_cost: float):
+    """예상 비용을 더해도 일/월 예산 이내인지 검사 (진행 중인 예약 포함)
+
+    Raises:
+        BudgetExceeded: 예산 초과 예상
+    """
+    with _lock:
+        _check_budget(estimated_cost)
+
+
+@contextmanager
+def reserve(estimated_cost: float):
+    """예산 검사 + 예상 비용 예약 — 블록 안에서 API 호출 후 record()
+
+    검사와 예약을 같은 잠금 안에서 하므로 동시에 시작한 호출들이 각자 검사를
+    통과해 합계가 한도를 넘지 않는다. 블록이 끝나면 (성공이면 record() 후,
+    실패면 그대로) 예약을 해제한다.
+
+    Raises:
+        BudgetExceeded: 예약 포함 예산 초과 예상
+    """
+    global _reserved
+    with _lock:
+        _check_budget(estimated_cost)
+        _reserved += estimated_cost
+    try:
+        yield
+    finally:
+        with _lock:
+            _reserved -= estimated_cost
+
+
+def summarize(group_by: str = "day", since: str | None = None) -> list[dict]:
+    """비용 집계 (group_by: day / topic / model / stage)"""
+    if group_by not in ("day", "topic", "model", "stage"):
+        raise ValueError(f"지원하지 않는 집계 기준: {group_by}")
+    query = (
+        f"SELECT {group_by}, COUNT(*), SUM(cost_usd) FROM calls"
+        + (" WHERE day >= ?" if since else "")
+        + f" GROUP BY {group_by} ORDER BY {group_by}"
+    )
+    with _lock, _db() as conn:
+        rows = conn.execute(query, (since,) if since else ()).fetchall()
+    return [{"key": key, "calls": calls, "cost": cost} for key, calls, cost in rows]
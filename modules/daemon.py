@@ -0,0 +1,184 @@
+"""상주 스케줄러 — 한 프로세스에서 정해진 시각/간격으로 파이프라인 실행 + 로컬 HTTP 상태/트리거
+
+cron으로 매번 새 프로세스를 띄우면 인터프리터 시작, SDK import, OAuth 서비스
+생성, 연결 풀이 매번 새로 만들어지고, 겹친 실행이 같은 outputs/ 디렉토리를
+두고 경쟁한다. 이 모드는 클라이언트/캐시를 프로세스 수명 동안 유지하고
+실행을 하나씩 직렬화한다.
+
+HTTP (127.0.0.1 기본):
+    GET  /status                 현재 상태 + 최근 실행 기록
+    POST /trigger                즉시 전체 파이프라인 실행 예약
+    POST /trigger?topic=주제      특정 주제로 생성 예약
+"""
+import json
+import queue
+import logging
+import threading
+import traceback
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable
+from urllib.parse import urlparse, parse_qs
+
+log = logging.getLogger("shorts.daemon")
+
+# 상태 응답에 남길 최근 실행 수
+HISTORY_SIZE = 20
+
+
+def next_run_time(
+    now: datetime, at_times: list[str], interval_min: int, last_run: datetime
+) -> datetime | None:
+    """다음 예약 실행 시각 (at_times: "HH:MM" 목록, interval_min: 실행 간격 분)"""
+    candidates = []
+    for at in at_times:
+        hour, minute = (int(x) for x in at.split(":"))
+        t = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+        candidates.append(t if t > now else t + timedelta(days=1))
+    if interval_min:
+        candidates.append(max(last_run + timedelta(minutes=interval_min), now))
+    return min(candidates) if candidates else None
+
+
+class PipelineDaemon:
+    """예약/트리거된 실행을 작업 큐 하나로 직렬화해 실행"""
+
+    def __init__(
+        self,
+        run_pipeline: Callable[[str | None], None],
+        at_times: list[str] | None = None,
+        interval_min: int = 0,
+    ):
+        self.run_pipeline = run_pipeline
+        self.at_times = at_times or []
+        self.interval_min = interval_min
+        self._jobs: queue.Queue = queue.Queue()
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._status = {
+            "started_at": datetime.now().isoformat(timespec="seconds"),
+            "running": None,
+            "next_run": None,
+            "queued": 0,
+            "history": [],
+        }
+        self._last_scheduled = datetime.now()
+
+    def trigger(self, topic: str | None = None, reason: str = "trigger"):
+        """실행 예약 (이미 실행 중이면 끝난 뒤 순서대로 실행)"""
+        self._jobs.put((topic, reason))
+        with self._lock:
+            self._status["queued"] = self._jobs.qsize()
+        log.info("실행 예약: %s (%s)", topic or "전체 파이프라인", reason)
+
+    def status(self) -> dict:
+        with self._lock:
+            return json.loads(json.dumps(self._status))
+
+    def stop(self):
+        self._stop.set()
+        self._jobs.put(None)
+
+    def run_forever(self):
+        """스케줄 루프 — 다음 예약 시각까지 트리거를 기다리며 하나씩 실행"""
+        while not self._stop.is_set():
+            now = datetime.now()
+            next_at = next_run_time(
+                now, self.at_times, self.interval_min, self._last_scheduled
+            )
+            with self._lock:
+                self._status["next_run"] = (
+                    next_at.isoformat(timespec="seconds") if next_at else None
+                )
+
+            timeout = (next_at - now).total_seconds() if next_at else None
+            try:
+                job = self._jobs.get(timeout=timeout)
+            except queue.Empty:
+                self._last_scheduled = datetime.now()
+                job = (None, "schedule")
+            if job is None:
+                break
+            self._run(*job)
+
+    def _run(self, topic: str | None, reason: str):
+        record = {
+            "topic": topic,
+            "reason": reason,
+            "started_at": datetime.now().isoformat(timespec="seconds"),
+        }
+        with self._lock:
+            self._status["running"] = record
+            self._status["queued"] = self._jobs.qsize()
+
+        try:
+            self.run_pipeline(topic)
+            result = "ok"
+        except Exception as e:
+            log.error("파이프라인 실행 실패: %s\n%s", e, traceback.format_exc())
+            result = f"error: {e}"
+
+        with self._lock:
+            record = {
+                **record,
+                "result": result,
+                "finished_at": datetime.now().isoformat(timespec="seconds"),
+            }
+            self._status["running"] = None
+            self._status["history"] = (self._status["history"] + [record])[-HISTORY_SIZE:]
+
+
+def _make_handler(daemon: PipelineDaemon):
+    class Handler(BaseHTTPRequestHandler):
+        def _reply(self, code: int, body: dict):
+            data = json.dumps(body, ensure_ascii=False).encode("utf-8")
+            self.send_response(code)
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_GET(self):
+            if urlparse(self.path).path == "/status":
+                self._reply(200, daemon.status())
+            else:
+                self._reply(404, {"error": "not found"})
+
+        def do_POST(self):
+            url = urlparse(self.path)
+            if url.path != "/trigger":
+                self._reply(404, {"error": "not found"})
+                return
+            topic = parse_qs(url.query).get("topic", [None])[0]
+            daemon.trigger(topic, reason="http")
+            self._reply(202, {"queued": True, "topic": topic})
+
+        def log_message(self, fmt, *args):
+            log.debug("HTTP %s", fmt % args)
+
+    return Handler
+
+
+def serve(
+    run_pipeline: Callable[[str | None], None],
+    at_times: list[str] | None = None,
+    interval_min: int = 0,
+    host: str = "127.0.0.1",
+    port: int = 8765,
+):
+    """상주 모드 실행 (Ctrl+C로 종료)"""
+    daemon = PipelineDaemon(run_pipeline, at_times=at_times, interval_min=interval_min)
+    server = ThreadingHTTPServer((host, port), _make_handler(daemon))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    log.info(
+        "상주 모드 시작: http://%s:%d/status (시각 %s, 간격 %s분)",
+        host, port, ",".join(daemon.at_times) or "-", interval_min or "-",
+    )
+
+    try:
+        daemon.run_forever()
+    except KeyboardInterrupt:
+        log.info("상주 모드 종료")
+    finally:
+        daemon.stop()
+        server.shutdown()
@@ -0,0 +1,16 @@
+"""프로세스 전역 Gemini 클라이언트 — 호출/실행 간 HTTP 연결 풀 재사용"""
+import threading
+from google import genai
+from config import Config
+
+_client: genai.Client | None = None
+_lock = threading.Lock()
+
+
+def get_client() -> genai.Client:
+    """공유 Gemini 클라이언트 (처음 호출 시 생성)"""
+    global _client
+    with _lock:
+        if _client is None:
+            _client = genai.Client(api_key=Config.GEMINI_API_KEY)
+        return _client
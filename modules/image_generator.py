@@ -1,68 +1,202 @@
 """Gemini 2.5 Flash 기반 키프레임 이미지 생성"""
 import json
+import asyncio
+import contextvars
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from google import genai
+from typing import Callable
 from config import Config
+from modules.gemini_client import get_client
+from modules import cost_ledger
+from modules.rate_limiter import rate_limited_call, arate_limited_call
 
 log = logging.getLogger("shorts.image")
 
+IMAGE_MODEL = "gemini-2.5-flash-image"
+
+
+def _frame_prompt(prompt: str) -> str:
+    return (
+        "Create a tech-focused YouTube Shorts thumbnail image "
+        "for a Korean developer audience.\n"
+        "9:16 portrait format, 1080x1920px equivalent.\n"
+        "Style: dark background, modern tech aesthetic, neon accents.\n"
+        f"Content: {prompt}\n"
+        "No text overlays — clean visual only."
+    )
+
+
+def _save_image(response, output_path: str) -> bool:
+    """응답의 첫 이미지 파트 저장"""
+    for part in response.parts:
+        if hasattr(part, "inline_data") and part.inline_data:
+            with open(output_path, "wb") as f:
+                f.write(part.inline_data.data)
+            log.info("이미지 저장: %s", output_path)
+            return True
+    return False
+
 
 def _generate_frame(client, prompt: str, output_path: str) -> bool:
     """Gemini 2.5 Flash Image로 이미지 1장 생성"""
     try:
-        response = client.models.generate_content(
-            model="gemini-2.5-flash-image",
-            contents=(
-                "Create a tech-focused YouTube Shorts thumbnail image "
-                "for a Korean developer audience.\n"
-                "9:16 portrait format, 1080x1920px equivalent.\n"
-                "Style: dark background, modern tech aesthetic, neon accents.\n"
-                f"Content: {prompt}\n"
-                "No text overlays — clean visual only."
-            ),
-            config={"response_modalities": ["IMAGE"]},
-        )
-        for part in response.parts:
-            if hasattr(part, "inline_data") and part.inline_data:
-                with open(output_path, "wb") as f:
-                    f.write(part.inline_data.data)
-                log.info("이미지 저장: %s", output_path)
-                return True
+        with cost_ledger.reserve(cost_ledger.unit_cost(IMAGE_MODEL, "images")):
+            response = rate_limited_call(
+                IMAGE_MODEL,
+                client.models.generate_content,
+                model=IMAGE_MODEL,
+                contents=_frame_prompt(prompt),
+                config={"response_modalities": ["IMAGE"]},
+            )
+            cost_ledger.record(IMAGE_MODEL, "images", 1, "image")
+        return _save_image(response, output_path)
+    except Exception as e:
+        log.warning("이미지 생성 실패: %s", e)
         return False
+
+
+async def _agenerate_frame(client, prompt: str, output_path: str) -> bool:
+    """_generate_frame의 비동기 버전"""
+    try:
+        with cost_ledger.reserve(cost_ledger.unit_cost(IMAGE_MODEL, "images")):
+            response = await arate_limited_call(
+                IMAGE_MODEL,
+                client.aio.models.generate_content,
+                model=IMAGE_MODEL,
+                contents=_frame_prompt(prompt),
+                config={"response_modalities": ["IMAGE"]},
+            )
+            cost_ledger.record(IMAGE_MODEL, "images", 1, "image")
+        return _save_image(response, output_path)
     except Exception as e:
         log.warning("이미지 생성 실패: %s", e)
         return False
 
 
+def _save_manifest(frames_dir: Path, generated: list[dict]):
+    manifest_path = frames_dir / "frames_manifest.json"
+    with open(manifest_path, "w", encoding="utf-8") as f:
+        json.dump(generated, f, ensure_ascii=False, indent=2)
+
+
+class FrameJobs:
+    """장면이 도착하는 대로 키프레임 생성을 시작하는 작업 묶음
+
+    write_script(on_scene=jobs.submit)로 연결하면 스크립트 스트리밍 중에
+    완성된 장면부터 이미지 생성이 겹쳐 실행된다. on_frame(frame_info, scene)은
+    키프레임이 저장될 때마다 호출된다 (예: Veo 클립 작업 제출).
+    """
+
+    def __init__(
+        self,
+        output_dir: Path,
+        max_workers: int = 4,
+        on_frame: Callable[[dict, dict], None] | None = None,
+    ):
+        Config.validate(need_gemini=True)
+
+        self.client = get_client()
+        self.frames_dir = output_dir / "frames"
+        self.frames_dir.mkdir(parents=True, exist_ok=True)
+        self.on_frame = on_frame
+        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+        self._futures = {}  # 장면 번호 → Future
+        self._lock = threading.Lock()
+
+    def submit(self, scene: dict, index: int | None = None):
+        """장면 1개의 키프레임 생성 시작 (장면 번호 N → frame_NN)
+
+        index가 없으면 scene_number를 쓴다 (스트리밍 중 파싱에 실패한 장면이 있어도
+        뒤 장면 번호가 밀리지 않음). 이미 제출된 번호면 무시한다.
+        """
+        with self._lock:
+            if index is None:
+                index = scene.get("scene_number")
+                if not isinstance(index, int) or index < 1 or index in self._futures:
+                    index = max(self._futures, default=0) + 1
+            if index in self._futures:
+                return
+            # 비용 원장의 현재 실행(ContextVar)이 워커 스레드에서도 보이도록 컨텍스트 복사
+            self._futures[index] = self._executor.submit(
+                contextvars.copy_context().run, self._run, index, scene
+            )
+
+    @property
+    def submitted(self) -> int:
+        """지금까지 제출된 장면 수"""
+        return len(self._futures)
+
+    def submit_remaining(self, scenes: list[dict]):
+        """최종 장면 목록에서 아직 제출되지 않은 장면 제출 (목록 위치 = 장면 번호)"""
+        for index, scene in enumerate(scenes, start=1):
+            if index not in self._futures:
+                self.submit(scene, index)
+
+    def _run(self, index: int, scene: dict) -> dict | None:
+        output_path = self.frames_dir / f"frame_{index:02d}.png"
+        if not _generate_frame(self.client, scene["visual_prompt"], str(output_path)):
+            log.warning("장면 %d 건너뜀", index)
+            return None
+
+        frame_info = {
+            "scene": index,
+            "path": str(output_path),
+            "prompt": scene["visual_prompt"],
+        }
+        if self.on_frame:
+            self.on_frame(frame_info, scene)
+        return frame_info
+
+    def cancel(self):
+        """대기 중인 작업 취소"""
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+    def results(self) -> list[dict]:
+        """모든 작업 완료 대기 → 매니페스트 저장 → 생성된 프레임 목록"""
+        generated = [self._futures[index].result() for index in sorted(self._futures)]
+        generated = [g for g in generated if g]
+        self._executor.shutdown()
+
+        _save_manifest(self.frames_dir, generated)
+        log.info("%d/%d개 이미지 생성 완료", len(generated), len(self._futures))
+        return generated
+
+
 def generate_frames(script: dict, output_dir: Path) -> list[dict]:
     """스크립트의 장면별 키프레임 이미지 생성"""
-    Config.validate(need_gemini=True)
+    scenes = script.get("scenes", [])
+    log.info("%d개 장면 이미지 생성 시작 (Gemini 2.5 Flash Image)", len(scenes))
+
+    jobs = FrameJobs(output_dir)
+    jobs.submit_remaining(scenes)
+    return jobs.results()
 
-    client = genai.Client(api_key=Config.GEMINI_API_KEY)
-    frames_dir = output_dir / "frames"
-    frames_dir.mkdir(parents=True, exist_ok=True)
+
+async def agenerate_frames(script: dict, output_dir: Path) -> list[dict]:
+    """generate_frames의 비동기 버전 (동시 요청 수는 모델 리미터가 조절)"""
+    Config.validate(need_gemini=True)
 
     scenes = script.get("scenes", [])
     log.info("%d개 장면 이미지 생성 시작 (Gemini 2.5 Flash Image)", len(scenes))
 
+    client = get_client()
+    frames_dir = output_dir / "frames"
+    frames_dir.mkdir(parents=True, exist_ok=True)
+    paths = [frames_dir / f"frame_{i:02d}.png" for i in range(1, len(scenes) + 1)]
+    results = await asyncio.gather(*(
+        _agenerate_frame(client, scene["visual_prompt"], str(path))
+        for scene, path in zip(scenes, paths)
+    ))
+
     generated = []
-    for i, scene in enumerate(scenes):
-        output_path = frames_dir / f"frame_{i + 1:02d}.png"
-        success = _generate_frame(client, scene["visual_prompt"], str(output_path))
-        if success:
-            generated.append({
-                "scene": i + 1,
-                "path": str(output_path),
-                "prompt": scene["visual_prompt"],
-            })
-        else:
-            log.warning("장면 %d 건너뜀", i + 1)
-
-    # 매니페스트 저장
-    manifest_path = frames_dir / "frames_manifest.json"
-    with open(manifest_path, "w", encoding="utf-8") as f:
-        json.dump(generated, f, ensure_ascii=False, indent=2)
+    for index, (scene, path, ok) in enumerate(zip(scenes, paths, results), start=1):
+        if not ok:
+            log.warning("장면 %d 건너뜀", index)
+            continue
+        generated.append({"scene": index, "path": str(path), "prompt": scene["visual_prompt"]})
 
+    _save_manifest(frames_dir, generated)
     log.info("%d/%d개 이미지 생성 완료", len(generated), len(scenes))
     return generated
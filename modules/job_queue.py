@@ -0,0 +1,287 @@
+"""SQLite 작업 큐 — 여러 워커 프로세스가 리스/하트비트로 단계별 작업을 나눠 처리
+
+한 주제는 단계별 작업으로 흘러간다:
+    script (Gemini 스크립트 + 키프레임 + TTS) → video (Veo) → render (Remotion + SEO)
+    → upload (옵션)
+각 단계는 같은 출력 디렉토리(Config.make_output_dir)를 이어받는다. 워커는
+처리할 단계를 골라 실행할 수 있어, 렌더링 전용 머신은 render만 가져간다.
+
+워커가 죽으면 하트비트가 끊겨 리스가 만료되고, 다른 워커가 작업을 회수한다.
+"""
+import os
+import json
+import time
+import socket
+import sqlite3
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Callable
+from config import Config
+from modules import cost_ledger
+
+log = logging.getLogger("shorts.jobs")
+
+STAGES = ("script", "video", "render", "upload")
+NEXT_STAGE = {"script": "video", "video": "render", "render": "upload"}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    topic TEXT NOT NULL,
+    stage TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    output_dir TEXT,
+    options TEXT NOT NULL DEFAULT '{}',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    worker TEXT,
+    lease_until REAL,
+    error TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_claim ON jobs(status, stage, id);
+"""
+
+
+@contextmanager
+def _db():
+    """큐 DB 쓰기 트랜잭션 (BEGIN IMMEDIATE — 프로세스 간 클레임 경쟁 방지)"""
+    Config.JOB_QUEUE_FILE.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(str(Config.JOB_QUEUE_FILE), timeout=30, isolation_level=None)
+    conn.row_factory = sqlite3.Row
+    try:
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(_SCHEMA)
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+    finally:
+        conn.close()
+
+
+def _job(row: sqlite3.Row) -> dict:
+    job = dict(row)
+    job["options"] = json.loads(job["options"] or "{}")
+    return job
+
+
+def enqueue(
+    topic: str,
+    stage: str = "script",
+    output_dir: str | None = None,
+    options: dict | None = None,
+) -> int:
+    """작업 추가 → 작업 ID"""
+    if stage not in STAGES:
+        raise ValueError(f"지원하지 않는 단계: {stage}")
+    now = time.time()
+    with _db() as conn:
+        cur = conn.execute(
+            "INSERT INTO jobs (topic, stage, output_dir, options, created_at, updated_at)"
+            " VALUES (?, ?, ?, ?, ?, ?)",
+            (topic, stage, output_dir, json.dumps(options or {}, ensure_ascii=False), now, now),
+        )
+        return cur.lastrowid
+
+
+def claim(worker_id: str, stages: tuple[str, ...] = STAGES) -> dict | None:
+    """대기 중이거나 리스가 만료된 작업 하나를 가져와 리스 설정 (없으면 None)"""
+    now = time.time()
+    placeholders = ",".join("?" * len(stages))
+    with _db() as conn:
+        # 시도 횟수를 다 쓴 채 리스가 만료된 작업은 실패 처리
+        conn.execute(
+            "UPDATE jobs SET status = 'failed', error = '리스 만료 (시도 횟수 초과)',"
+            " updated_at = ? WHERE status = 'leased' AND lease_until < ? AND attempts >= ?",
+            (now, now, Config.JOB_MAX_ATTEMPTS),
+        )
+        row = conn.execute(
+            f"SELECT * FROM jobs WHERE stage IN ({placeholders}) AND"
+            " (status = 'pending' OR (status = 'leased' AND lease_until < ?))"
+            " ORDER BY id LIMIT 1",
+            (*stages, now),
+        ).fetchone()
+        if row is None:
+            return None
+        if row["status"] == "leased":
+            log.warning("리스 만료 작업 회수: #%d (이전 워커 %s)", row["id"], row["worker"])
+        conn.execute(
+            "UPDATE jobs SET status = 'leased', worker = ?, lease_until = ?,"
+            " attempts = attempts + 1, updated_at = ? WHERE id = ?",
+            (worker_id, now + Config.JOB_LEASE_SECONDS, now, row["id"]),
+        )
+        job = _job(row)
+    job.update(status="leased", worker=worker_id, attempts=row["attempts"] + 1)
+    return job
+
+
+def heartbeat(job_id: int, worker_id: str) -> bool:
+    """리스 연장 (이미 다른 워커에게 넘어갔으면 False)"""
+    now = time.time()
+    with _db() as conn:
+        cur = conn.execute(
+            "UPDATE jobs SET lease_until = ?, updated_at = ?"
+            " WHERE id = ? AND worker = ? AND status = 'leased'",
+            (now + Config.JOB_LEASE_SECONDS, now, job_id, worker_id),
+        )
+        return cur.rowcount == 1
+
+
+def complete(job_id: int, worker_id: str, next_job: dict | None = None) -> bool:
+    """작업 완료 + 다음 단계 작업 추가 (한 트랜잭션, 리스를 잃었으면 False)"""
+    now = time.time()
+    with _db() as conn:
+        cur = conn.execute(
+            "UPDATE jobs SET status = 'done', lease_until = NULL, error = NULL,"
+            " updated_at = ? WHERE id = ? AND worker = ? AND status = 'leased'",
+            (now, job_id, worker_id),
+        )
+        if cur.rowcount != 1:
+            return False
+        if next_job:
+            conn.execute(
+                "INSERT INTO jobs (topic, stage, output_dir, options, created_at, updated_at)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    next_job["topic"], next_job["stage"], next_job["output_dir"],
+                    json.dumps(next_job["options"], ensure_ascii=False), now, now,
+                ),
+            )
+        return True
+
+
+def fail(job_id: int, worker_id: str, error: str, retry: bool = True):
+    """작업 실패 — 시도 횟수가 남았고 retry면 대기 상태로 되돌림"""
+    now = time.time()
+    with _db() as conn:
+        conn.execute(
+            "UPDATE jobs SET status = CASE WHEN ? AND attempts < ? THEN 'pending'"
+            " ELSE 'failed' END, lease_until = NULL, error = ?, updated_at = ?"
+            " WHERE id = ? AND worker = ? AND status = 'leased'",
+            (retry, Config.JOB_MAX_ATTEMPTS, error, now, job_id, worker_id),
+        )
+
+
+def release(job_id: int, worker_id: str):
+    """처리하지 못한 작업 반납 (워커 종료 시, 시도 횟수 되돌림)"""
+    with _db() as conn:
+        conn.execute(
+            "UPDATE jobs SET status = 'pending', lease_until = NULL,"
+            " attempts = attempts - 1, updated_at = ?"
+            " WHERE id = ? AND worker = ? AND status = 'leased'",
+            (time.time(), job_id, worker_id),
+        )
+
+
+def list_jobs(status: str | None = None, limit: int = 50) -> list[dict]:
+    """최근 작업 목록"""
+    with _db() as conn:
+        rows = conn.execute(
+            "SELECT * FROM jobs" + (" WHERE status = ?" if status else "")
+            + " ORDER BY id DESC LIMIT ?",
+            (status, limit) if status else (limit,),
+        ).fetchall()
+    return [_job(row) for row in rows]
+
+
+def active_output_dirs() -> set[str]:
+    """대기/진행 중인 작업의 출력 디렉토리 이름 (곧 다시 쓰일 디렉토리)
+
+    출력 정리(gc)에서 읽기만 하므로 쓰기 잠금을 잡는 _db()를 쓰지 않는다.
+    """
+    if not Config.JOB_QUEUE_FILE.exists():
+        return set()
+    conn = sqlite3.connect(str(Config.JOB_QUEUE_FILE), timeout=30)
+    try:
+        rows = conn.execute(
+            "SELECT DISTINCT output_dir FROM jobs"
+            " WHERE status IN ('pending', 'leased') AND output_dir IS NOT NULL"
+        ).fetchall()
+    except sqlite3.Error as e:
+        log.warning("작업 큐 조회 실패: %s", e)
+        return set()
+    finally:
+        conn.close()
+    return {os.path.basename(os.path.normpath(output_dir)) for output_dir, in rows}
+
+
+def _next_job(job: dict, output_dir: str | None) -> dict | None:
+    """완료된 작업의 다음 단계 (upload는 옵션이 켜졌을 때만)"""
+    stage = NEXT_STAGE.get(job["stage"])
+    if stage is None or (stage == "upload" and not job["options"].get("upload")):
+        return None
+    return {
+        "topic": job["topic"],
+        "stage": stage,
+        "output_dir": output_dir or job["output_dir"],
+        "options": job["options"],
+    }
+
+
+def _keep_alive(job_id: int, worker_id: str, done: threading.Event):
+    """작업 실행 중 주기적으로 리스 연장"""
+    while not done.wait(Config.JOB_HEARTBEAT_SECONDS):
+        try:
+            if not heartbeat(job_id, worker_id):
+                log.warning("작업 #%d 리스를 잃었습니다 (다른 워커가 회수)", job_id)
+                return
+        except sqlite3.Error as e:
+            log.warning("하트비트 실패: %s", e)
+
+
+def run_worker(
+    handlers: dict[str, Callable[[dict], str | None]],
+    stages: tuple[str, ...] = STAGES,
+    once: bool = False,
+):
+    """작업 처리 루프
+
+    handlers[stage](job)은 출력 디렉토리 경로를 반환하고, 실패하면 예외를 던진다.
+    예산 초과(BudgetExceeded)는 재시도해도 같으므로 바로 실패 처리한다.
+    once=True면 대기 작업이 없을 때 종료한다.
+    """
+    worker_id = f"{socket.gethostname()}-{os.getpid()}"
+    log.info("워커 시작: %s (단계: %s)", worker_id, ", ".join(stages))
+
+    while True:
+        job = claim(worker_id, stages)
+        if job is None:
+            if once:
+                log.info("대기 작업 없음, 워커 종료")
+                return
+            time.sleep(Config.JOB_POLL_SECONDS)
+            continue
+
+        log.info(
+            "작업 #%d 시작: [%s] %s (시도 %d)",
+            job["id"], job["stage"], job["topic"], job["attempts"],
+        )
+        done = threading.Event()
+        threading.Thread(
+            target=_keep_alive, args=(job["id"], worker_id, done), daemon=True
+        ).start()
+        started = time.monotonic()
+        try:
+            output_dir = handlers[job["stage"]](job)
+        except KeyboardInterrupt:
+            done.set()
+            release(job["id"], worker_id)
+            log.info("워커 중단, 작업 #%d 반납", job["id"])
+            return
+        except Exception as e:
+            done.set()
+            log.error("작업 #%d 실패: %s", job["id"], e)
+            fail(job["id"], worker_id, str(e),
+                 retry=not isinstance(e, cost_ledger.BudgetExceeded))
+            continue
+        done.set()
+
+        if complete(job["id"], worker_id, _next_job(job, output_dir)):
+            log.info("작업 #%d 완료 (%.0f초)", job["id"], time.monotonic() - started)
+        else:
+            log.warning("작업 #%d 완료했으나 리스를 잃어 결과 기록 생략", job["id"])
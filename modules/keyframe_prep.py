@@ -0,0 +1,99 @@
+"""Veo 입력용 키프레임 준비 — Veo 해상도(9:16)로 맞춰 JPEG 재인코딩
+
+Gemini 이미지 응답은 큰 PNG라 Veo 요청마다 그대로 실리면 병렬 실행 시 요청
+페이로드가 커진다. 원본(frames/frame_XX.png)은 보관용으로 그대로 두고,
+frames/veo/frame_XX.jpg를 만들어 Veo 요청에만 쓴다. 변환에 실패하면 원본을 쓴다.
+"""
+import time
+import subprocess
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from config import Config
+
+log = logging.getLogger("shorts.keyframe")
+
+
+def _veo_path(src: Path) -> Path:
+    return src.parent / "veo" / f"{src.stem}.jpg"
+
+
+def prepare_keyframe(src: str) -> str:
+    """키프레임 1장 → Veo용 JPEG 경로 (실패하거나 꺼져 있으면 원본 경로)
+
+    ProcessPoolExecutor에서 실행되므로 모듈 최상위 함수로 둔다.
+    """
+    if not Config.KEYFRAME_PREP:
+        return src
+    try:
+        return _convert(Path(src))
+    except OSError as e:
+        # 디렉토리 생성 / stat / 권한 오류 등 — 이 장면만 원본으로
+        log.warning("키프레임 변환 실패, 원본 사용: %s (%s)", src, e)
+        return src
+
+
+def _convert(src_path: Path) -> str:
+    """prepare_keyframe 본체 (OSError는 호출자가 처리)"""
+    src = str(src_path)
+    dst = _veo_path(src_path)
+
+    # 원본보다 새로운 변환 결과가 있으면 재사용
+    if dst.exists() and dst.stat().st_mtime >= src_path.stat().st_mtime:
+        return str(dst)
+
+    width, height = Config.KEYFRAME_SIZE
+    dst.parent.mkdir(exist_ok=True)
+    cmd = [
+        "ffmpeg", "-y", "-v", "error",
+        "-i", src,
+        "-vf", (
+            f"scale={width}:{height}:force_original_aspect_ratio=increase:flags=lanczos,"
+            f"crop={width}:{height}"
+        ),
+        "-frames:v", "1",
+        "-c:v", "mjpeg", "-q:v", str(Config.KEYFRAME_JPEG_QSCALE),
+        "-pix_fmt", "yuvj420p",
+        "-map_metadata", "-1",
+        str(dst),
+    ]
+    try:
+        subprocess.run(cmd, check=True, capture_output=True, text=True)
+    except FileNotFoundError:
+        log.warning("ffmpeg가 설치되어 있지 않습니다. 원본 키프레임 사용")
+        return src
+    except subprocess.CalledProcessError as e:
+        log.warning("키프레임 변환 실패, 원본 사용: %s (%s)", src, e.stderr.strip())
+        return src
+
+    # 원본이 이미 작으면 (예: 작은 JPEG 응답) 원본 사용
+    if dst.stat().st_size >= src_path.stat().st_size:
+        dst.unlink()
+        return src
+    return str(dst)
+
+
+def prepare_keyframes(frames: list[dict]) -> list[dict]:
+    """프레임 목록을 병렬로 변환 → 각 항목에 "veo_path" 추가한 새 목록"""
+    if not frames:
+        return []
+    if not Config.KEYFRAME_PREP:
+        return [{**f, "veo_path": f["path"]} for f in frames]
+
+    started = time.monotonic()
+    workers = min(len(frames), Config.PROXY_WORKERS)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        paths = list(pool.map(prepare_keyframe, [f["path"] for f in frames]))
+
+    try:
+        before = sum(Path(f["path"]).stat().st_size for f in frames)
+        after = sum(Path(p).stat().st_size for p in paths)
+    except OSError:
+        before = after = 0
+    log.info(
+        "키프레임 %d장 준비: %.0fKB → %.0fKB (%.0f%% 절감, %.1f초)",
+        len(frames), before / 1024, after / 1024,
+        100 * (1 - after / before) if before else 0,
+        time.monotonic() - started,
+    )
+    return [{**f, "veo_path": p} for f, p in zip(frames, paths)]
@@ -0,0 +1,390 @@
+"""출력 디렉토리 정리 — 내용이 같은 산출물 하드링크 + 업로드 끝난 중간 산출물 삭제
+
+outputs/<날짜>-<슬러그>/ 는 실행마다 새로 생기고 frames/, clips/, proxies/,
+shards/ 에 같은 파일이 여러 벌 쌓인다. collect()는:
+
+1. os.scandir로 출력 디렉토리를 훑어 파일 목록을 만든다 (하위 디렉토리 재귀).
+2. 가장 최근 파일 수정이 GC_DEDUP_MIN_AGE_DAYS일 지났고 작업 큐에 대기/진행
+   중인 작업이 없는 디렉토리에서 크기가 같은 파일만 해시(blake2b)해 내용이
+   같으면 하나의 inode로 하드링크한다. 해시는 인덱스에 (크기, mtime, inode)와
+   함께 저장해 바뀌지 않은 파일은 다시 읽지 않는다.
+3. upload.json(업로드 기록)이 있고 업로드 후 GC_INTERMEDIATE_DAYS일 지난
+   디렉토리의 중간 산출물(INTERMEDIATES)을 지운다.
+4. 디렉토리별 요약(날짜, 영상 ID, 파일 수, 실제 차지 바이트)을 인덱스에 남긴다.
+
+하드링크한 파일은 같은 내용을 공유하므로 제자리에서 덮어쓰면 다른 디렉토리의
+파일까지 바뀐다. 그래서 최근에 쓰였거나 큐 작업(video / render 재시도 등 —
+clips/, frames/, narration.wav를 제자리에서 다시 씀)이 남은 디렉토리는 건드리지
+않고, 조용한 디렉토리에서도 다시 만들어질 수 있는 산출물(NO_DEDUP: 프록시, 샤드, Veo용
+키프레임, *_shorts.mp4 — draft --dir, 워커 렌더링, --force-render가 ffmpeg -y로
+덮어씀)은 하드링크하지 않는다.
+"""
+import os
+import re
+import json
+import shutil
+import sqlite3
+import hashlib
+import logging
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from config import Config
+from modules import job_queue
+
+log = logging.getLogger("shorts.gc")
+
+# 업로드 후 지워도 되는 중간 산출물 (출력 디렉토리 기준)
+INTERMEDIATES = ("frames", "clips", "proxies", "shards", "upload_shorts.mp4")
+
+# 하드링크하지 않는 산출물 (출력 디렉토리 기준) — 같은 경로에 다시 쓰이는 파일
+NO_DEDUP_DIRS = ("proxies", "shards", os.path.join("frames", "veo"))
+NO_DEDUP_SUFFIX = "_shorts.mp4"
+
+# 업로드 기록 파일 (youtube_uploader가 업로드 성공 시 저장)
+UPLOAD_RECORD = "upload.json"
+
+_DIR_NAME = re.compile(r"^(\d{4}-\d{2}-\d{2})-")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    ino INTEGER NOT NULL,
+    digest TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS outputs (
+    dir TEXT PRIMARY KEY,
+    day TEXT,
+    video_id TEXT,
+    uploaded_at TEXT,
+    files INTEGER NOT NULL,
+    bytes INTEGER NOT NULL,
+    pruned INTEGER NOT NULL DEFAULT 0,
+    scanned_at TEXT NOT NULL
+);
+"""
+
+
+@dataclass(slots=True)
+class _File:
+    path: str  # OUTPUTS_DIR 기준 상대 경로
+    size: int
+    mtime_ns: int
+    ino: int
+    dev: int
+    nlink: int
+
+
+@dataclass
+class GCReport:
+    """collect() 결과 요약"""
+
+    dirs: int = 0
+    files: int = 0
+    bytes: int = 0
+    linked: int = 0
+    linked_bytes: int = 0
+    pruned_dirs: list[str] = field(default_factory=list)
+    pruned_bytes: int = 0
+    hashed: int = 0
+
+
+@contextmanager
+def _db():
+    """인덱스 DB 연결 (트랜잭션 커밋 후 닫힘)"""
+    Config.OUTPUT_INDEX_FILE.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(str(Config.OUTPUT_INDEX_FILE), timeout=30)
+    try:
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(_SCHEMA)
+        with conn:
+            yield conn
+    finally:
+        conn.close()
+
+
+def record_upload(output_dir: str | Path, video_id: str, privacy: str):
+    """업로드 성공 기록 → <출력 디렉토리>/upload.json"""
+    record = {
+        "video_id": video_id,
+        "privacy": privacy,
+        "uploaded_at": datetime.now().isoformat(timespec="seconds"),
+    }
+    with open(Path(output_dir) / UPLOAD_RECORD, "w", encoding="utf-8") as f:
+        json.dump(record, f, ensure_ascii=False, indent=2)
+
+
+def _read_upload(path: str) -> dict | None:
+    try:
+        with open(os.path.join(path, UPLOAD_RECORD), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _walk(path: str, root_len: int, out: list[_File]):
+    """path 아래 일반 파일 목록 (심볼릭 링크는 따라가지 않음)"""
+    with os.scandir(path) as it:
+        for entry in it:
+            if entry.is_dir(follow_symlinks=False):
+                _walk(entry.path, root_len, out)
+            elif entry.is_file(follow_symlinks=False):
+                st = entry.stat(follow_symlinks=False)
+                out.append(_File(
+                    entry.path[root_len:], st.st_size, st.st_mtime_ns,
+                    st.st_ino, st.st_dev, st.st_nlink,
+                ))
+
+
+def _scan(root: Path) -> dict[str, tuple[date, list[_File]]]:
+    """출력 디렉토리 이름 → (날짜, 파일 목록) (<날짜>-<슬러그> 형식만)"""
+    result = {}
+    root_len = len(str(root)) + 1
+    with os.scandir(root) as it:
+        for entry in it:
+            match = _DIR_NAME.match(entry.name)
+            if not match or not entry.is_dir(follow_symlinks=False):
+                continue
+            try:
+                day = date.fromisoformat(match.group(1))
+            except ValueError:
+                continue
+            files: list[_File] = []
+            _walk(entry.path, root_len, files)
+            result[entry.name] = day, files
+    return result
+
+
+def _is_intermediate(f: _File) -> bool:
+    return f.path.split(os.sep, 2)[1] in INTERMEDIATES
+
+
+def _is_regenerated(f: _File) -> bool:
+    rest = f.path.split(os.sep, 1)[1]
+    if os.sep not in rest:
+        return rest.endswith(NO_DEDUP_SUFFIX)
+    return any(rest.startswith(d + os.sep) for d in NO_DEDUP_DIRS)
+
+
+def _last_modified(files: list[_File]) -> float:
+    """디렉토리 안 가장 최근 파일 수정 시각 (epoch 초)"""
+    return max((f.mtime_ns for f in files), default=0) / 1e9
+
+
+def _digest(path: Path) -> str:
+    h = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        while chunk := f.read(1 << 20):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _link(src: Path, dst: Path):
+    """dst를 src의 하드링크로 원자적으로 교체"""
+    tmp = dst.with_name(f".{dst.name}.gc-link")
+    if tmp.exists():
+        tmp.unlink()
+    os.link(src, tmp)
+    os.replace(tmp, dst)
+
+
+def _dedup(
+    root: Path, files: list[_File], conn: sqlite3.Connection, dry_run: bool, report: GCReport
+):
+    """크기가 같은 파일끼리만 해시 → 같은 내용이면 하드링크"""
+    cached = {
+        path: (size, mtime_ns, ino, digest)
+        for path, size, mtime_ns, ino, digest in conn.execute(
+            "SELECT path, size, mtime_ns, ino, digest FROM files"
+        )
+    }
+
+    by_size: dict[tuple[int, int], list[_File]] = {}
+    for f in files:
+        if f.size >= Config.GC_DEDUP_MIN_SIZE:
+            by_size.setdefault((f.dev, f.size), []).append(f)
+
+    for group in by_size.values():
+        if len({f.ino for f in group}) < 2:
+            continue
+
+        # inode별로 한 번만 해시
+        inode_digest: dict[int, str] = {}
+        by_digest: dict[str, dict[int, list[_File]]] = {}
+        for f in group:
+            digest = inode_digest.get(f.ino)
+            if digest is None:
+                hit = cached.get(f.path)
+                if hit and hit[:3] == (f.size, f.mtime_ns, f.ino):
+                    digest = hit[3]
+                else:
+                    digest = _digest(root / f.path)
+                    report.hashed += 1
+                inode_digest[f.ino] = digest
+            if cached.get(f.path) != (f.size, f.mtime_ns, f.ino, digest):
+                conn.execute(
+                    "INSERT OR REPLACE INTO files (path, size, mtime_ns, ino, digest)"
+                    " VALUES (?, ?, ?, ?, ?)",
+                    (f.path, f.size, f.mtime_ns, f.ino, digest),
+                )
+            by_digest.setdefault(digest, {}).setdefault(f.ino, []).append(f)
+
+        for inodes in by_digest.values():
+            if len(inodes) < 2:
+                continue
+            # 링크가 가장 많은 inode를 남김 (같으면 경로순 첫 번째)
+            keep = min(inodes.values(), key=lambda fs: (-fs[0].nlink, fs[0].path))
+            source = root / keep[0].path
+            for ino, paths in inodes.items():
+                if paths is keep:
+                    continue
+                for f in paths:
+                    if not dry_run:
+                        _link(source, root / f.path)
+                        conn.execute(
+                            "UPDATE files SET ino = ?, mtime_ns = ? WHERE path = ?",
+                            (keep[0].ino, keep[0].mtime_ns, f.path),
+                        )
+                    report.linked += 1
+                # 이 inode의 링크를 모두 바꿨으면 공간이 회수됨
+                if len(paths) >= paths[0].nlink:
+                    report.linked_bytes += paths[0].size
+
+
+def _prune(path: Path, dry_run: bool) -> int:
+    """중간 산출물 삭제 → 회수한 바이트 (다른 링크가 남은 파일은 제외)"""
+    freed = 0
+    for name in INTERMEDIATES:
+        target = path / name
+        if not target.exists():
+            continue
+        if target.is_dir():
+            for dirpath, _, filenames in os.walk(target):
+                for filename in filenames:
+                    st = os.lstat(os.path.join(dirpath, filename))
+                    freed += st.st_size if st.st_nlink == 1 else 0
+            if not dry_run:
+                shutil.rmtree(target)
+        else:
+            st = target.stat()
+            freed += st.st_size if st.st_nlink == 1 else 0
+            if not dry_run:
+                target.unlink()
+    return freed
+
+
+def _uploaded_before(upload: dict, before: datetime) -> bool:
+    try:
+        return datetime.fromisoformat(upload["uploaded_at"]) <= before
+    except (KeyError, TypeError, ValueError):
+        return False
+
+
+def collect(
+    days: int = Config.GC_INTERMEDIATE_DAYS, dedup: bool = True, dry_run: bool = False
+) -> GCReport:
+    """출력 디렉토리 정리 + 인덱스 갱신
+
+    Args:
+        days: 업로드 후 이 일수가 지난 디렉토리의 중간 산출물 삭제 (음수면 삭제 안 함)
+        dedup: 내용이 같은 파일 하드링크
+        dry_run: 파일은 건드리지 않고 결과만 계산
+    """
+    root = Config.OUTPUTS_DIR
+    report = GCReport()
+    if not root.exists():
+        return report
+
+    scanned = _scan(root)
+    # 디렉토리 이름의 날짜가 아니라 마지막 수정 시각으로 판단 (자정 직전 생성, 지난
+    # 디렉토리에 쓰는 재시도 작업) + 큐에 남은 작업이 있으면 제외
+    idle_before = (datetime.now() - timedelta(days=Config.GC_DEDUP_MIN_AGE_DAYS)).timestamp()
+    active = job_queue.active_output_dirs() if dedup else set()
+    prune_before = datetime.now() - timedelta(days=days)
+    now = datetime.now().isoformat(timespec="seconds")
+
+    with _db() as conn:
+        if dedup:
+            candidates = [
+                f for name, (_, files) in scanned.items()
+                if name not in active and _last_modified(files) <= idle_before
+                for f in files if not _is_regenerated(f)
+            ]
+            _dedup(root, candidates, conn, dry_run, report)
+
+        removed: list[str] = []
+        for name, (day, files) in scanned.items():
+            path = root / name
+            upload = _read_upload(str(path))
+            pruned = False
+            if upload and days >= 0 and _uploaded_before(upload, prune_before):
+                pruned = True
+                if any(_is_intermediate(f) for f in files):
+                    report.pruned_dirs.append(name)
+                    report.pruned_bytes += _prune(path, dry_run)
+                    if not dry_run:
+                        removed.extend(f.path for f in files if _is_intermediate(f))
+                        files = [f for f in files if not _is_intermediate(f)]
+
+            # 하드링크된 파일은 inode당 한 번만 센다
+            size = sum({(f.dev, f.ino): f.size for f in files}.values())
+            report.dirs += 1
+            report.files += len(files)
+            report.bytes += size
+            if not dry_run:
+                conn.execute(
+                    "INSERT OR REPLACE INTO outputs"
+                    " (dir, day, video_id, uploaded_at, files, bytes, pruned, scanned_at)"
+                    " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        name, day.isoformat(),
+                        upload.get("video_id") if upload else None,
+                        upload.get("uploaded_at") if upload else None,
+                        len(files), size, int(pruned), now,
+                    ),
+                )
+
+        if not dry_run:
+            # 사라진 디렉토리/파일 정리
+            conn.execute("CREATE TEMP TABLE seen (dir TEXT PRIMARY KEY)")
+            conn.executemany("INSERT INTO seen VALUES (?)", ((n,) for n in scanned))
+            conn.execute("DELETE FROM outputs WHERE dir NOT IN (SELECT dir FROM seen)")
+            conn.execute(
+                "DELETE FROM files WHERE substr(path, 1, instr(path, ?) - 1)"
+                " NOT IN (SELECT dir FROM seen)",
+                (os.sep,),
+            )
+            conn.executemany("DELETE FROM files WHERE path = ?", ((p,) for p in removed))
+
+    log.info(
+        "출력 정리%s: 디렉토리 %d개, 파일 %d개 (%.1fMB), 하드링크 %d개 (%.1fMB 회수), "
+        "중간 산출물 삭제 %d개 디렉토리 (%.1fMB)",
+        " (dry-run)" if dry_run else "",
+        report.dirs, report.files, report.bytes / 1e6,
+        report.linked, report.linked_bytes / 1e6,
+        len(report.pruned_dirs), report.pruned_bytes / 1e6,
+    )
+    return report
+
+
+def list_outputs(limit: int = 50) -> list[dict]:
+    """인덱스의 출력 디렉토리 목록 (최근 날짜순)"""
+    with _db() as conn:
+        conn.row_factory = sqlite3.Row
+        rows = conn.execute(
+            "SELECT * FROM outputs ORDER BY day DESC, dir LIMIT ?", (limit,)
+        ).fetchall()
+    return [dict(row) for row in rows]
+
+
+def auto_collect():
+    """Config.GC_AUTO면 정리 실행 (실패해도 파이프라인은 계속)"""
+    if not Config.GC_AUTO:
+        return
+    try:
+        collect()
+    except Exception as e:
+        log.warning("자동 출력 정리 실패: %s", e)
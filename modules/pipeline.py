@@ -0,0 +1,246 @@
+"""임베딩용 파이프라인 API — 한 프로세스에서 클라이언트/캐시를 유지하며 여러 숏츠 생성
+
+CLI(main.py) 없이 다른 서비스에서 호출하기 위한 객체. 각 단계는 await 가능한
+메서드이고, 한 편의 진행 상태/결과는 Short에 쌓인다. 출력/입력 확인 없이
+실패는 PipelineError로 알린다. 네트워크 단계는 client.aio / httpx로 이벤트
+루프에서 직접 실행되고, 합성(Remotion/FFmpeg)만 스레드에서 실행된다.
+
+    pipeline = Pipeline(quality="fast")
+    short = await pipeline.produce("Kubernetes 1.35 릴리스", upload=True)
+    print(short.video, short.video_id)
+"""
+import json
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from pathlib import Path
+from config import Config
+
+log = logging.getLogger("shorts.pipeline")
+
+
+class PipelineError(Exception):
+    """단계 실패 (결과 없이 진행 불가)"""
+
+
+@dataclass
+class Short:
+    """숏츠 한 편의 단계별 결과"""
+
+    topic: str
+    output_dir: Path
+    source_url: str = ""
+    summary: str = ""
+    script: dict | None = None
+    frames: list[dict] = field(default_factory=list)
+    narration: dict | None = None
+    durations: list[int] = field(default_factory=list)
+    clips: list[str] = field(default_factory=list)
+    video: str | None = None
+    seo: dict | None = None
+    video_id: str | None = None
+
+
+def _save_json(path: Path, data: dict):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+
+
+class Pipeline:
+    """단계별 파이프라인 (Gemini 클라이언트 / YouTube 서비스 / 프롬프트 캐시는 프로세스 전역 재사용)
+
+    Args:
+        quality: Veo 품질 (fast / full)
+        privacy: 업로드 공개 범위
+        optimize_upload: 업로드 전 트랜스코드
+        force_render: 입력이 같아도 다시 렌더링
+    """
+
+    def __init__(
+        self,
+        quality: str = "fast",
+        privacy: str = "private",
+        optimize_upload: bool = Config.UPLOAD_TRANSCODE,
+        force_render: bool = False,
+    ):
+        self.quality = quality
+        self.privacy = privacy
+        self.optimize_upload = optimize_upload
+        self.force_render = force_render
+
+    def warm_up(self, youtube: bool = False):
+        """첫 숏츠 전에 클라이언트 생성 (이후 호출은 재사용)"""
+        from modules.gemini_client import get_client
+
+        if not Config.GEMINI_API_KEY:
+            raise PipelineError("GEMINI_API_KEY가 설정되지 않았습니다")
+        if youtube and not Config.CLIENT_SECRET_FILE.exists():
+            raise PipelineError(f"YouTube OAuth2 파일이 없습니다: {Config.CLIENT_SECRET_FILE}")
+        get_client()
+        if youtube:
+            from modules.youtube_uploader import _get_authenticated_service
+            _get_authenticated_service()
+
+    def new_short(self, topic: str, source_url: str = "", summary: str = "") -> Short:
+        """출력 디렉토리를 만들고 빈 Short 반환"""
+        slug = topic.lower().replace(" ", "-")[:30]
+        return Short(
+            topic=topic, output_dir=Config.make_output_dir(slug),
+            source_url=source_url, summary=summary,
+        )
+
+    # --- 단계 ---
+
+    async def trends(self, top_n: int = 10) -> dict:
+        """트렌드 수집 → {"fetched_at", "total_collected", "total_unique", "top_topics"}"""
+        from modules.trends import acollect_trends
+
+        return await acollect_trends(top_n)
+
+    async def select(self, trends: dict) -> list[dict]:
+        """트렌드 → 주제 후보 목록"""
+        from modules.topic_selector import aselect_topics
+
+        result = await aselect_topics(trends)
+        candidates = result.get("candidates", [])
+        if not candidates:
+            raise PipelineError("주제 후보를 받지 못했습니다")
+        return candidates
+
+    async def script(self, short: Short) -> dict:
+        """스크립트 작성 → script.json"""
+        from modules import cost_ledger
+        from modules.script_writer import awrite_script
+
+        cost_ledger.start_run(short.topic)
+        script = await awrite_script(short.topic, short.source_url, short.summary)
+        _save_json(short.output_dir / "script.json", script)
+        if "raw_response" in script:
+            raise PipelineError("스크립트 JSON 파싱 실패")
+        short.script = script
+        return script
+
+    async def frames(self, short: Short) -> list[dict]:
+        """장면별 키프레임 이미지"""
+        from modules.image_generator import agenerate_frames
+
+        frames = await agenerate_frames(self._script(short), short.output_dir)
+        if not frames:
+            raise PipelineError("키프레임 생성 실패")
+        short.frames = frames
+        return frames
+
+    async def narration(self, short: Short) -> dict | None:
+        """TTS 나레이션 → {"path", "duration"} (실패 시 None, 나레이션 없이 진행 가능)"""
+        from modules.tts_generator import agenerate_narration
+
+        short.narration = await agenerate_narration(self._script(short), short.output_dir)
+        return short.narration
+
+    async def clips(self, short: Short) -> list[str]:
+        """나레이션 길이로 클립 길이 계획 → 예산 확인 → Veo 클립
+
+        Raises:
+            cost_ledger.BudgetExceeded: 예산 초과 예상
+        """
+        from modules import cost_ledger
+        from modules.scene_timing import plan_clip_durations
+        from modules.video_generator import agenerate_clips, estimate_cost
+
+        script = self._script(short)
+        if not short.frames:
+            raise PipelineError("키프레임이 없습니다 (frames 단계 먼저)")
+        durations = plan_clip_durations(
+            script,
+            short.narration["duration"] if short.narration else None,
+            num_scenes=max(len(script.get("scenes", [])), len(short.frames)),
+        )
+        cost_ledger.check_budget(
+            estimate_cost([durations[f["scene"] - 1] for f in short.frames], self.quality)
+        )
+        short.durations = durations
+        clips = await agenerate_clips(
+            short.frames, script, short.output_dir, self.quality, durations
+        )
+        if not clips:
+            raise PipelineError("영상 클립 생성 실패")
+        short.clips = clips
+        return clips
+
+    async def render(self, short: Short) -> str:
+        """Remotion 합성 (실패 시 FFmpeg 이어붙이기) → 최종 영상 경로"""
+        from modules.compositor import render as remotion_render
+        from modules.video_generator import concat_clips
+
+        if not short.clips:
+            raise PipelineError("클립이 없습니다 (clips 단계 먼저)")
+        video = await asyncio.to_thread(
+            remotion_render, self._script(short), short.clips, short.narration,
+            short.output_dir, force=self.force_render,
+        )
+        if not video:
+            log.warning("Remotion 실패. FFmpeg 폴백으로 클립 결합")
+            video = await asyncio.to_thread(concat_clips, short.clips, short.output_dir)
+        if not video:
+            raise PipelineError("영상 합성 실패")
+        short.video = video
+        return video
+
+    async def seo(self, short: Short) -> dict:
+        """SEO 메타데이터 → seo.json"""
+        from modules.seo_packager import agenerate_seo
+
+        seo = await agenerate_seo(self._script(short))
+        _save_json(short.output_dir / "seo.json", seo)
+        short.seo = seo
+        return seo
+
+    async def upload(self, short: Short) -> str:
+        """YouTube 업로드 → 영상 ID"""
+        from modules.youtube_uploader import aupload_from_dir
+
+        video_id = await aupload_from_dir(
+            str(short.output_dir), self.privacy, self.optimize_upload
+        )
+        if not video_id:
+            raise PipelineError("업로드 실패")
+        short.video_id = video_id
+        return video_id
+
+    # --- 조합 ---
+
+    async def produce(
+        self, topic: str, source_url: str = "", summary: str = "", upload: bool = False
+    ) -> Short:
+        """주제 하나로 전체 단계 실행 (키프레임/나레이션, 합성/SEO는 동시에)"""
+        short = self.new_short(topic, source_url, summary)
+        await self.script(short)
+        await asyncio.gather(self.frames(short), self.narration(short))
+        await self.clips(short)
+        await asyncio.gather(self.render(short), self.seo(short))
+        if upload:
+            await self.upload(short)
+        log.info("숏츠 완료: %s → %s", topic, short.output_dir)
+        return short
+
+    async def produce_from_trends(self, count: int = 1, upload: bool = False) -> list[Short]:
+        """트렌드 수집 → 상위 후보 count개를 차례로 생성 (실패한 주제는 건너뜀)"""
+        candidates = await self.select(await self.trends())
+        shorts = []
+        for candidate in candidates[:count]:
+            try:
+                shorts.append(await self.produce(
+                    candidate.get("topic", ""),
+                    source_url=candidate.get("source_url", ""),
+                    summary=candidate.get("summary", ""),
+                    upload=upload,
+                ))
+            except Exception as e:
+                log.error("주제 실패: %s — %s", candidate.get("topic"), e)
+        return shorts
+
+    @staticmethod
+    def _script(short: Short) -> dict:
+        if short.script is None:
+            raise PipelineError("스크립트가 없습니다 (script 단계 먼저)")
+        return short.script
@@ -0,0 +1,235 @@
+"""단계별 샘플링 프로파일러 (--profile)
+
+백그라운드 스레드가 PROFILE_INTERVAL마다 모든 스레드의 스택을 찍어
+단계별로 모은다. 단계 시간은 벽시계 / CPU / 자식 프로세스(ffmpeg, npx)로 나누고,
+나머지를 I/O 대기(네트워크, 잠금, 폴링 대기)로 본다. 결과는 출력 디렉토리의
+profile/에 저장된다:
+
+- profile.folded: flamegraph.pl / speedscope에 그대로 넣는 접힌 스택
+  (단계;스레드;파일:함수;...;[cpu|wait] 횟수)
+- stages.json: 단계별 요약
+
+start()를 부르지 않으면 stage()/set_output_dir()은 전역 변수 확인 후 바로 반환한다.
+"""
+import os
+import re
+import sys
+import json
+import time
+import logging
+import threading
+from collections import Counter
+from pathlib import Path
+
+from config import Config
+
+log = logging.getLogger("shorts.profile")
+
+# 스택 샘플 최대 깊이 (더 깊으면 바깥 프레임 생략)
+MAX_DEPTH = 64
+
+
+class _StageTimes:
+    """단계 1개의 누적 시간"""
+
+    __slots__ = ("wall", "cpu", "children", "samples", "cpu_samples")
+
+    def __init__(self):
+        self.wall = self.cpu = self.children = 0.0
+        self.samples = self.cpu_samples = 0
+
+    def to_dict(self) -> dict:
+        io_wait = max(self.wall - self.cpu - self.children, 0.0)
+        return {
+            "wall": round(self.wall, 3),
+            "cpu": round(self.cpu, 3),
+            "children": round(self.children, 3),
+            "io_wait": round(io_wait, 3),
+            "samples": self.samples,
+            "cpu_samples": self.cpu_samples,
+        }
+
+
+def _clock() -> tuple[float, float, float]:
+    """(벽시계, 이 프로세스 CPU, 종료된 자식 프로세스 CPU)"""
+    t = os.times()
+    return time.perf_counter(), t.user + t.system, t.children_user + t.children_system
+
+
+_CLK_TCK = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+
+
+def _thread_cpu(native_id: int | None) -> float | None:
+    """스레드별 CPU 시간 (/proc에서 읽음, 리눅스가 아니거나 종료된 스레드면 None)
+
+    pthread_getcpuclockid는 이미 종료된 스레드 ident에 쓰면 프로세스가 죽을 수
+    있어 쓰지 않는다. /proc은 종료된 스레드에 대해 OSError만 낸다.
+    """
+    if native_id is None:
+        return None
+    try:
+        with open(f"/proc/self/task/{native_id}/stat", "rb") as f:
+            stat = f.read()
+    except OSError:
+        return None
+    # 2번째 필드(comm)에 공백/괄호가 들어갈 수 있어 마지막 ')' 뒤부터 센다
+    fields = stat[stat.rfind(b")") + 2:].split()
+    # 14번째 utime, 15번째 stime (3번째 필드부터 세므로 11, 12)
+    return (int(fields[11]) + int(fields[12])) / _CLK_TCK
+
+
+def _frame_label(code) -> str:
+    path = Path(code.co_filename)
+    name = f"{path.parent.name}/{path.name}" if path.name == "__init__.py" else path.name
+    return f"{name}:{code.co_name}"
+
+
+class Profiler:
+    """샘플링 스레드 + 단계 구간 기록"""
+
+    def __init__(self, interval: float, first_stage: str):
+        self.interval = interval
+        self.output_dir: Path | None = None
+        self.stacks: Counter[str] = Counter()
+        self.stages: dict[str, _StageTimes] = {}
+        self._stage = first_stage
+        self._mark = _clock()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread_cpu: dict[int, float] = {}
+        self._sampler = threading.Thread(target=self._run, name="profiler", daemon=True)
+
+    def start(self):
+        self._sampler.start()
+
+    def switch(self, name: str):
+        """현재 단계 구간을 마감하고 name 단계 시작"""
+        now = _clock()
+        with self._lock:
+            self._close(now)
+            self._stage = name
+
+    def _close(self, now: tuple[float, float, float]):
+        times = self.stages.setdefault(self._stage, _StageTimes())
+        times.wall += now[0] - self._mark[0]
+        times.cpu += now[1] - self._mark[1]
+        times.children += now[2] - self._mark[2]
+        self._mark = now
+
+    def _run(self):
+        own = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            # 스레드 목록을 먼저 찍고 스택을 찍음 → 목록에 없는 ident는 CPU 조회 안 함
+            threads = {t.ident: t for t in threading.enumerate()}
+            frames = sys._current_frames()
+            with self._lock:
+                times = self.stages.setdefault(self._stage, _StageTimes())
+                for ident, frame in frames.items():
+                    if ident == own:
+                        continue
+                    thread = threads.get(ident)
+                    on_cpu = self._on_cpu(thread) if thread is not None else None
+                    name = thread.name if thread is not None else "thread"
+                    self.stacks[self._fold(name, frame, on_cpu)] += 1
+                    times.samples += 1
+                    times.cpu_samples += on_cpu is True
+                # 종료된 스레드의 이전 CPU 시간 정리
+                for native_id in self._thread_cpu.keys() - {t.native_id for t in threads.values()}:
+                    del self._thread_cpu[native_id]
+
+    def _on_cpu(self, thread: threading.Thread) -> bool | None:
+        """직전 샘플 이후 이 스레드가 CPU를 썼는지"""
+        cpu = _thread_cpu(thread.native_id)
+        if cpu is None:
+            return None
+        previous = self._thread_cpu.get(thread.native_id, cpu)
+        self._thread_cpu[thread.native_id] = cpu
+        # 샘플 간격의 절반 이상 CPU를 썼으면 실행 중으로 봄
+        return cpu - previous >= self.interval / 2
+
+    def _fold(self, thread_name: str, frame, on_cpu: bool | None) -> str:
+        labels = []
+        while frame is not None and len(labels) < MAX_DEPTH:
+            labels.append(_frame_label(frame.f_code))
+            frame = frame.f_back
+        labels.reverse()
+        # 워커 번호가 다른 풀 스레드는 하나로 합침 (ThreadPoolExecutor-0_3 → ThreadPoolExecutor-0)
+        thread_name = re.sub(r"_\d+$", "", thread_name)
+        parts = [self._stage, thread_name, *labels]
+        if on_cpu is not None:
+            parts.append("[cpu]" if on_cpu else "[wait]")
+        # 접힌 스택 형식은 ;와 공백이 구분자
+        return ";".join(p.replace(";", ":").replace(" ", "_") for p in parts)
+
+    def stop(self) -> Path | None:
+        """샘플링 중단 → profile/에 결과 저장 → 저장 디렉토리"""
+        self._stop.set()
+        self._sampler.join()
+        with self._lock:
+            self._close(_clock())
+
+        base = self.output_dir
+        if base is None:
+            base = Config.OUTPUTS_DIR / f"profile-{time.strftime('%Y%m%d-%H%M%S')}"
+        profile_dir = base / "profile" if self.output_dir else base
+        profile_dir.mkdir(parents=True, exist_ok=True)
+
+        with open(profile_dir / "profile.folded", "w", encoding="utf-8") as f:
+            for stack, count in sorted(self.stacks.items()):
+                f.write(f"{stack} {count}\n")
+
+        summary = {
+            "interval": self.interval,
+            "stages": {name: times.to_dict() for name, times in self.stages.items()},
+        }
+        with open(profile_dir / "stages.json", "w", encoding="utf-8") as f:
+            json.dump(summary, f, ensure_ascii=False, indent=2)
+
+        _log_summary(summary["stages"])
+        log.info("프로파일 저장: %s", profile_dir)
+        return profile_dir
+
+
+def _log_summary(stages: dict[str, dict]):
+    log.info("%-12s %8s %8s %8s %8s", "단계", "벽시계", "CPU", "자식", "I/O대기")
+    for name, t in stages.items():
+        log.info(
+            "%-12s %7.1fs %7.1fs %7.1fs %7.1fs",
+            name, t["wall"], t["cpu"], t["children"], t["io_wait"],
+        )
+
+
+_active: Profiler | None = None
+
+
+def start(first_stage: str = "setup", interval: float = Config.PROFILE_INTERVAL):
+    """프로파일링 시작 (프로세스당 한 번)"""
+    global _active
+    if _active is not None:
+        return
+    _active = Profiler(interval, first_stage)
+    _active.start()
+    log.info("프로파일링 시작 (샘플 간격 %.0fms)", interval * 1000)
+
+
+def stage(name: str):
+    """이후 시간을 name 단계로 기록 (다음 stage() 호출까지)"""
+    if _active is None:
+        return
+    _active.switch(name)
+
+
+def set_output_dir(output_dir: Path):
+    """결과를 저장할 출력 디렉토리 지정 (없으면 outputs/profile-<시각>)"""
+    if _active is None:
+        return
+    _active.output_dir = Path(output_dir)
+
+
+def stop() -> Path | None:
+    """프로파일링 종료 + 결과 저장 (시작하지 않았으면 None)"""
+    global _active
+    if _active is None:
+        return None
+    profiler, _active = _active, None
+    return profiler.stop()
@@ -0,0 +1,151 @@
+"""프롬프트 구성 — 단계별로 필요한 필드만 골라 압축 직렬화 + 토큰 예산 맞추기
+
+각 단계(topic/script/seo)는 Config.PROMPT_TOKEN_BUDGETS의 예산 안에서 입력을
+만든다. 예산 맞추기는 로컬 추정치로 하고, 절감량 보고는
+PROMPT_TOKEN_COUNTER=api면 SDK count_tokens로 실제 토큰을 센다.
+"""
+import json
+import logging
+from config import Config
+
+log = logging.getLogger("shorts.prompt")
+
+# 트렌드 항목에서 주제 선정에 쓰는 필드 (time은 "6개월 이상 된 내용" 제외 판단용)
+TREND_FIELDS = ("title", "url", "score", "comments", "time", "sources")
+
+# 제목이 이보다 길면 자름 (일부 Reddit 제목은 본문 수준)
+MAX_TITLE_CHARS = 160
+
+
+def compact_json(obj) -> str:
+    """공백 없는 JSON (한글 그대로)"""
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+
+
+def estimate_tokens(text: str) -> int:
+    """로컬 토큰 추정 (영문 ~4자/토큰, 한글 등 비ASCII ~1.5자/토큰)"""
+    ascii_chars = sum(1 for ch in text if ch.isascii())
+    return round(ascii_chars / 4 + (len(text) - ascii_chars) / 1.5)
+
+
+def count_tokens(text: str) -> int:
+    """보고용 토큰 수 (PROMPT_TOKEN_COUNTER=api면 SDK count_tokens, 실패 시 추정)"""
+    if Config.PROMPT_TOKEN_COUNTER == "api":
+        from modules.gemini_client import get_client
+        from modules.rate_limiter import rate_limited_call
+
+        try:
+            response = rate_limited_call(
+                Config.GEMINI_TEXT_MODEL,
+                get_client().models.count_tokens,
+                model=Config.GEMINI_TEXT_MODEL,
+                contents=text,
+            )
+            return response.total_tokens
+        except Exception as e:
+            log.debug("count_tokens 실패, 추정치 사용: %s", e)
+    return estimate_tokens(text)
+
+
+def _truncate(text: str, max_tokens: int) -> str:
+    """추정 토큰 수가 max_tokens 이하가 되도록 뒤를 자름"""
+    if estimate_tokens(text) <= max_tokens:
+        return text
+    lo, hi = 0, len(text)
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if estimate_tokens(text[:mid]) + 1 <= max_tokens:
+            lo = mid
+        else:
+            hi = mid - 1
+    return text[:lo] + "…"
+
+
+def _project(item: dict, fields: tuple[str, ...]) -> dict:
+    """지정 필드 중 값이 있는 것만"""
+    return {k: item[k] for k in fields if item.get(k) not in (None, "", [], {})}
+
+
+def _report(stage: str, baseline: str, prompt: str):
+    before, after = count_tokens(baseline), count_tokens(prompt)
+    saved = before - after
+    log.info(
+        "[%s] 입력 토큰 %d → %d (-%d, %.0f%%, 예산 %d)",
+        stage, before, after, saved, saved / before * 100 if before else 0,
+        Config.PROMPT_TOKEN_BUDGETS[stage],
+    )
+
+
+def build_topics_input(top_topics: list[dict]) -> str:
+    """주제 선정 입력 — 점수순 트렌드를 예산 안에서 앞에서부터 채움"""
+    budget = Config.PROMPT_TOKEN_BUDGETS["topic"]
+    lines, used = [], 0
+    for item in top_topics:
+        projected = _project(item, TREND_FIELDS)
+        if "title" in projected:
+            projected["title"] = projected["title"][:MAX_TITLE_CHARS]
+        if "time" in projected:
+            # ISO 시각 → 날짜만 (판단에는 날짜면 충분)
+            projected["time"] = projected["time"][:10]
+        line = compact_json(projected)
+        tokens = estimate_tokens(line) + 1
+        if used + tokens > budget:
+            log.info("주제 선정 입력: 예산 초과로 %d개 중 %d개만 사용", len(top_topics), len(lines))
+            break
+        lines.append(line)
+        used += tokens
+
+    # 한 줄에 한 항목 (JSON Lines) — 배열 괄호/들여쓰기 없이
+    text = "\n".join(lines)
+    _report("topic", json.dumps(top_topics, ensure_ascii=False, indent=2), text)
+    return text
+
+
+def build_script_input(topic: str, source_url: str = "", summary: str = "") -> str:
+    """스크립트 작성 입력 — 요약이 길면 예산에 맞게 자름"""
+    head = f"주제: {topic}\n" + (f"원문 링크: {source_url}\n" if source_url else "")
+    tail = "\n위 주제에 대해 60초 숏츠 스크립트를 작성해주세요."
+    text = head
+    if summary:
+        remaining = Config.PROMPT_TOKEN_BUDGETS["script"] - estimate_tokens(head + tail)
+        text += f"요약: {_truncate(summary, max(remaining - 4, 0))}\n"
+    text += tail
+
+    baseline = head + (f"요약: {summary}\n" if summary else "") + tail
+    if baseline != text:
+        _report("script", baseline, text)
+    return text
+
+
+def build_seo_input(script: dict) -> str:
+    """SEO 입력 — 주제/나레이션/자막/화면 문구만 (영상 프롬프트 제외)
+
+    예산을 넘으면 자막 → 화면 문구 순으로 빼고, 그래도 넘으면 본문 나레이션을 자름.
+    """
+    budget = Config.PROMPT_TOKEN_BUDGETS["seo"]
+    projected = {
+        "topic": script.get("topic", ""),
+        "narration": script.get("narration", {}),
+        "subtitles": script.get("subtitles", []),
+        "text_overlays": [
+            s["text_overlay"] for s in script.get("scenes", []) if s.get("text_overlay")
+        ],
+    }
+    projected = _project(projected, tuple(projected))
+    for key in ("subtitles", "text_overlays"):
+        if estimate_tokens(compact_json(projected)) <= budget:
+            break
+        projected.pop(key, None)
+
+    text = compact_json(projected)
+    overflow = estimate_tokens(text) - budget
+    main = projected.get("narration", {}).get("main", "")
+    if overflow > 0 and main:
+        projected["narration"] = {
+            **projected["narration"],
+            "main": _truncate(main, max(estimate_tokens(main) - overflow, 0)),
+        }
+        text = compact_json(projected)
+
+    _report("seo", json.dumps(script, ensure_ascii=False, indent=2), text)
+    return text
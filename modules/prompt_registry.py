@@ -0,0 +1,121 @@
+"""프롬프트 레지스트리 — prompts/*.md를 한 번만 읽고, 시스템 프롬프트를 Gemini 컨텍스트 캐시로 재사용
+
+같은 시스템 프롬프트를 매 호출마다 보내는 대신 서버 측 캐시(caches.create)를
+만들어 cached_content로 참조한다. 캐시 이름에 프롬프트 해시를 넣어 다른
+프로세스(다음 실행, 다른 워커)가 만든 캐시도 찾아 쓴다. 만료가 가까우면 TTL을
+연장하고, 캐시를 쓸 수 없으면(최소 토큰 미달, 미지원 모델 등) 인라인
+system_instruction으로 보낸다.
+"""
+import hashlib
+import logging
+import threading
+from datetime import datetime, timedelta, timezone
+from config import Config
+
+log = logging.getLogger("shorts.prompt")
+
+_templates_lock = threading.Lock()
+_templates: dict[str, str] = {}
+# 캐시 생성/연장은 잠금 안에서 — 같은 프롬프트의 캐시를 동시에 여러 개 만들지 않게
+_lock = threading.Lock()
+# (모델, 프롬프트 해시) → {"name": 캐시 이름, "expires": 만료 시각} / None = 캐시 불가
+_caches: dict[tuple[str, str], dict | None] = {}
+
+
+def load(filename: str) -> str:
+    """prompts/ 템플릿 (처음 한 번만 디스크에서 읽음)"""
+    with _templates_lock:
+        if filename not in _templates:
+            _templates[filename] = (Config.PROMPTS_DIR / filename).read_text(encoding="utf-8")
+        return _templates[filename]
+
+
+def prompt_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:16]
+
+
+def _display_name(model: str, digest: str) -> str:
+    return f"shorts-{model.rsplit('/', 1)[-1]}-{digest}"
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _find_existing(client, model: str, digest: str) -> dict | None:
+    """다른 프로세스가 만들어 둔 같은 프롬프트의 캐시"""
+    wanted = _display_name(model, digest)
+    for cache in client.caches.list():
+        if cache.display_name == wanted and cache.expire_time and cache.expire_time > _now():
+            return {"name": cache.name, "expires": cache.expire_time}
+    return None
+
+
+def _create(client, model: str, text: str, digest: str) -> dict:
+    cache = client.caches.create(
+        model=model,
+        config={
+            "display_name": _display_name(model, digest),
+            "system_instruction": text,
+            "ttl": f"{Config.PROMPT_CACHE_TTL}s",
+        },
+    )
+    log.info("프롬프트 캐시 생성: %s (TTL %d초)", cache.name, Config.PROMPT_CACHE_TTL)
+    return {
+        "name": cache.name,
+        "expires": cache.expire_time or _now() + timedelta(seconds=Config.PROMPT_CACHE_TTL),
+    }
+
+
+def _refresh(client, entry: dict) -> dict:
+    """TTL 연장 (실패하면 예외 — 호출 측에서 새로 생성)"""
+    cache = client.caches.update(
+        name=entry["name"], config={"ttl": f"{Config.PROMPT_CACHE_TTL}s"}
+    )
+    log.debug("프롬프트 캐시 TTL 연장: %s", entry["name"])
+    return {
+        "name": entry["name"],
+        "expires": cache.expire_time or _now() + timedelta(seconds=Config.PROMPT_CACHE_TTL),
+    }
+
+
+def cached_content(client, model: str, text: str) -> str | None:
+    """시스템 프롬프트의 캐시 이름 (없으면 생성/연장, 쓸 수 없으면 None)"""
+    if not Config.PROMPT_CACHE:
+        return None
+    key = (model, prompt_hash(text))
+
+    with _lock:
+        if key in _caches and _caches[key] is None:
+            return None
+        entry = _caches.get(key)
+        margin = timedelta(seconds=Config.PROMPT_CACHE_REFRESH_MARGIN)
+        if entry and entry["expires"] - margin > _now():
+            return entry["name"]
+
+        try:
+            if entry:
+                try:
+                    entry = _refresh(client, entry)
+                except Exception as e:
+                    log.info("프롬프트 캐시 연장 실패, 새로 생성: %s", e)
+                    entry = _create(client, model, text, key[1])
+            else:
+                entry = _find_existing(client, model, key[1])
+                if entry and entry["expires"] - margin <= _now():
+                    entry = _refresh(client, entry)
+                entry = entry or _create(client, model, text, key[1])
+        except Exception as e:
+            # 최소 토큰 수 미달 / 미지원 모델 등 — 이 프로세스에서는 인라인으로
+            log.info("프롬프트 캐시 사용 불가, 인라인 프롬프트 사용: %s", e)
+            _caches[key] = None
+            return None
+
+        _caches[key] = entry
+        return entry["name"]
+
+
+def invalidate(model: str, text: str):
+    """캐시 참조가 실패했을 때 항목 제거 (다음 호출에서 다시 찾거나 생성)"""
+    with _lock:
+        _caches.pop((model, prompt_hash(text)), None)
@@ -0,0 +1,217 @@
+"""모델별 API 요청 한도 관리 — 토큰 버킷 + Retry-After + AIMD 동시성 제어
+
+모든 generate_content / generate_videos 호출은 rate_limited_call()
+(비동기는 arate_limited_call())을 거친다. 같은 프로세스의 모든 스레드와
+asyncio 태스크가 모델 이름별로 하나의 리미터를 공유한다.
+"""
+import re
+import time
+import asyncio
+import random
+import logging
+import threading
+from typing import Any, Callable
+
+from config import Config
+
+log = logging.getLogger("shorts.ratelimit")
+
+# 429 재시도 설정
+MAX_RETRIES = 5
+BASE_BACKOFF = 2.0
+
+# 비동기 대기 중 동시성 슬롯 재확인 간격(초)
+ASYNC_POLL_INTERVAL = 0.05
+
+
+class TokenBucket:
+    """분당 요청 수 제한 토큰 버킷"""
+
+    def __init__(self, rate_per_min: float, burst: int):
+        self.rate = rate_per_min / 60.0
+        self.capacity = float(burst)
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def try_acquire(self) -> float:
+        """토큰 1개를 가져오면 0, 아니면 다음 토큰까지 남은 시간(초)"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.capacity, self._tokens + (now - self._updated) * self.rate
+            )
+            self._updated = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0.0
+            return (1 - self._tokens) / self.rate
+
+    def acquire(self):
+        """토큰 1개를 얻을 때까지 대기"""
+        while (wait := self.try_acquire()) > 0:
+            time.sleep(wait)
+
+    async def aacquire(self):
+        """토큰 1개를 얻을 때까지 대기 (이벤트 루프를 막지 않음)"""
+        while (wait := self.try_acquire()) > 0:
+            await asyncio.sleep(wait)
+
+
+class ModelLimiter:
+    """모델 1개의 요청 속도 + 동시 요청 수 (429 관측 시 AIMD로 조절)"""
+
+    def __init__(self, model: str, rpm: int, max_concurrency: int):
+        self.model = model
+        self.max_concurrency = max_concurrency
+        self.limit = float(max_concurrency)
+        self.bucket = TokenBucket(rpm, burst=max_concurrency)
+        self.in_flight = 0
+        self.throttled = 0
+        self._cooldown_until = 0.0
+        self._cond = threading.Condition()
+
+    def _enter(self):
+        with self._cond:
+            while True:
+                cooldown = self._cooldown_until - time.monotonic()
+                if cooldown > 0:
+                    self._cond.wait(cooldown)
+                elif self.in_flight >= int(self.limit):
+                    self._cond.wait()
+                else:
+                    break
+            self.in_flight += 1
+        self.bucket.acquire()
+
+    async def _aenter(self):
+        # 스레드 쪽과 같은 상태를 공유하므로 Condition 대기 대신 짧게 잠들며 재확인
+        while True:
+            with self._cond:
+                cooldown = self._cooldown_until - time.monotonic()
+                if cooldown > 0:
+                    wait = cooldown
+                elif self.in_flight >= int(self.limit):
+                    wait = ASYNC_POLL_INTERVAL
+                else:
+                    self.in_flight += 1
+                    break
+            await asyncio.sleep(wait)
+        try:
+            await self.bucket.aacquire()
+        except asyncio.CancelledError:
+            self._exit(success=False)
+            raise
+
+    def _exit(self, success: bool):
+        with self._cond:
+            self.in_flight -= 1
+            if success:
+                # 가산 증가: 한도 1개를 늘리는 데 현재 한도만큼의 성공이 필요
+                self.limit = min(self.max_concurrency, self.limit + 1 / self.limit)
+            self._cond.notify_all()
+
+    def _throttle(self, delay: float):
+        """429 관측 → 동시성 절반 + 모델 전체 쿨다운"""
+        with self._cond:
+            self.in_flight -= 1
+            self.throttled += 1
+            self.limit = max(1.0, self.limit / 2)
+            self._cooldown_until = max(self._cooldown_until, time.monotonic() + delay)
+            self._cond.notify_all()
+
+    def call(self, fn: Callable, /, *args, **kwargs) -> Any:
+        """fn 호출 — 429면 Retry-After(없으면 지수 백오프)만큼 쉬고 재시도"""
+        for attempt in range(MAX_RETRIES + 1):
+            self._enter()
+            try:
+                result = fn(*args, **kwargs)
+            except Exception as e:
+                if not _is_rate_limited(e) or attempt == MAX_RETRIES:
+                    self._exit(success=False)
+                    raise
+                delay = _retry_after(e) or BASE_BACKOFF * 2**attempt + random.random()
+                self._throttle(delay)
+                log.warning(
+                    "%s 429 — %.1f초 후 재시도 (%d/%d, 동시성 %d)",
+                    self.model, delay, attempt + 1, MAX_RETRIES, int(self.limit),
+                )
+                continue
+            self._exit(success=True)
+            return result
+
+    async def acall(self, fn: Callable, /, *args, **kwargs) -> Any:
+        """call()의 비동기 버전 — fn은 코루틴 함수"""
+        for attempt in range(MAX_RETRIES + 1):
+            await self._aenter()
+            try:
+                result = await fn(*args, **kwargs)
+            except asyncio.CancelledError:
+                self._exit(success=False)
+                raise
+            except Exception as e:
+                if not _is_rate_limited(e) or attempt == MAX_RETRIES:
+                    self._exit(success=False)
+                    raise
+                delay = _retry_after(e) or BASE_BACKOFF * 2**attempt + random.random()
+                self._throttle(delay)
+                log.warning(
+                    "%s 429 — %.1f초 후 재시도 (%d/%d, 동시성 %d)",
+                    self.model, delay, attempt + 1, MAX_RETRIES, int(self.limit),
+                )
+                continue
+            self._exit(success=True)
+            return result
+
+
+def _is_rate_limited(exc: Exception) -> bool:
+    """429 / RESOURCE_EXHAUSTED 여부"""
+    code = getattr(exc, "code", None) or getattr(exc, "status_code", None)
+    if code == 429:
+        return True
+    return "RESOURCE_EXHAUSTED" in str(exc)
+
+
+def _retry_after(exc: Exception) -> float | None:
+    """Retry-After 헤더 또는 google.rpc.RetryInfo의 retryDelay(초)"""
+    response = getattr(exc, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    value = headers.get("retry-after") or headers.get("Retry-After")
+    if value:
+        try:
+            return float(value)
+        except ValueError:
+            pass
+
+    details = str(getattr(exc, "details", ""))
+    match = re.search(r"retryDelay['\"]?:\s*['\"](\d+(?:\.\d+)?)s", details)
+    if match:
+        return float(match.group(1))
+    return None
+
+
+_limiters: dict[str, ModelLimiter] = {}
+_registry_lock = threading.Lock()
+
+
+def get_limiter(model: str) -> ModelLimiter:
+    """모델 이름별 공유 리미터 (Config.RATE_LIMITS, 없으면 기본값)"""
+    with _registry_lock:
+        limiter = _limiters.get(model)
+        if limiter is None:
+            rpm, max_concurrency = Config.RATE_LIMITS.get(
+                model, Config.DEFAULT_RATE_LIMIT
+            )
+            limiter = ModelLimiter(model, rpm, max_concurrency)
+            _limiters[model] = limiter
+        return limiter
+
+
+def rate_limited_call(model: str, fn: Callable, /, *args, **kwargs) -> Any:
+    """model의 리미터를 거쳐 fn(*args, **kwargs) 호출"""
+    return get_limiter(model).call(fn, *args, **kwargs)
+
+
+async def arate_limited_call(model: str, fn: Callable, /, *args, **kwargs) -> Any:
+    """model의 리미터를 거쳐 await fn(*args, **kwargs)"""
+    return await get_limiter(model).acall(fn, *args, **kwargs)
@@ -0,0 +1,333 @@
+"""Gemini JSON 응답 파싱 — 구조화 출력 + 스트리밍 증분 파싱 + 1회 복구 호출
+
+generate_json은 동기 클라이언트, agenerate_json은 client.aio로 같은 요청을 보낸다.
+"""
+import json
+import asyncio
+import logging
+import itertools
+from typing import Callable
+
+from modules import cost_ledger, prompt_registry
+from modules.rate_limiter import rate_limited_call, arate_limited_call
+
+log = logging.getLogger("shorts.parser")
+
+
+def extract_json(text: str) -> dict:
+    """응답 텍스트에서 JSON 객체 추출 (```json 펜스/앞뒤 잡음 허용)
+
+    Raises:
+        ValueError: JSON 객체를 찾지 못했거나 파싱 실패
+    """
+    if "```json" in text:
+        candidate = text.split("```json", 1)[1].split("```", 1)[0]
+    elif "```" in text:
+        candidate = text.split("```", 2)[1]
+    else:
+        candidate = text
+
+    try:
+        return json.loads(candidate)
+    except json.JSONDecodeError:
+        pass
+
+    # 펜스 없이 앞뒤에 설명이 붙은 경우: 첫 '{' ~ 마지막 '}'
+    start, end = text.find("{"), text.rfind("}")
+    if start == -1 or end <= start:
+        raise ValueError("JSON 객체를 찾을 수 없습니다")
+    try:
+        return json.loads(text[start:end + 1])
+    except json.JSONDecodeError as e:
+        raise ValueError(f"JSON 파싱 실패: {e}") from e
+
+
+class JSONStreamParser:
+    """스트리밍 텍스트를 받아 최상위 객체의 특정 배열 원소를 완성되는 즉시 반환
+
+    예: array_key="scenes"이면 {"scenes": [{...}, {...}]}의 각 장면 객체가
+    닫히는 순간 feed()의 반환값으로 나온다. 전체 텍스트는 finish()로 파싱.
+    """
+
+    def __init__(self, array_key: str | None = None):
+        self.array_key = array_key
+        self._text = ""
+        self._pos = 0
+        self._stack: list[str] = []
+        self._in_string = False
+        self._escape = False
+        self._string_start = -1
+        self._last_string = ""
+        self._pending_key: str | None = None
+        self._array_level: int | None = None
+        self._item_start = -1
+
+    @property
+    def text(self) -> str:
+        return self._text
+
+    def feed(self, chunk: str) -> list[dict]:
+        """청크 추가 → 이번 청크로 완성된 배열 원소 목록"""
+        if not chunk:
+            return []
+        self._text += chunk
+        completed = []
+        text = self._text
+
+        for i in range(self._pos, len(text)):
+            ch = text[i]
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                    self._last_string = text[self._string_start:i + 1]
+                continue
+
+            # 최상위 객체 시작 전의 잡음(```json 등)은 무시
+            if not self._stack and ch != "{":
+                continue
+
+            if ch == '"':
+                self._in_string = True
+                self._string_start = i
+            elif ch == ":" and len(self._stack) == 1:
+                try:
+                    self._pending_key = json.loads(self._last_string)
+                except json.JSONDecodeError:
+                    self._pending_key = None
+            elif ch == "," and len(self._stack) == 1:
+                self._pending_key = None
+            elif ch in "{[":
+                if (
+                    ch == "{"
+                    and self._array_level is not None
+                    and len(self._stack) == self._array_level
+                ):
+                    self._item_start = i
+                self._stack.append(ch)
+                if (
+                    ch == "["
+                    and len(self._stack) == 2
+                    and self.array_key is not None
+                    and self._pending_key == self.array_key
+                ):
+                    self._array_level = 2
+            elif ch in "}]":
+                if not self._stack:
+                    continue
+                self._stack.pop()
+                if self._array_level is None:
+                    continue
+                if ch == "]" and len(self._stack) == self._array_level - 1:
+                    self._array_level = None
+                elif (
+                    ch == "}"
+                    and len(self._stack) == self._array_level
+                    and self._item_start >= 0
+                ):
+                    try:
+                        completed.append(json.loads(text[self._item_start:i + 1]))
+                    except json.JSONDecodeError as e:
+                        log.debug("스트리밍 원소 파싱 실패: %s", e)
+                    self._item_start = -1
+
+        self._pos = len(text)
+        return completed
+
+    def finish(self) -> dict:
+        """누적 텍스트 전체 파싱 (실패 시 ValueError)"""
+        return extract_json(self._text)
+
+
+def _json_config(
+    system_prompt: str | None, schema: dict | None, cached_content: str | None = None
+) -> dict:
+    """구조화 출력(JSON 모드) 설정 (캐시가 있으면 시스템 프롬프트 대신 캐시 참조)"""
+    config = {"response_mime_type": "application/json"}
+    if cached_content:
+        config["cached_content"] = cached_content
+    elif system_prompt:
+        config["system_instruction"] = system_prompt
+    if schema:
+        config["response_schema"] = schema
+    return config
+
+
+def _record_usage(model: str, usage, stage: str):
+    """응답 usage_metadata의 입력(캐시 적중분 별도)/출력 토큰을 비용 원장에 기록"""
+    if usage is None:
+        return
+    cached = usage.cached_content_token_count or 0
+    cost_ledger.record(model, "input_tokens", (usage.prompt_token_count or 0) - cached, stage)
+    if cached:
+        cost_ledger.record(model, "cached_tokens", cached, stage)
+    cost_ledger.record(model, "output_tokens", usage.candidates_token_count or 0, stage)
+
+
+def _repair_prompt(raw_text: str, error: str) -> str:
+    return (
+        "아래 텍스트는 JSON으로 파싱되지 않습니다.\n"
+        f"오류: {error}\n"
+        "내용은 그대로 두고 문법만 고친 유효한 JSON 객체 하나만 반환하세요.\n\n"
+        f"{raw_text}"
+    )
+
+
+def _repair(
+    client, model: str, raw_text: str, error: str, schema: dict | None, stage: str
+) -> dict:
+    """잘못된 JSON 응답을 고치는 1회 복구 호출"""
+    log.warning("JSON 파싱 실패 (%s), 복구 요청 중...", error)
+    response = rate_limited_call(
+        model,
+        client.models.generate_content,
+        model=model,
+        contents=_repair_prompt(raw_text, error),
+        config=_json_config(None, schema),
+    )
+    _record_usage(model, response.usage_metadata, stage)
+    return extract_json(response.text or "")
+
+
+async def _arepair(
+    client, model: str, raw_text: str, error: str, schema: dict | None, stage: str
+) -> dict:
+    """_repair의 비동기 버전"""
+    log.warning("JSON 파싱 실패 (%s), 복구 요청 중...", error)
+    response = await arate_limited_call(
+        model,
+        client.aio.models.generate_content,
+        model=model,
+        contents=_repair_prompt(raw_text, error),
+        config=_json_config(None, schema),
+    )
+    _record_usage(model, response.usage_metadata, stage)
+    return extract_json(response.text or "")
+
+
+def _feed(parser: JSONStreamParser, chunk, usage, on_item: Callable[[dict], None] | None):
+    """청크 1개 처리 → 최신 사용량 (사용량은 마지막 청크에 누적값으로 온다)"""
+    for item in parser.feed(chunk.text or ""):
+        if on_item:
+            on_item(item)
+    return chunk.usage_metadata or usage
+
+
+def generate_json(
+    client,
+    model: str,
+    contents: str,
+    system_prompt: str | None = None,
+    schema: dict | None = None,
+    array_key: str | None = None,
+    on_item: Callable[[dict], None] | None = None,
+    stage: str = "text",
+) -> dict:
+    """Gemini 스트리밍 호출 → JSON 객체
+
+    array_key/on_item을 주면 해당 배열의 원소가 완성될 때마다 on_item을
+    호출한다 (예: 장면 하나가 완성되면 바로 다음 단계 시작).
+    system_prompt는 가능하면 컨텍스트 캐시(prompt_registry)로 보낸다.
+    파싱 실패 시 복구 호출을 한 번 하고, 그래도 실패하면
+    {"raw_response": 원본 텍스트}를 반환한다. 토큰 사용량은 stage 이름으로
+    비용 원장에 기록된다.
+    """
+    parser = JSONStreamParser(array_key=array_key)
+
+    def _open_stream(config: dict):
+        # 요청은 첫 청크를 받을 때 나가므로 429도 여기서 발생 → 리미터가 재시도
+        stream = iter(client.models.generate_content_stream(
+            model=model, contents=contents, config=config,
+        ))
+        first = next(stream, None)
+        return itertools.chain([first] if first is not None else [], stream)
+
+    cache_name = (
+        prompt_registry.cached_content(client, model, system_prompt) if system_prompt else None
+    )
+    try:
+        stream = rate_limited_call(
+            model, _open_stream, _json_config(system_prompt, schema, cache_name)
+        )
+    except Exception as e:
+        if not cache_name:
+            raise
+        # 캐시가 만료/삭제됨 — 이번 호출은 인라인으로, 다음 호출에서 다시 생성
+        log.warning("캐시된 프롬프트 호출 실패, 인라인으로 재시도: %s", e)
+        prompt_registry.invalidate(model, system_prompt)
+        stream = rate_limited_call(model, _open_stream, _json_config(system_prompt, schema))
+
+    usage = None
+    for chunk in stream:
+        usage = _feed(parser, chunk, usage, on_item)
+    _record_usage(model, usage, stage)
+
+    try:
+        return parser.finish()
+    except ValueError as e:
+        error = str(e)
+
+    try:
+        return _repair(client, model, parser.text, error, schema, stage)
+    except Exception as e:
+        log.warning("JSON 복구 실패, 원본 텍스트 반환: %s", e)
+        return {"raw_response": parser.text}
+
+
+async def agenerate_json(
+    client,
+    model: str,
+    contents: str,
+    system_prompt: str | None = None,
+    schema: dict | None = None,
+    array_key: str | None = None,
+    on_item: Callable[[dict], None] | None = None,
+    stage: str = "text",
+) -> dict:
+    """generate_json의 비동기 버전 (client.aio 스트리밍)"""
+    parser = JSONStreamParser(array_key=array_key)
+
+    async def _open_stream(config: dict):
+        stream = await client.aio.models.generate_content_stream(
+            model=model, contents=contents, config=config,
+        )
+        return await anext(stream, None), stream
+
+    cache_name = (
+        await asyncio.to_thread(prompt_registry.cached_content, client, model, system_prompt)
+        if system_prompt else None
+    )
+    try:
+        first, stream = await arate_limited_call(
+            model, _open_stream, _json_config(system_prompt, schema, cache_name)
+        )
+    except Exception as e:
+        if not cache_name:
+            raise
+        log.warning("캐시된 프롬프트 호출 실패, 인라인으로 재시도: %s", e)
+        prompt_registry.invalidate(model, system_prompt)
+        first, stream = await arate_limited_call(
+            model, _open_stream, _json_config(system_prompt, schema)
+        )
+
+    usage = None
+    if first is not None:
+        usage = _feed(parser, first, usage, on_item)
+        async for chunk in stream:
+            usage = _feed(parser, chunk, usage, on_item)
+    _record_usage(model, usage, stage)
+
+    try:
+        return parser.finish()
+    except ValueError as e:
+        error = str(e)
+
+    try:
+        return await _arepair(client, model, parser.text, error, schema, stage)
+    except Exception as e:
+        log.warning("JSON 복구 실패, 원본 텍스트 반환: %s", e)
+        return {"raw_response": parser.text}
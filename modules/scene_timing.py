@@ -0,0 +1,58 @@
+"""장면별 길이 계획 — 나레이션 길이(또는 스크립트 글자 수 추정)로 Veo 클립 길이 결정"""
+import logging
+from config import Config
+
+log = logging.getLogger("shorts.timing")
+
+
+def narration_text(script: dict) -> str:
+    """나레이션 전체 텍스트 (hook + main + cta)"""
+    narration = script.get("narration", {})
+    parts = [
+        narration.get("hook", ""),
+        narration.get("main", ""),
+        narration.get("cta", ""),
+    ]
+    return " ".join(p for p in parts if p)
+
+
+def estimate_narration_seconds(script: dict) -> float:
+    """TTS 전 나레이션 길이 추정 (글자 수 / 초당 글자 수 × 여유 배수)"""
+    chars = len(narration_text(script))
+    return chars / Config.NARRATION_CHARS_PER_SEC * Config.NARRATION_DURATION_MARGIN
+
+
+def veo_duration_for(seconds: float) -> int:
+    """목표 길이를 덮는 가장 짧은 Veo 지원 길이 (최대 길이로 상한)"""
+    for duration in sorted(Config.VEO_DURATIONS):
+        if duration >= seconds:
+            return duration
+    return max(Config.VEO_DURATIONS)
+
+
+def plan_clip_durations(
+    script: dict, narration_duration: float | None = None, num_scenes: int | None = None
+) -> list[int]:
+    """장면별 Veo 요청 길이(초)
+
+    compositor._build_props와 같은 방식(총 길이를 장면 수로 균등 분배)으로
+    장면 목표 길이를 구한 뒤, 이를 덮는 가장 짧은 지원 길이를 고른다.
+    narration_duration이 없으면 스크립트 글자 수로 추정한다.
+    """
+    if num_scenes is None:
+        num_scenes = len(script.get("scenes", []))
+    if num_scenes == 0:
+        return []
+
+    total = narration_duration or estimate_narration_seconds(script)
+    if not total:
+        return [Config.VEO_CLIP_DURATION] * num_scenes
+
+    # 프레임 단위 분배 시 올림되는 만큼 약간의 여유
+    per_scene = total / num_scenes + 0.1
+    durations = [veo_duration_for(per_scene)] * num_scenes
+    log.info(
+        "장면 길이 계획: 총 %.1f초 / %d장면 → 장면당 %.1f초 → Veo %d초",
+        total, num_scenes, per_scene, durations[0],
+    )
+    return durations
@@ -1,49 +1,107 @@
 """Gemini API 기반 60초 한국어 스크립트 작성"""
-import json
 import logging
-from google import genai
+from typing import Callable
 from config import Config
+from modules import prompt_registry
+from modules.gemini_client import get_client
+from modules.prompt_builder import build_script_input
+from modules.response_parser import generate_json, agenerate_json
 
 log = logging.getLogger("shorts.script")
 
+# 구조화 출력 스키마 (prompts/script_writer.md 출력 형식)
+SCRIPT_SCHEMA = {
+    "type": "OBJECT",
+    "properties": {
+        "topic": {"type": "STRING"},
+        "total_duration_seconds": {"type": "INTEGER"},
+        "narration": {
+            "type": "OBJECT",
+            "properties": {
+                "hook": {"type": "STRING"},
+                "main": {"type": "STRING"},
+                "cta": {"type": "STRING"},
+            },
+            "required": ["hook", "main", "cta"],
+            "property_ordering": ["hook", "main", "cta"],
+        },
+        "subtitles": {"type": "ARRAY", "items": {"type": "STRING"}},
+        "scenes": {
+            "type": "ARRAY",
+            "items": {
+                "type": "OBJECT",
+                "properties": {
+                    "scene_number": {"type": "INTEGER"},
+                    "time_range": {"type": "STRING"},
+                    "description": {"type": "STRING"},
+                    "text_overlay": {"type": "STRING"},
+                    "visual_prompt": {"type": "STRING"},
+                    "veo_prompt": {"type": "STRING"},
+                },
+                "required": ["scene_number", "visual_prompt", "veo_prompt"],
+                "property_ordering": [
+                    "scene_number", "time_range", "description",
+                    "text_overlay", "visual_prompt", "veo_prompt",
+                ],
+            },
+        },
+    },
+    "required": ["topic", "narration", "subtitles", "scenes"],
+    "property_ordering": [
+        "topic", "total_duration_seconds", "narration", "subtitles", "scenes",
+    ],
+}
 
-def _load_prompt() -> str:
-    return (Config.PROMPTS_DIR / "script_writer.md").read_text(encoding="utf-8")
 
+def _request(topic: str, source_url: str, summary: str, on_scene) -> dict:
+    """generate_json / agenerate_json 공통 인자"""
+    return {
+        "contents": build_script_input(topic, source_url=source_url, summary=summary),
+        "system_prompt": prompt_registry.load("script_writer.md"),
+        "schema": SCRIPT_SCHEMA,
+        "array_key": "scenes",
+        "on_item": on_scene,
+        "stage": "script",
+    }
 
-def write_script(topic: str, source_url: str = "", summary: str = "") -> dict:
-    """주제 → Gemini → 60초 스크립트 + 장면별 프롬프트 JSON"""
-    Config.validate(need_gemini=True)
 
-    client = genai.Client(api_key=Config.GEMINI_API_KEY)
-    system_prompt = _load_prompt()
+def write_script(
+    topic: str,
+    source_url: str = "",
+    summary: str = "",
+    on_scene: Callable[[dict], None] | None = None,
+) -> dict:
+    """주제 → Gemini → 60초 스크립트 + 장면별 프롬프트 JSON
 
-    user_content = f"주제: {topic}\n"
-    if source_url:
-        user_content += f"원문 링크: {source_url}\n"
-    if summary:
-        user_content += f"요약: {summary}\n"
-    user_content += "\n위 주제에 대해 60초 숏츠 스크립트를 작성해주세요."
+    on_scene을 주면 스트리밍 응답에서 장면 객체가 완성될 때마다 호출된다
+    (전체 스크립트를 기다리지 않고 키프레임 생성 시작).
+    """
+    Config.validate(need_gemini=True)
 
     log.info("스크립트 작성 중: %s", topic)
-    response = client.models.generate_content(
-        model=Config.GEMINI_TEXT_MODEL,
-        contents=user_content,
-        config={"system_instruction": system_prompt},
+    script = generate_json(
+        get_client(), Config.GEMINI_TEXT_MODEL,
+        **_request(topic, source_url, summary, on_scene),
     )
 
-    response_text = response.text
-    try:
-        if "```json" in response_text:
-            json_str = response_text.split("```json")[1].split("```")[0]
-        elif "```" in response_text:
-            json_str = response_text.split("```")[1].split("```")[0]
-        else:
-            json_str = response_text
-        script = json.loads(json_str)
-    except (json.JSONDecodeError, IndexError):
-        log.warning("JSON 파싱 실패, 원본 텍스트 반환")
-        script = {"raw_response": response_text}
+    log.info("스크립트 작성 완료: %d 장면", len(script.get("scenes", [])))
+    return script
+
+
+async def awrite_script(
+    topic: str,
+    source_url: str = "",
+    summary: str = "",
+    on_scene: Callable[[dict], None] | None = None,
+) -> dict:
+    """write_script의 비동기 버전 (on_scene은 이벤트 루프에서 호출되므로 짧게)"""
+    Config.validate(need_gemini=True)
+
+    log.info("스크립트 작성 중: %s", topic)
+    script = await agenerate_json(
+        get_client(), Config.GEMINI_TEXT_MODEL,
+        **_request(topic, source_url, summary, on_scene),
+    )
 
     log.info("스크립트 작성 완료: %d 장면", len(script.get("scenes", [])))
     return script
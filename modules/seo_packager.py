@@ -1,47 +1,85 @@
 """Gemini API 기반 SEO 메타데이터 생성"""
-import json
 import logging
-from google import genai
 from config import Config
+from modules import prompt_registry
+from modules.gemini_client import get_client
+from modules.prompt_builder import build_seo_input
+from modules.response_parser import generate_json, agenerate_json
 
 log = logging.getLogger("shorts.seo")
 
+# 구조화 출력 스키마 (prompts/seo_packager.md 출력 형식)
+SEO_SCHEMA = {
+    "type": "OBJECT",
+    "properties": {
+        "titles": {
+            "type": "OBJECT",
+            "properties": {
+                "A": {"type": "STRING"},
+                "B": {"type": "STRING"},
+                "C": {"type": "STRING"},
+            },
+            "required": ["A", "B", "C"],
+        },
+        "description": {"type": "STRING"},
+        "tags": {"type": "ARRAY", "items": {"type": "STRING"}},
+        "hashtags": {"type": "ARRAY", "items": {"type": "STRING"}},
+        "thumbnail": {
+            "type": "OBJECT",
+            "properties": {
+                "main_text": {"type": "STRING"},
+                "sub_text": {"type": "STRING"},
+                "style": {"type": "STRING"},
+            },
+        },
+        "upload_time": {
+            "type": "OBJECT",
+            "properties": {
+                "recommended": {"type": "STRING"},
+                "reason": {"type": "STRING"},
+            },
+        },
+        "next_topics": {"type": "ARRAY", "items": {"type": "STRING"}},
+    },
+    "required": ["titles", "description", "tags", "hashtags"],
+    "property_ordering": [
+        "titles", "description", "tags", "hashtags",
+        "thumbnail", "upload_time", "next_topics",
+    ],
+}
 
-def _load_prompt() -> str:
-    return (Config.PROMPTS_DIR / "seo_packager.md").read_text(encoding="utf-8")
+
+def _request(script: dict) -> dict:
+    """generate_json / agenerate_json 공통 인자"""
+    script_text = build_seo_input(script)
+    return {
+        "contents": (
+            "아래 스크립트에 대한 YouTube SEO 업로드 패키지를 만들어주세요.\n\n"
+            f"```json\n{script_text}\n```"
+        ),
+        "system_prompt": prompt_registry.load("seo_packager.md"),
+        "schema": SEO_SCHEMA,
+        "stage": "seo",
+    }
 
 
 def generate_seo(script: dict) -> dict:
     """스크립트 → Gemini → SEO 업로드 패키지"""
     Config.validate(need_gemini=True)
 
-    client = genai.Client(api_key=Config.GEMINI_API_KEY)
-    system_prompt = _load_prompt()
+    log.info("SEO 패키지 생성 중...")
+    seo = generate_json(get_client(), Config.GEMINI_TEXT_MODEL, **_request(script))
 
-    script_text = json.dumps(script, ensure_ascii=False, indent=2)
+    log.info("SEO 패키지 생성 완료")
+    return seo
+
+
+async def agenerate_seo(script: dict) -> dict:
+    """generate_seo의 비동기 버전"""
+    Config.validate(need_gemini=True)
 
     log.info("SEO 패키지 생성 중...")
-    response = client.models.generate_content(
-        model=Config.GEMINI_TEXT_MODEL,
-        contents=(
-            "아래 스크립트에 대한 YouTube SEO 업로드 패키지를 만들어주세요.\n\n"
-            f"```json\n{script_text}\n```"
-        ),
-        config={"system_instruction": system_prompt},
-    )
-
-    response_text = response.text
-    try:
-        if "```json" in response_text:
-            json_str = response_text.split("```json")[1].split("```")[0]
-        elif "```" in response_text:
-            json_str = response_text.split("```")[1].split("```")[0]
-        else:
-            json_str = response_text
-        seo = json.loads(json_str)
-    except (json.JSONDecodeError, IndexError):
-        log.warning("JSON 파싱 실패, 원본 텍스트 반환")
-        seo = {"raw_response": response_text}
+    seo = await agenerate_json(get_client(), Config.GEMINI_TEXT_MODEL, **_request(script))
 
     log.info("SEO 패키지 생성 완료")
     return seo
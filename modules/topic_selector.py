@@ -1,48 +1,76 @@
 """Gemini API 기반 주제 선정"""
-import json
 import logging
-from google import genai
 from config import Config
+from modules import prompt_registry
+from modules.gemini_client import get_client
+from modules.prompt_builder import build_topics_input
+from modules.response_parser import generate_json, agenerate_json
 
 log = logging.getLogger("shorts.topic")
 
+# 구조화 출력 스키마 (prompts/topic_research.md 출력 형식)
+TOPICS_SCHEMA = {
+    "type": "OBJECT",
+    "properties": {
+        "candidates": {
+            "type": "ARRAY",
+            "items": {
+                "type": "OBJECT",
+                "properties": {
+                    "rank": {"type": "INTEGER"},
+                    "topic": {"type": "STRING"},
+                    "source_url": {"type": "STRING"},
+                    "summary": {"type": "STRING"},
+                    "suitability": {"type": "ARRAY", "items": {"type": "STRING"}},
+                    "hook": {"type": "STRING"},
+                    "difficulty": {"type": "STRING"},
+                    "view_potential": {"type": "STRING"},
+                    "slug": {"type": "STRING"},
+                },
+                "required": ["rank", "topic", "summary", "hook", "slug"],
+                "property_ordering": [
+                    "rank", "topic", "source_url", "summary", "suitability",
+                    "hook", "difficulty", "view_potential", "slug",
+                ],
+            },
+        },
+    },
+    "required": ["candidates"],
+}
 
-def _load_prompt() -> str:
-    return (Config.PROMPTS_DIR / "topic_research.md").read_text(encoding="utf-8")
+
+def _request(trends: dict) -> dict:
+    """generate_json / agenerate_json 공통 인자"""
+    trends_text = build_topics_input(trends["top_topics"])
+    return {
+        "contents": (
+            "아래는 오늘 수집한 트렌드 목록입니다 (점수순, 한 줄에 하나). "
+            "숏츠에 적합한 상위 3개 주제를 선정해주세요.\n\n"
+            f"```jsonl\n{trends_text}\n```"
+        ),
+        "system_prompt": prompt_registry.load("topic_research.md"),
+        "schema": TOPICS_SCHEMA,
+        "stage": "topic",
+    }
 
 
 def select_topics(trends: dict) -> dict:
     """트렌드 데이터 → Gemini → 상위 3개 후보 추출"""
     Config.validate(need_gemini=True)
 
-    client = genai.Client(api_key=Config.GEMINI_API_KEY)
-    system_prompt = _load_prompt()
+    log.info("Gemini에 주제 분석 요청 중...")
+    result = generate_json(get_client(), Config.GEMINI_TEXT_MODEL, **_request(trends))
 
-    trends_text = json.dumps(trends["top_topics"], ensure_ascii=False, indent=2)
+    log.info("주제 선정 완료")
+    return result
+
+
+async def aselect_topics(trends: dict) -> dict:
+    """select_topics의 비동기 버전"""
+    Config.validate(need_gemini=True)
 
     log.info("Gemini에 주제 분석 요청 중...")
-    response = client.models.generate_content(
-        model=Config.GEMINI_TEXT_MODEL,
-        contents=(
-            "아래는 오늘 수집한 트렌드 목록입니다. "
-            "숏츠에 적합한 상위 3개 주제를 선정해주세요.\n\n"
-            f"```json\n{trends_text}\n```"
-        ),
-        config={"system_instruction": system_prompt},
-    )
-
-    response_text = response.text
-    try:
-        if "```json" in response_text:
-            json_str = response_text.split("```json")[1].split("```")[0]
-        elif "```" in response_text:
-            json_str = response_text.split("```")[1].split("```")[0]
-        else:
-            json_str = response_text
-        result = json.loads(json_str)
-    except (json.JSONDecodeError, IndexError):
-        log.warning("JSON 파싱 실패, 원본 텍스트 반환")
-        result = {"raw_response": response_text}
+    result = await agenerate_json(get_client(), Config.GEMINI_TEXT_MODEL, **_request(trends))
 
     log.info("주제 선정 완료")
     return result
@@ -0,0 +1,128 @@
+"""트렌드 중복 제거 — 정규화 URL + 제목 MinHash/LSH로 같은 이야기를 하나로 병합
+
+HN 스토리가 여러 서브레딧에 교차 게시되면 같은 주제가 상위 목록을 여러 칸
+차지한다. 같은 링크(정규화 URL)이거나 제목이 거의 같은 항목을 한 클러스터로
+묶고, 점수/댓글을 합친 하나의 항목으로 만든다.
+
+LSH 버킷으로 후보 쌍만 비교하므로 항목 수에 거의 선형으로 동작한다.
+"""
+import re
+import random
+import logging
+from urllib.parse import urlsplit, parse_qsl, urlencode
+
+log = logging.getLogger("shorts.trends")
+
+# MinHash 서명 길이 = BANDS × ROWS. 임계 유사도 ≈ (1/BANDS)^(1/ROWS) ≈ 0.59
+NUM_PERM = 32
+BANDS = 8
+ROWS = NUM_PERM // BANDS
+SIMILARITY_THRESHOLD = 0.6
+
+# 순열 대신 64비트 마스크 XOR (해시는 프로세스 내에서만 일관되면 충분)
+_MASK64 = (1 << 64) - 1
+_rng = random.Random(42)
+_PERMS = [_rng.getrandbits(64) for _ in range(NUM_PERM)]
+
+_TRACKING_PARAMS = {"ref", "ref_src", "source", "fbclid", "gclid", "si", "share"}
+_HOST_PREFIXES = ("www.", "m.", "old.", "mobile.")
+_TITLE_PREFIX = re.compile(r"^\s*((\[[^\]]*\]|\([^)]*\))\s*|(show|ask|tell|launch) hn\s*[:\-–]\s*)+")
+_NON_WORD = re.compile(r"[^\w]+")
+
+
+def canonical_url(url: str) -> str:
+    """비교용 URL 키 (스킴/www/추적 파라미터/끝 슬래시/프래그먼트 제거)"""
+    parts = urlsplit((url or "").strip())
+    host = (parts.hostname or "").lower()
+    for prefix in _HOST_PREFIXES:
+        if host.startswith(prefix):
+            host = host[len(prefix):]
+            break
+    query = sorted(
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if not k.lower().startswith("utm_") and k.lower() not in _TRACKING_PARAMS
+    )
+    key = host + parts.path.rstrip("/")
+    return key + ("?" + urlencode(query) if query else "")
+
+
+def _normalize_title(title: str) -> str:
+    """비교용 제목 ([D] 태그, Show HN: 접두어, 문장부호 제거 + 소문자)"""
+    text = _TITLE_PREFIX.sub("", (title or "").lower())
+    return _NON_WORD.sub(" ", text).strip()
+
+
+def _shingles(text: str) -> set[int]:
+    """제목 단어 해시 집합"""
+    return {hash(word) & _MASK64 for word in text.split()}
+
+
+def _minhash(shingles: set[int]) -> list[int]:
+    return [min([h ^ mask for h in shingles]) for mask in _PERMS]
+
+
+def _jaccard(a: set[int], b: set[int]) -> float:
+    return len(a & b) / len(a | b) if a or b else 1.0
+
+
+def _merge(cluster: list[dict]) -> dict:
+    """클러스터 → 대표 항목(점수 최고) 기준 병합 (점수/댓글 합산, 출처 목록)"""
+    cluster = sorted(cluster, key=lambda item: item.get("score", 0), reverse=True)
+    merged = dict(cluster[0])
+    merged["score"] = sum(item.get("score", 0) for item in cluster)
+    merged["comments"] = sum(item.get("comments", 0) for item in cluster)
+    merged["sources"] = list(dict.fromkeys(item["source"] for item in cluster))
+    if not merged.get("link"):
+        merged.pop("link", None)
+    return merged
+
+
+def dedup_trends(items: list[dict]) -> list[dict]:
+    """같은 링크 또는 거의 같은 제목의 항목을 병합"""
+    parent = list(range(len(items)))
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    def union(i: int, j: int):
+        ri, rj = find(i), find(j)
+        if ri != rj:
+            parent[max(ri, rj)] = min(ri, rj)
+
+    # 1) 정규화 URL이 같으면 같은 이야기 (Reddit은 외부 링크 기준)
+    by_url: dict[str, int] = {}
+    for i, item in enumerate(items):
+        key = canonical_url(item.get("link") or item.get("url", ""))
+        if not key:
+            continue
+        if key in by_url:
+            union(by_url[key], i)
+        else:
+            by_url[key] = i
+
+    # 2) 제목 MinHash → 밴드별 버킷에서 만난 후보만 실제 유사도 확인
+    titles = [_normalize_title(item.get("title", "")) for item in items]
+    shingles = [_shingles(title) for title in titles]
+    buckets: dict[tuple, list[int]] = {}
+    for i, sh in enumerate(shingles):
+        if not titles[i]:
+            continue
+        signature = _minhash(sh)
+        for band in range(BANDS):
+            key = (band, *signature[band * ROWS:(band + 1) * ROWS])
+            members = buckets.setdefault(key, [])
+            for j in members:
+                if find(i) != find(j) and _jaccard(sh, shingles[j]) >= SIMILARITY_THRESHOLD:
+                    union(i, j)
+            members.append(i)
+
+    clusters: dict[int, list[dict]] = {}
+    for i, item in enumerate(items):
+        clusters.setdefault(find(i), []).append(item)
+    merged = [_merge(cluster) for cluster in clusters.values()]
+
+    log.info("중복 병합: %d개 → %d개", len(items), len(merged))
+    return merged
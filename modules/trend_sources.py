@@ -0,0 +1,187 @@
+"""트렌드 소스 어댑터 — 소스별 비동기 수집 + 공통 항목 형식
+
+새 피드는 TrendSource를 상속해 fetch()만 구현하고 SOURCE_TYPES에 등록한 뒤
+Config.TREND_SOURCES에 추가한다. 모든 소스는 한 이벤트 루프에서 동시에
+수집되므로 소스 수가 늘어도 수집 시간은 가장 느린 소스 수준에 머문다.
+"""
+import abc
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, asdict
+from datetime import datetime
+
+import httpx
+
+log = logging.getLogger("shorts.trends")
+
+USER_AGENT = "infograb-shorts-bot/1.0"
+
+TECH_KEYWORDS = [
+    "ai", "llm", "kubernetes", "docker", "devops", "claude", "gemini", "gpt",
+    "openai", "anthropic", "ml", "gpu", "serverless", "cicd", "terraform",
+    "python", "rust", "go", "kafka", "redis", "postgres", "k8s", "helm",
+    "agent", "rag", "vector", "embedding", "fine-tune", "open source", "github",
+]
+
+
+@dataclass(slots=True)
+class TrendItem:
+    """소스 공통 트렌드 항목"""
+
+    source: str
+    title: str
+    url: str
+    score: int = 0
+    comments: int = 0
+    time: str = ""
+    link: str | None = None  # 외부 원문 링크 (중복 판별용, 없으면 None)
+
+    def to_dict(self) -> dict:
+        item = asdict(self)
+        if item["link"] is None:
+            del item["link"]
+        return item
+
+
+class TrendSource(abc.ABC):
+    """트렌드 소스 기본 클래스
+
+    Args:
+        concurrency: 이 소스의 동시 요청 수 상한
+        timeout: 소스 전체 수집 제한 시간(초) — 넘으면 이 소스만 빈 결과
+    """
+
+    name = "source"
+
+    def __init__(self, limit: int = 30, concurrency: int = 4, timeout: float = 15.0):
+        self.limit = limit
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self._semaphore: asyncio.Semaphore | None = None
+
+    async def get_json(self, http: httpx.AsyncClient, url: str, timeout: float = 10.0):
+        """동시 요청 수 제한 안에서 GET → JSON"""
+        async with self._semaphore:
+            response = await http.get(url, timeout=timeout)
+        response.raise_for_status()
+        return response.json()
+
+    @abc.abstractmethod
+    async def fetch(self, http: httpx.AsyncClient) -> list[TrendItem]:
+        """소스 항목 수집 (소스별 구현)"""
+
+
+class HackerNewsSource(TrendSource):
+    """Hacker News 상위 스토리 (기술 키워드 포함 제목만)"""
+
+    name = "hackernews"
+    TOP_URL = "https://hacker-news.firebaseio.com/v0/topstories.json"
+    ITEM_URL = "https://hacker-news.firebaseio.com/v0/item/{}.json"
+
+    def __init__(self, limit: int = 30, scan: int = 50, concurrency: int = 16, timeout: float = 20.0):
+        super().__init__(limit=limit, concurrency=concurrency, timeout=timeout)
+        self.scan = scan
+
+    async def _item(self, http: httpx.AsyncClient, story_id: int) -> dict | None:
+        try:
+            return await self.get_json(http, self.ITEM_URL.format(story_id), timeout=5)
+        except (httpx.HTTPError, ValueError):
+            return None
+
+    async def fetch(self, http: httpx.AsyncClient) -> list[TrendItem]:
+        ids = (await self.get_json(http, self.TOP_URL))[:self.scan]
+        items = await asyncio.gather(*(self._item(http, story_id) for story_id in ids))
+
+        stories = []
+        for story_id, item in zip(ids, items):
+            if not item or item.get("type") != "story":
+                continue
+            title = item.get("title") or ""
+            if not any(kw in title.lower() for kw in TECH_KEYWORDS):
+                continue
+            stories.append(TrendItem(
+                source=self.name,
+                title=title,
+                url=item.get("url", f"https://news.ycombinator.com/item?id={story_id}"),
+                score=item.get("score", 0),
+                comments=item.get("descendants", 0),
+                time=datetime.fromtimestamp(item.get("time", 0)).isoformat(),
+            ))
+            if len(stories) >= self.limit:
+                break
+        return stories
+
+
+class RedditSource(TrendSource):
+    """서브레딧 hot 목록 (인증 없이 JSON API, 고정글 제외)"""
+
+    def __init__(self, subreddit: str, limit: int = 10, concurrency: int = 1, timeout: float = 10.0):
+        super().__init__(limit=limit, concurrency=concurrency, timeout=timeout)
+        self.subreddit = subreddit
+        self.name = f"reddit/r/{subreddit}"
+
+    async def fetch(self, http: httpx.AsyncClient) -> list[TrendItem]:
+        url = f"https://www.reddit.com/r/{self.subreddit}/hot.json?limit={self.limit}"
+        data = await self.get_json(http, url)
+        posts = []
+        for post in data["data"]["children"]:
+            p = post["data"]
+            if p.get("stickied"):
+                continue
+            posts.append(TrendItem(
+                source=self.name,
+                title=p.get("title") or "",
+                url=f"https://reddit.com{p.get('permalink')}",
+                score=p.get("score", 0),
+                comments=p.get("num_comments", 0),
+                time=datetime.fromtimestamp(p.get("created_utc", 0)).isoformat(),
+                link=p.get("url_overridden_by_dest"),
+            ))
+        return posts
+
+
+# Config.TREND_SOURCES의 "type" → 어댑터 클래스
+SOURCE_TYPES: dict[str, type[TrendSource]] = {
+    "hackernews": HackerNewsSource,
+    "reddit": RedditSource,
+}
+
+
+def build_sources(specs: list[dict]) -> list[TrendSource]:
+    """설정 목록 → 소스 어댑터 ({"type": ..., 나머지는 생성자 인자})"""
+    sources = []
+    for spec in specs:
+        options = dict(spec)
+        kind = options.pop("type")
+        if kind not in SOURCE_TYPES:
+            log.warning("알 수 없는 트렌드 소스 종류: %s", kind)
+            continue
+        sources.append(SOURCE_TYPES[kind](**options))
+    return sources
+
+
+async def _fetch_one(source: TrendSource, http: httpx.AsyncClient) -> list[TrendItem]:
+    """소스 하나 수집 (실패/시간 초과는 이 소스만 빈 결과)"""
+    # 세마포어는 실행 중인 이벤트 루프마다 새로 (asyncio.run을 여러 번 불러도 안전)
+    source._semaphore = asyncio.Semaphore(source.concurrency)
+    started = time.monotonic()
+    try:
+        items = await asyncio.wait_for(source.fetch(http), timeout=source.timeout)
+    except asyncio.TimeoutError:
+        log.warning("%s 시간 초과 (%.0f초)", source.name, source.timeout)
+        return []
+    except Exception as e:
+        log.warning("%s 실패: %s", source.name, e)
+        return []
+    log.info("%s: %d개 (%.1f초)", source.name, len(items), time.monotonic() - started)
+    return items
+
+
+async def fetch_all(sources: list[TrendSource]) -> list[TrendItem]:
+    """모든 소스를 동시에 수집 (HTTP 연결 풀 공유)"""
+    async with httpx.AsyncClient(
+        headers={"User-Agent": USER_AGENT}, follow_redirects=True
+    ) as http:
+        results = await asyncio.gather(*(_fetch_one(s, http) for s in sources))
+    return [item for items in results for item in items]
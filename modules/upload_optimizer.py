@@ -0,0 +1,108 @@
+"""업로드 전 트랜스코드 — YouTube Shorts 권장 비트레이트로 줄여 업로드 바이트 절감"""
+import json
+import time
+import subprocess
+import logging
+from pathlib import Path
+from config import Config
+
+log = logging.getLogger("shorts.upload")
+
+
+def _probe(video_path: Path) -> dict | None:
+    """ffprobe로 길이(초) / 전체 비트레이트(bps) / 영상 fps 조회"""
+    cmd = [
+        "ffprobe", "-v", "error",
+        "-select_streams", "v:0",
+        "-show_entries", "format=duration,bit_rate:stream=avg_frame_rate",
+        "-of", "json",
+        str(video_path),
+    ]
+    try:
+        result = subprocess.run(cmd, check=True, capture_output=True, text=True)
+        info = json.loads(result.stdout)
+        fmt = info["format"]
+        num, den = info["streams"][0]["avg_frame_rate"].split("/")
+        return {
+            "duration": float(fmt["duration"]),
+            "bit_rate": int(fmt.get("bit_rate") or 0),
+            "fps": float(num) / float(den) if float(den) else 30.0,
+        }
+    except FileNotFoundError:
+        log.warning("ffprobe가 설치되어 있지 않습니다. 업로드 트랜스코드 건너뜀")
+        return None
+    except (subprocess.CalledProcessError, KeyError, IndexError, ValueError) as e:
+        log.warning("영상 정보 조회 실패: %s", e)
+        return None
+
+
+def optimize_for_upload(video_path: str) -> str:
+    """예상 절감률이 충분할 때만 업로드용 파일로 트랜스코드
+
+    H.264 High / CRF(Config.UPLOAD_CRF) + 권장 비트레이트 상한 / 닫힌 GOP(fps/2) /
+    AAC 48kHz / faststart(moov 앞쪽 배치). 결과가 원본보다 크면 원본을 사용한다.
+
+    Returns:
+        업로드할 파일 경로 (변환하지 않았으면 원본 경로)
+    """
+    src = Path(video_path)
+    dst = src.with_name("upload_shorts.mp4")
+
+    # 원본보다 새로운 변환 결과가 있으면 재사용
+    if dst.exists() and dst.stat().st_mtime >= src.stat().st_mtime:
+        log.info("기존 업로드용 파일 재사용: %s", dst)
+        return str(dst)
+
+    info = _probe(src)
+    if not info or not info["duration"]:
+        return str(src)
+
+    src_size = src.stat().st_size
+    target_bps = Config.UPLOAD_VIDEO_BITRATE + Config.UPLOAD_AUDIO_BITRATE
+    predicted_size = target_bps * info["duration"] / 8
+    saving = 1 - predicted_size / src_size
+    if saving < Config.UPLOAD_MIN_SAVING:
+        log.info(
+            "업로드 트랜스코드 생략 (예상 절감 %.0f%% < %.0f%%)",
+            max(saving, 0) * 100, Config.UPLOAD_MIN_SAVING * 100,
+        )
+        return str(src)
+
+    gop = max(1, round(info["fps"] / 2))
+    cmd = [
+        "ffmpeg", "-y", "-v", "error",
+        "-i", str(src),
+        "-c:v", "libx264", "-preset", Config.UPLOAD_PRESET,
+        "-profile:v", "high", "-pix_fmt", "yuv420p",
+        "-crf", str(Config.UPLOAD_CRF),
+        "-maxrate", str(Config.UPLOAD_VIDEO_BITRATE),
+        "-bufsize", str(Config.UPLOAD_VIDEO_BITRATE * 2),
+        "-g", str(gop), "-bf", "2", "-flags", "+cgop",
+        "-c:a", "aac", "-b:a", str(Config.UPLOAD_AUDIO_BITRATE), "-ar", "48000",
+        "-movflags", "+faststart",
+        str(dst),
+    ]
+    log.info("업로드용 트랜스코드 중 (예상 절감 %.0f%%)...", saving * 100)
+    started = time.monotonic()
+    try:
+        subprocess.run(cmd, check=True, capture_output=True, text=True)
+    except FileNotFoundError:
+        log.warning("ffmpeg가 설치되어 있지 않습니다. 원본 업로드")
+        return str(src)
+    except subprocess.CalledProcessError as e:
+        log.warning("업로드 트랜스코드 실패, 원본 업로드: %s", e.stderr)
+        dst.unlink(missing_ok=True)
+        return str(src)
+    elapsed = time.monotonic() - started
+
+    dst_size = dst.stat().st_size
+    if dst_size >= src_size:
+        log.info("트랜스코드 결과가 더 큼 (%.1fMB), 원본 업로드", dst_size / 1e6)
+        dst.unlink()
+        return str(src)
+
+    log.info(
+        "업로드 파일: %.1fMB → %.1fMB (-%.0f%%), 변환 %.1f초",
+        src_size / 1e6, dst_size / 1e6, (1 - dst_size / src_size) * 100, elapsed,
+    )
+    return str(dst)
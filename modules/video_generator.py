@@ -1,58 +1,105 @@
 """Veo 3.1 기반 영상 클립 생성 + FFmpeg 결합"""
 import json
 import time
+import asyncio
+import contextvars
 import subprocess
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from google import genai
 from google.genai import types
 from config import Config
+from modules.gemini_client import get_client
+from modules import cost_ledger
+from modules.keyframe_prep import prepare_keyframe, prepare_keyframes
+from modules.rate_limiter import rate_limited_call, arate_limited_call
+from modules.scene_timing import plan_clip_durations
 
 log = logging.getLogger("shorts.video")
 
+# Veo 작업 완료 확인 간격(초)
+POLL_SECONDS = 10
 
-def estimate_cost(num_clips: int, quality: str = "fast") -> float:
-    """예상 비용 계산"""
+
+def estimate_cost(clips: int | list[int], quality: str = "fast") -> float:
+    """예상 비용 계산
+
+    Args:
+        clips: 장면별 계획된 클립 길이(초) 목록, 또는 클립 수
+            (클립 수면 VEO_CLIP_DURATION 기준)
+    """
     cost_per_sec = Config.VEO_COST_FAST if quality == "fast" else Config.VEO_COST_FULL
-    return cost_per_sec * Config.VEO_CLIP_DURATION * num_clips
+    if isinstance(clips, int):
+        clips = [Config.VEO_CLIP_DURATION] * clips
+    return cost_per_sec * sum(clips)
 
 
-def _generate_clip(
-    client, image_path: str, prompt: str, output_path: str, use_fast: bool = True
-) -> bool:
-    """이미지를 첫 프레임으로 Veo 3.1 영상 클립 생성"""
+def _clip_request(
+    image_path: str, prompt: str, use_fast: bool, duration: int
+) -> tuple[str, float, dict]:
+    """(모델, 초당 비용, generate_videos 인자) — 동기/비동기 공통"""
     model = "veo-3.1-fast-generate-preview" if use_fast else "veo-3.1-generate-preview"
     cost_per_sec = Config.VEO_COST_FAST if use_fast else Config.VEO_COST_FULL
 
     log.info(
-        "클립 생성: %s (%s, 예상비용: $%.2f)",
+        "클립 생성: %s (%s, %d초, 예상비용: $%.2f)",
         Path(image_path).name,
         model,
-        cost_per_sec * Config.VEO_CLIP_DURATION,
+        duration,
+        cost_per_sec * duration,
+    )
+    return model, cost_per_sec, {
+        "model": model,
+        "prompt": (
+            f"9:16 vertical portrait video for YouTube Shorts. {prompt}. "
+            "Smooth motion, tech aesthetic, dark background."
+        ),
+        "config": types.GenerateVideosConfig(
+            aspect_ratio="9:16",
+            duration_seconds=duration,
+        ),
+    }
+
+
+def _log_request(image: types.Image, started: float):
+    """요청 페이로드(첫 프레임 이미지) 크기와 요청 전송 시간 (리미터 대기 포함)"""
+    log.info(
+        "  요청 전송: 이미지 %.0fKB (%s), %.2f초",
+        len(image.image_bytes or b"") / 1024, image.mime_type, time.monotonic() - started,
     )
 
+
+def _generate_clip(
+    client,
+    image_path: str,
+    prompt: str,
+    output_path: str,
+    use_fast: bool = True,
+    duration: int = Config.VEO_CLIP_DURATION,
+) -> bool:
+    """이미지를 첫 프레임으로 Veo 3.1 영상 클립 생성"""
+    model, cost_per_sec, request = _clip_request(image_path, prompt, use_fast, duration)
+
     try:
-        image = types.Image.from_file(location=image_path)
-
-        operation = client.models.generate_videos(
-            model=model,
-            prompt=(
-                f"9:16 vertical portrait video for YouTube Shorts. {prompt}. "
-                "Smooth motion, tech aesthetic, dark background."
-            ),
-            image=image,
-            config=types.GenerateVideosConfig(
-                aspect_ratio="9:16",
-                duration_seconds=Config.VEO_CLIP_DURATION,
-            ),
-        )
+        # 예산 검사 + 예약 → 생성 완료 시 기록 (동시 생성이 함께 한도를 넘지 않게)
+        with cost_ledger.reserve(cost_per_sec * duration):
+            image = types.Image.from_file(location=image_path)
+
+            started = time.monotonic()
+            operation = rate_limited_call(
+                model, client.models.generate_videos, image=image, **request
+            )
+            _log_request(image, started)
 
-        log.info("  생성 대기 중...")
-        while not operation.done:
-            time.sleep(10)
-            operation = client.operations.get(operation)
+            log.info("  생성 대기 중...")
+            while not operation.done:
+                time.sleep(POLL_SECONDS)
+                operation = client.operations.get(operation)
 
-        video = operation.result.generated_videos[0]
+            video = operation.result.generated_videos[0]
+            # 생성 완료 시점에 과금되므로 다운로드 전에 기록
+            cost_ledger.record(model, "video_seconds", duration, "video")
         Path(output_path).parent.mkdir(parents=True, exist_ok=True)
         client.files.download(file=video.video)
         video.video.save(output_path)
@@ -64,35 +111,204 @@ def _generate_clip(
         return False
 
 
+async def _agenerate_clip(
+    client,
+    image_path: str,
+    prompt: str,
+    output_path: str,
+    use_fast: bool = True,
+    duration: int = Config.VEO_CLIP_DURATION,
+) -> bool:
+    """_generate_clip의 비동기 버전 (폴링 중 스레드를 점유하지 않음)"""
+    model, cost_per_sec, request = _clip_request(image_path, prompt, use_fast, duration)
+
+    try:
+        with cost_ledger.reserve(cost_per_sec * duration):
+            image = types.Image.from_file(location=image_path)
+
+            started = time.monotonic()
+            operation = await arate_limited_call(
+                model, client.aio.models.generate_videos, image=image, **request
+            )
+            _log_request(image, started)
+
+            log.info("  생성 대기 중...")
+            while not operation.done:
+                await asyncio.sleep(POLL_SECONDS)
+                operation = await client.aio.operations.get(operation)
+
+            video = operation.result.generated_videos[0]
+            cost_ledger.record(model, "video_seconds", duration, "video")
+        Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+        video.video.video_bytes = await client.aio.files.download(file=video.video)
+        video.video.save(output_path)
+        log.info("  저장 완료: %s", output_path)
+        return True
+
+    except Exception as e:
+        log.warning("  클립 생성 실패: %s", e)
+        return False
+
+
+class ClipJobs:
+    """키프레임이 준비되는 대로 Veo 클립 생성을 시작하는 작업 묶음
+
+    FrameJobs(on_frame=jobs.submit)로 연결하면 나머지 장면의 이미지 생성과
+    Veo 생성이 겹쳐 실행된다. 클립 길이는 set_durations()로 장면 길이 계획이
+    정해진 뒤에 요청한다 (스트리밍 중에는 전체 장면 수를 아직 모름).
+    """
+
+    def __init__(
+        self,
+        output_dir: Path,
+        quality: str = "fast",
+        max_workers: int = 4,
+        durations: list[int] | None = None,
+    ):
+        Config.validate(need_gemini=True)
+
+        self.client = get_client()
+        self.use_fast = quality == "fast"
+        self.clips_dir = output_dir / "clips"
+        self.clips_dir.mkdir(parents=True, exist_ok=True)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+        self._futures = {}
+        self._durations: list[int] = []
+        self._planned = threading.Event()
+        self._cancelled = False
+        self._lock = threading.Lock()
+        if durations is not None:
+            self.set_durations(durations)
+
+    def set_durations(self, durations: list[int]):
+        """장면별 클립 길이(초) 확정 → 대기 중인 작업 시작"""
+        self._durations = list(durations)
+        self._planned.set()
+
+    def submit(self, frame_info: dict, scene: dict):
+        """키프레임 1장 → Veo 클립 생성 시작"""
+        video_prompt = scene.get("veo_prompt", frame_info.get("prompt", ""))
+        output_path = str(self.clips_dir / f"clip_{frame_info['scene']:02d}.mp4")
+        with self._lock:
+            if self._cancelled:
+                return
+            # 비용 원장의 현재 실행(ContextVar)이 워커 스레드에서도 보이도록 컨텍스트 복사
+            self._futures[frame_info["scene"]] = self._executor.submit(
+                contextvars.copy_context().run, self._run, frame_info, video_prompt, output_path
+            ), output_path
+
+    def _run(self, frame_info: dict, video_prompt: str, output_path: str) -> bool:
+        self._planned.wait()
+        if self._cancelled:
+            return False
+
+        # 스트리밍 중에는 키프레임이 한 장씩 오므로 이 스레드에서 바로 변환
+        image_path = frame_info.get("veo_path") or prepare_keyframe(frame_info["path"])
+        return _generate_clip(
+            self.client, image_path, video_prompt, output_path,
+            use_fast=self.use_fast, duration=_duration(self._durations, frame_info["scene"]),
+        )
+
+    def cancel(self):
+        """대기 중인 작업 취소 (이후 submit은 무시)"""
+        with self._lock:
+            self._cancelled = True
+        self._planned.set()
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+    def results(self) -> list[str]:
+        """모든 작업 완료 대기 → 장면 순서대로 성공한 클립 경로"""
+        clips = []
+        for scene_num in sorted(self._futures):
+            future, output_path = self._futures[scene_num]
+            if future.result():
+                clips.append(output_path)
+            else:
+                log.warning("클립 %d 건너뜀", scene_num)
+        self._executor.shutdown()
+
+        log.info("%d/%d개 클립 생성 완료", len(clips), len(self._futures))
+        return clips
+
+
+def _plan(
+    frames: list[dict], script: dict, quality: str, durations: list[int] | None
+) -> list[int]:
+    """장면별 클립 길이 확정 + 예상 비용 로그"""
+    if durations is None:
+        durations = plan_clip_durations(script)
+    log.info(
+        "%d개 클립 생성 시작 (Veo 3.1 %s)", len(frames), "Fast" if quality == "fast" else "Full"
+    )
+    planned = [_duration(durations, f["scene"]) for f in frames]
+    log.info("예상 총 비용: $%.2f (%d초)", estimate_cost(planned, quality), sum(planned))
+    return durations
+
+
+def _duration(durations: list[int], scene_num: int) -> int:
+    scene_idx = scene_num - 1
+    return durations[scene_idx] if scene_idx < len(durations) else Config.VEO_CLIP_DURATION
+
+
 def generate_clips(
-    frames: list[dict], script: dict, output_dir: Path, quality: str = "fast"
+    frames: list[dict],
+    script: dict,
+    output_dir: Path,
+    quality: str = "fast",
+    durations: list[int] | None = None,
 ) -> list[str]:
-    """프레임 이미지 → Veo 클립 생성"""
+    """프레임 이미지 → Veo 클립 생성
+
+    Args:
+        durations: 장면별 클립 길이(초). 없으면 스크립트로 추정한 계획 사용
+    """
+    scenes = script.get("scenes", [])
+    durations = _plan(frames, script, quality, durations)
+
+    frames = prepare_keyframes(frames)
+    jobs = ClipJobs(output_dir, quality=quality, durations=durations)
+    for frame_info in frames:
+        scene_idx = frame_info["scene"] - 1
+        scene = scenes[scene_idx] if scene_idx < len(scenes) else {}
+        jobs.submit(frame_info, scene)
+    return jobs.results()
+
+
+async def agenerate_clips(
+    frames: list[dict],
+    script: dict,
+    output_dir: Path,
+    quality: str = "fast",
+    durations: list[int] | None = None,
+) -> list[str]:
+    """generate_clips의 비동기 버전 (동시 생성 수는 모델 리미터가 조절)"""
     Config.validate(need_gemini=True)
 
-    client = genai.Client(api_key=Config.GEMINI_API_KEY)
+    client = get_client()
     use_fast = quality == "fast"
+    scenes = script.get("scenes", [])
+    durations = _plan(frames, script, quality, durations)
     clips_dir = output_dir / "clips"
     clips_dir.mkdir(parents=True, exist_ok=True)
 
-    scenes = script.get("scenes", [])
-    log.info(
-        "%d개 클립 생성 시작 (Veo 3.1 %s)", len(frames), "Fast" if use_fast else "Full"
+    frames = await asyncio.to_thread(
+        prepare_keyframes, sorted(frames, key=lambda f: f["scene"])
     )
-    log.info("예상 총 비용: $%.2f", estimate_cost(len(frames), quality))
-
-    clips = []
-    for frame_info in frames:
+    paths = [str(clips_dir / f"clip_{f['scene']:02d}.mp4") for f in frames]
+    jobs = []
+    for frame_info, path in zip(frames, paths):
         scene_idx = frame_info["scene"] - 1
         scene = scenes[scene_idx] if scene_idx < len(scenes) else {}
-        video_prompt = scene.get("veo_prompt", frame_info.get("prompt", ""))
-        output_path = str(clips_dir / f"clip_{frame_info['scene']:02d}.mp4")
+        jobs.append(_agenerate_clip(
+            client, frame_info["veo_path"], scene.get("veo_prompt", frame_info.get("prompt", "")),
+            path, use_fast=use_fast, duration=_duration(durations, frame_info["scene"]),
+        ))
+    results = await asyncio.gather(*jobs)
 
-        success = _generate_clip(
-            client, frame_info["path"], video_prompt, output_path, use_fast=use_fast
-        )
-        if success:
-            clips.append(output_path)
+    clips = []
+    for frame_info, path, ok in zip(frames, paths, results):
+        if ok:
+            clips.append(path)
         else:
             log.warning("클립 %d 건너뜀", frame_info["scene"])
 
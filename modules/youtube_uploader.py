@@ -1,19 +1,25 @@
 """YouTube Data API v3 — OAuth2 인증 + 재시작 가능한 업로드"""
 import json
 import time
+import asyncio
 import random
 import logging
+import threading
 import httplib2
+import httpx
+from datetime import datetime
 from pathlib import Path
 
 from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import InstalledAppFlow
 from google.auth.transport.requests import Request
-from googleapiclient.discovery import build
+from googleapiclient.discovery import build, build_from_document
 from googleapiclient.http import MediaFileUpload
 from googleapiclient.errors import HttpError
 
 from config import Config
+from modules.output_gc import record_upload
+from modules.upload_optimizer import optimize_for_upload
 
 log = logging.getLogger("shorts.upload")
 
@@ -25,11 +31,22 @@ YOUTUBE_API_VERSION = "v3"
 MAX_RETRIES = 5
 RETRIABLE_STATUS_CODES = [500, 502, 503, 504]
 
+# 비동기 업로드 (256KiB의 배수여야 함)
+RESUMABLE_URL = "https://www.googleapis.com/upload/youtube/v3/videos"
+ASYNC_CHUNK_SIZE = 8 * 1024 * 1024
 
-def _get_authenticated_service():
-    """OAuth2 인증 → YouTube API 서비스 객체"""
-    Config.validate(need_youtube=True)
+# 토큰 만료 몇 초 전에 백그라운드 갱신할지
+TOKEN_REFRESH_MARGIN = 300
+
+# 프로세스 수명 동안 재사용하는 서비스/인증 캐시
+_service_lock = threading.Lock()
+_youtube_service = None
+_credentials = None
+_refresh_timer: threading.Timer | None = None
 
+
+def _load_credentials() -> Credentials:
+    """token.json 로드 → 필요 시 갱신 또는 브라우저 인증"""
     creds = None
     token_file = Config.TOKEN_FILE
 
@@ -48,13 +65,111 @@ def _get_authenticated_service():
                 str(Config.CLIENT_SECRET_FILE), SCOPES
             )
             creds = flow.run_local_server(port=0)
+        _save_credentials(creds)
+
+    return creds
+
+
+def _save_credentials(creds: Credentials):
+    """인증 토큰 저장"""
+    with open(Config.TOKEN_FILE, "w") as f:
+        f.write(creds.to_json())
+    log.info("인증 토큰 저장: %s", Config.TOKEN_FILE)
+
+
+def _build_service(creds: Credentials):
+    """디스크에 캐시된 discovery 문서로 서비스 생성 (없으면 받아서 저장)"""
+    cache_file = Config.DISCOVERY_CACHE_FILE
+    if cache_file.exists():
+        try:
+            document = cache_file.read_text(encoding="utf-8")
+            return build_from_document(document, credentials=creds)
+        except Exception as e:
+            log.warning("discovery 캐시 로드 실패, 다시 받습니다: %s", e)
+
+    service = build(YOUTUBE_API_SERVICE, YOUTUBE_API_VERSION, credentials=creds)
+    try:
+        cache_file.write_text(json.dumps(service._rootDesc), encoding="utf-8")
+        log.info("discovery 문서 캐시: %s", cache_file)
+    except (AttributeError, OSError) as e:
+        log.warning("discovery 문서 캐시 저장 실패: %s", e)
+    return service
+
+
+def _schedule_refresh(creds: Credentials):
+    """토큰 만료 TOKEN_REFRESH_MARGIN초 전에 백그라운드 갱신 예약"""
+    global _refresh_timer
+
+    if _refresh_timer is not None:
+        _refresh_timer.cancel()
+        _refresh_timer = None
+    if not creds.expiry or not creds.refresh_token:
+        return
+
+    # google-auth의 expiry는 naive UTC
+    remaining = (creds.expiry - datetime.utcnow()).total_seconds()
+    delay = max(remaining - TOKEN_REFRESH_MARGIN, 0)
+
+    _refresh_timer = threading.Timer(delay, _refresh_in_background, args=(creds,))
+    _refresh_timer.daemon = True
+    _refresh_timer.start()
+
+
+def _refresh_in_background(creds: Credentials):
+    """예약된 토큰 갱신 — 같은 Credentials 객체를 갱신해 서비스가 그대로 사용"""
+    with _service_lock:
+        if creds is not _credentials:
+            return
+        try:
+            creds.refresh(Request())
+            _save_credentials(creds)
+            log.info("백그라운드 토큰 갱신 완료")
+        except Exception as e:
+            log.warning("백그라운드 토큰 갱신 실패: %s", e)
+            return
+        _schedule_refresh(creds)
+
+
+def _get_authenticated_service():
+    """OAuth2 인증 → YouTube API 서비스 객체 (프로세스 내 캐시)"""
+    global _youtube_service, _credentials
+
+    with _service_lock:
+        if _youtube_service is not None and _credentials.valid:
+            return _youtube_service
+
+        # 캐시된 인증이 만료된 경우 (예: 절전 후 복귀) 동기 갱신
+        if _credentials is not None and _credentials.refresh_token:
+            log.info("토큰 갱신 중...")
+            _credentials.refresh(Request())
+            _save_credentials(_credentials)
+            _schedule_refresh(_credentials)
+            return _youtube_service
+
+        Config.validate(need_youtube=True)
+        creds = _load_credentials()
+        _youtube_service = _build_service(creds)
+        _credentials = creds
+        _schedule_refresh(creds)
+        return _youtube_service
 
-        # 토큰 저장
-        with open(token_file, "w") as f:
-            f.write(creds.to_json())
-        log.info("인증 토큰 저장: %s", token_file)
 
-    return build(YOUTUBE_API_SERVICE, YOUTUBE_API_VERSION, credentials=creds)
+def _video_body(
+    title: str, description: str, tags: list[str] | None, category_id: str, privacy: str
+) -> dict:
+    """videos.insert 요청 본문 (snippet + status)"""
+    return {
+        "snippet": {
+            "title": title,
+            "description": description,
+            "tags": tags or [],
+            "categoryId": category_id,
+        },
+        "status": {
+            "privacyStatus": privacy,
+            "selfDeclaredMadeForKids": False,
+        },
+    }
 
 
 def upload_video(
@@ -83,19 +198,7 @@ def upload_video(
         return None
 
     youtube = _get_authenticated_service()
-
-    body = {
-        "snippet": {
-            "title": title,
-            "description": description,
-            "tags": tags or [],
-            "categoryId": category_id,
-        },
-        "status": {
-            "privacyStatus": privacy,
-            "selfDeclaredMadeForKids": False,
-        },
-    }
+    body = _video_body(title, description, tags, category_id, privacy)
 
     media = MediaFileUpload(
         video_path, chunksize=256 * 1024, resumable=True, mimetype="video/mp4"
@@ -105,8 +208,14 @@ def upload_video(
         part="snippet,status", body=body, media_body=media
     )
 
-    log.info("업로드 시작: %s (%s)", title, privacy)
-    return _resumable_upload(request)
+    size_mb = Path(video_path).stat().st_size / 1e6
+    log.info("업로드 시작: %s (%s, %.1fMB)", title, privacy, size_mb)
+    started = time.monotonic()
+    video_id = _resumable_upload(request)
+    if video_id:
+        elapsed = time.monotonic() - started
+        log.info("업로드 소요: %.1f초 (%.2fMB/s)", elapsed, size_mb / max(elapsed, 1e-3))
+    return video_id
 
 
 def _resumable_upload(request) -> str | None:
@@ -146,8 +255,26 @@ def _resumable_upload(request) -> str | None:
     return video_id
 
 
-def upload_from_dir(output_dir: str, privacy: str = "private") -> str | None:
-    """출력 디렉토리에서 영상 + SEO 메타데이터로 업로드"""
+def upload_from_dir(
+    output_dir: str, privacy: str = "private", optimize: bool = Config.UPLOAD_TRANSCODE
+) -> str | None:
+    """출력 디렉토리에서 영상 + SEO 메타데이터로 업로드
+
+    Args:
+        optimize: 업로드 전 권장 비트레이트로 트랜스코드 (절감이 클 때만)
+    """
+    prepared = _prepare_from_dir(output_dir, optimize)
+    if prepared is None:
+        return None
+    upload_path, metadata = prepared
+    video_id = upload_video(upload_path, privacy=privacy, **metadata)
+    if video_id:
+        record_upload(output_dir, video_id, privacy)
+    return video_id
+
+
+def _prepare_from_dir(output_dir: str, optimize: bool) -> tuple[str, dict] | None:
+    """출력 디렉토리 → (업로드할 영상 경로, 제목/설명/태그)"""
     out = Path(output_dir)
     video_path = out / "final_shorts.mp4"
     seo_path = out / "seo.json"
@@ -169,10 +296,170 @@ def upload_from_dir(output_dir: str, privacy: str = "private") -> str | None:
         description = ""
         tags = []
 
-    return upload_video(
-        str(video_path),
-        title=title,
-        description=description,
-        tags=tags,
-        privacy=privacy,
+    upload_path = optimize_for_upload(str(video_path)) if optimize else str(video_path)
+    return upload_path, {"title": title, "description": description, "tags": tags}
+
+
+# --- 비동기 업로드 (httpx로 resumable 프로토콜 직접 구현) ---
+
+
+def _access_token() -> str:
+    """유효한 액세스 토큰 (필요 시 동기 갱신)"""
+    _get_authenticated_service()
+    return _credentials.token
+
+
+def _force_refresh():
+    """401 응답 후 토큰 강제 갱신 (만료 시각 전에 서버가 거부한 경우)"""
+    with _service_lock:
+        _credentials.refresh(Request())
+        _save_credentials(_credentials)
+        _schedule_refresh(_credentials)
+
+
+def _next_offset(response: httpx.Response) -> int:
+    """308 응답의 Range 헤더 → 다음에 보낼 바이트 위치"""
+    received = response.headers.get("range")
+    return int(received.rsplit("-", 1)[1]) + 1 if received else 0
+
+
+async def _fresh_token() -> str:
+    """요청마다 현재 토큰 — 백그라운드 갱신이 Credentials를 제자리에서 바꾸므로 보관하지 않는다"""
+    if not _credentials.valid:
+        return await asyncio.to_thread(_access_token)
+    return _credentials.token
+
+
+async def _start_session(http: httpx.AsyncClient, body: dict, size: int) -> str:
+    """업로드 세션 생성 → 세션 URL"""
+    token = await _fresh_token()
+    response = await http.post(
+        RESUMABLE_URL,
+        params={"uploadType": "resumable", "part": "snippet,status"},
+        headers={
+            "Authorization": f"Bearer {token}",
+            "X-Upload-Content-Type": "video/mp4",
+            "X-Upload-Content-Length": str(size),
+        },
+        json=body,
     )
+    response.raise_for_status()
+    return response.headers["location"]
+
+
+async def _put_chunk(
+    http: httpx.AsyncClient, session_url: str, path: Path, offset: int, size: int
+) -> httpx.Response:
+    """offset부터 청크 1개 전송 (offset == size면 진행 상태 조회)"""
+    if offset >= size:
+        headers = {
+            "Authorization": f"Bearer {await _fresh_token()}",
+            "Content-Range": f"bytes */{size}",
+        }
+        return await http.put(session_url, headers=headers)
+
+    def read() -> bytes:
+        with open(path, "rb") as f:
+            f.seek(offset)
+            return f.read(ASYNC_CHUNK_SIZE)
+
+    chunk = await asyncio.to_thread(read)
+    headers = {"Authorization": f"Bearer {await _fresh_token()}"}
+    headers["Content-Range"] = f"bytes {offset}-{offset + len(chunk) - 1}/{size}"
+    return await http.put(session_url, headers=headers, content=chunk)
+
+
+async def aupload_video(
+    video_path: str,
+    title: str,
+    description: str,
+    tags: list[str] | None = None,
+    category_id: str = "28",
+    privacy: str = "private",
+) -> str | None:
+    """upload_video의 비동기 버전 (청크 전송 중 이벤트 루프를 막지 않음)
+
+    오류 시 세션의 수신 위치를 조회해 그 지점부터 이어 보낸다.
+    """
+    path = Path(video_path)
+    if not path.exists():
+        log.error("영상 파일이 없습니다: %s", video_path)
+        return None
+
+    body = _video_body(title, description, tags, category_id, privacy)
+    size = path.stat().st_size
+    log.info("업로드 시작: %s (%s, %.1fMB)", title, privacy, size / 1e6)
+    started = time.monotonic()
+
+    async with httpx.AsyncClient(timeout=httpx.Timeout(60.0, connect=10.0)) as http:
+        try:
+            await asyncio.to_thread(_access_token)  # 인증 + 갱신 예약
+            session_url = await _start_session(http, body, size)
+        except Exception as e:
+            log.error("업로드 세션 생성 실패: %s", e)
+            return None
+
+        offset = confirmed = 0
+        retry = 0
+        while True:
+            try:
+                response = await _put_chunk(http, session_url, path, offset, size)
+            except httpx.TransportError as e:
+                error = str(e)
+            else:
+                if response.status_code in (200, 201):
+                    break
+                if response.status_code == 308:
+                    querying = offset >= size
+                    offset = _next_offset(response)
+                    if offset > confirmed:
+                        confirmed = offset
+                        retry = 0
+                        log.info("  업로드 진행: %d%%", offset * 100 // size)
+                        continue
+                    if querying:
+                        continue
+                    error = "전송한 청크가 반영되지 않음"
+                elif response.status_code == 401:
+                    # 토큰이 거부됨 → 강제 갱신 후 같은 위치부터 재시도
+                    try:
+                        await asyncio.to_thread(_force_refresh)
+                    except Exception as e:
+                        log.error("업로드 중 토큰 갱신 실패: %s", e)
+                        return None
+                    error = "HTTP 401 (토큰 갱신)"
+                elif response.status_code not in RETRIABLE_STATUS_CODES:
+                    log.error("업로드 실패: HTTP %d %s", response.status_code, response.text)
+                    return None
+                else:
+                    error = f"HTTP {response.status_code}"
+
+            retry += 1
+            if retry > MAX_RETRIES:
+                log.error("최대 재시도 횟수 초과")
+                return None
+            wait = 2**retry + random.random()
+            log.warning("  %s, %.1f초 후 재시도 (%d/%d)", error, wait, retry, MAX_RETRIES)
+            await asyncio.sleep(wait)
+            # 서버가 받은 위치부터 이어서 (상태 조회 → 308의 Range)
+            offset = size
+
+    video_id = response.json().get("id")
+    elapsed = time.monotonic() - started
+    log.info("업로드 완료! https://youtu.be/%s", video_id)
+    log.info("업로드 소요: %.1f초 (%.2fMB/s)", elapsed, size / 1e6 / max(elapsed, 1e-3))
+    return video_id
+
+
+async def aupload_from_dir(
+    output_dir: str, privacy: str = "private", optimize: bool = Config.UPLOAD_TRANSCODE
+) -> str | None:
+    """upload_from_dir의 비동기 버전 (트랜스코드는 스레드에서)"""
+    prepared = await asyncio.to_thread(_prepare_from_dir, output_dir, optimize)
+    if prepared is None:
+        return None
+    upload_path, metadata = prepared
+    video_id = await aupload_video(upload_path, privacy=privacy, **metadata)
+    if video_id:
+        record_upload(output_dir, video_id, privacy)
+    return video_id
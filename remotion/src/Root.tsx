@@ -5,14 +5,16 @@ const FPS = 30;
 
 const Root: React.FC = () => {
   const props = getInputProps() as ShortsVideoProps;
-  const durationInFrames = props.totalDurationFrames || FPS * 60;
+  // 드래프트 렌더링은 낮은 fps로 만든 props를 넘긴다
+  const fps = props.fps || FPS;
+  const durationInFrames = props.totalDurationFrames || fps * 60;
 
   return (
     <Composition
       id="ShortsVideo"
       component={ShortsVideo}
       durationInFrames={durationInFrames}
-      fps={FPS}
+      fps={fps}
       width={1080}
       height={1920}
       defaultProps={props}
@@ -2,6 +2,7 @@ import React from "react";
 import {
   AbsoluteFill,
   Audio,
+  Img,
   Sequence,
   OffthreadVideo,
   staticFile,
@@ -13,6 +14,8 @@ const { fontFamily } = loadFont();
 
 export interface SceneData {
   clipFile: string;
+  // 드래프트: Veo 클립 대신 키프레임 정지 이미지
+  stillFile?: string;
   textOverlay: string;
   durationFrames: number;
 }
@@ -22,6 +25,7 @@ export interface ShortsVideoProps {
   subtitles: string[];
   narrationFile: string;
   totalDurationFrames: number;
+  fps?: number;
 }
 
 const SubtitleOverlay: React.FC<{ text: string }> = ({ text }) => (
@@ -91,11 +95,18 @@ export const ShortsVideo: React.FC<ShortsVideoProps> = ({
             durationInFrames={scene.durationFrames}
           >
             <AbsoluteFill>
-              <OffthreadVideo
-                src={staticFile(scene.clipFile)}
-                style={{ width: "100%", height: "100%", objectFit: "cover" }}
-                pauseWhenBuffering
-              />
+              {scene.stillFile ? (
+                <Img
+                  src={staticFile(scene.stillFile)}
+                  style={{ width: "100%", height: "100%", objectFit: "cover" }}
+                />
+              ) : (
+                <OffthreadVideo
+                  src={staticFile(scene.clipFile)}
+                  style={{ width: "100%", height: "100%", objectFit: "cover" }}
+                  pauseWhenBuffering
+                />
+              )}
             </AbsoluteFill>
 
             {/* 텍스트 오버레이 (씬별) */}
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""트렌드 중복 병합 벤치마크 — 합성 트렌드 세트 크기별 처리 시간 / 병합 정확도
+
+각 이야기를 여러 출처에 교차 게시한 것처럼 제목(대소문자, 문장부호, [D] 태그,
+단어 하나 추가)과 URL(www, utm 파라미터, 끝 슬래시)을 조금씩 바꿔 복제한다.
+
+사용법:
+    python scripts/bench_dedup.py [항목 수 ...]   (기본: 1000 10000 50000)
+"""
+import sys
+import time
+import random
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from modules.trend_dedup import dedup_trends  # noqa: E402
+
+_vocab_rng = random.Random(1)
+WORDS = [
+    "".join(_vocab_rng.choices("abcdefghijklmnopqrstuvwxyz", k=_vocab_rng.randint(3, 9)))
+    for _ in range(5000)
+]
+SOURCES = ["hackernews"] + [f"reddit/r/{s}" for s in ("devops", "programming", "rust", "aws")]
+
+
+def _variant_title(title: str, rng: random.Random) -> str:
+    choice = rng.randrange(4)
+    if choice == 0:
+        return title.upper()
+    if choice == 1:
+        return f"[D] {title}!"
+    if choice == 2:
+        return f"{title} {rng.choice(WORDS)}"
+    return title.replace(" ", " - ", 1)
+
+
+def _variant_url(url: str, rng: random.Random) -> str:
+    choice = rng.randrange(3)
+    if choice == 0:
+        return url.replace("https://", "https://www.")
+    if choice == 1:
+        return f"{url}?utm_source=reddit&utm_medium=social"
+    return url + "/"
+
+
+def make_trends(n: int, seed: int = 0) -> tuple[list[dict], int]:
+    """합성 트렌드 n개 → (항목 목록, 실제 이야기 수)"""
+    rng = random.Random(seed)
+    items, stories = [], 0
+    while len(items) < n:
+        title = " ".join(rng.sample(WORDS, rng.randint(6, 12)))
+        url = f"https://example{stories}.dev/posts/{stories}"
+        copies = min(rng.choice((1, 1, 2, 3, 4)), n - len(items))
+        for k in range(copies):
+            items.append({
+                "source": SOURCES[k % len(SOURCES)],
+                "title": title if k == 0 else _variant_title(title, rng),
+                # 교차 게시의 절반은 변형된 같은 링크, 나머지는 자체 링크(제목으로만 판별)
+                "url": (
+                    url if k == 0
+                    else _variant_url(url, rng) if rng.random() < 0.5
+                    else f"https://reddit.com/r/x/comments/{stories}x{k}/"
+                ),
+                "score": rng.randrange(1, 1000),
+                "comments": rng.randrange(0, 300),
+            })
+        stories += 1
+    rng.shuffle(items)
+    return items, stories
+
+
+def main():
+    sizes = [int(a) for a in sys.argv[1:]] or [1000, 10000, 50000]
+
+    print(f"\n{'항목':>8} {'실제':>8} {'병합 후':>8} {'시간':>8} {'항목/초':>10}")
+    for n in sizes:
+        items, stories = make_trends(n)
+        started = time.perf_counter()
+        merged = dedup_trends(items)
+        elapsed = time.perf_counter() - started
+        print(f"{n:>8} {stories:>8} {len(merged):>8} {elapsed:>7.2f}s {n / elapsed:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""출력 정리(gc) 벤치마크 — 임시 outputs/에 합성 출력 디렉토리를 만들고 정리 시간 측정
+
+디렉토리마다 frames/ 3장, clips/ 3개, final_shorts.mp4를 만들고 클립 내용은
+작은 풀에서 골라 디렉토리 간 중복을 만든다. 절반은 10일 전에 업로드한 것으로
+기록한다. 첫 실행(해시 + 하드링크 + 삭제)과 두 번째 실행(인덱스 재사용)을 잰다.
+
+사용법:
+    python scripts/bench_gc.py [디렉토리 수 ...]   (기본: 500 2000)
+"""
+import os
+import sys
+import json
+import time
+import random
+import shutil
+import tempfile
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from config import Config  # noqa: E402
+from modules import output_gc  # noqa: E402
+
+CLIP_SIZE = 96 * 1024
+FRAME_SIZE = 8 * 1024
+
+
+def _make_outputs(root: Path, count: int, rng: random.Random):
+    clip_pool = [rng.randbytes(CLIP_SIZE) for _ in range(max(count // 10, 3))]
+    uploaded_at = (datetime.now() - timedelta(days=10)).isoformat(timespec="seconds")
+    for i in range(count):
+        day = date.today() - timedelta(days=2 + i % 30)
+        out = root / f"{day.isoformat()}-topic-{i}"
+        (out / "frames").mkdir(parents=True)
+        (out / "clips").mkdir()
+        for n in range(1, 4):
+            (out / "frames" / f"frame_{n:02d}.png").write_bytes(rng.randbytes(FRAME_SIZE))
+            (out / "clips" / f"clip_{n:02d}.mp4").write_bytes(rng.choice(clip_pool))
+        (out / "final_shorts.mp4").write_bytes(rng.randbytes(CLIP_SIZE))
+        (out / "script.json").write_text("{}")
+        if i % 2 == 0:
+            (out / output_gc.UPLOAD_RECORD).write_text(json.dumps(
+                {"video_id": f"vid{i}", "privacy": "private", "uploaded_at": uploaded_at}
+            ))
+        # 디렉토리 날짜에 마지막으로 수정된 것으로 맞춤 (gc는 수정 시각으로 판단)
+        mtime = datetime.combine(day, datetime.min.time()).timestamp()
+        for dirpath, _, filenames in os.walk(out):
+            for name in filenames:
+                os.utime(os.path.join(dirpath, name), (mtime, mtime))
+
+
+def _disk_usage(root: Path) -> int:
+    seen = set()
+    total = 0
+    for dirpath, _, filenames in os.walk(root):
+        for name in filenames:
+            st = os.lstat(os.path.join(dirpath, name))
+            if st.st_ino not in seen:
+                seen.add(st.st_ino)
+                total += st.st_size
+    return total
+
+
+def bench(count: int):
+    root = Path(tempfile.mkdtemp(prefix="bench-gc-"))
+    Config.OUTPUTS_DIR = root
+    Config.OUTPUT_INDEX_FILE = root / "index.db"
+    Config.JOB_QUEUE_FILE = root / "jobs.db"
+    try:
+        _make_outputs(root, count, random.Random(count))
+        before = _disk_usage(root)
+
+        # 업로드 안 된 절반만 하드링크 효과를 보도록 삭제는 나중에
+        started = time.perf_counter()
+        first = output_gc.collect(days=-1)
+        dedup_time = time.perf_counter() - started
+
+        started = time.perf_counter()
+        second = output_gc.collect(days=7)
+        prune_time = time.perf_counter() - started
+
+        started = time.perf_counter()
+        third = output_gc.collect(days=7)
+        warm_time = time.perf_counter() - started
+
+        after = _disk_usage(root)
+        print(
+            f"{count:>6}개 디렉토리: 중복 제거 {dedup_time:6.2f}초 "
+            f"(해시 {first.hashed}, 링크 {first.linked}) / "
+            f"삭제 {prune_time:5.2f}초 ({len(second.pruned_dirs)}개) / "
+            f"재실행 {warm_time:5.2f}초 (해시 {third.hashed}) / "
+            f"{before / 1e6:.0f}MB → {after / 1e6:.0f}MB"
+        )
+        ok = (
+            third.hashed == 0
+            and len(second.pruned_dirs) == (count + 1) // 2
+            and not third.pruned_dirs
+        )
+        return ok
+    finally:
+        shutil.rmtree(root)
+
+
+def main():
+    counts = [int(a) for a in sys.argv[1:]] or [500, 2000]
+    ok = all([bench(count) for count in counts])
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""Remotion 렌더링 시간 비교 — 원본 Veo 클립 vs 프록시 클립
+
+사용법:
+    python scripts/bench_render.py outputs/2025-01-01-my-topic
+"""
+import sys
+import json
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from modules.compositor import render, load_narration  # noqa: E402
+
+
+def main():
+    if len(sys.argv) != 2:
+        print(__doc__)
+        sys.exit(1)
+
+    output_dir = Path(sys.argv[1]).resolve()
+    with open(output_dir / "script.json", encoding="utf-8") as f:
+        script = json.load(f)
+    clips = sorted(str(p) for p in (output_dir / "clips").glob("clip_*.mp4"))
+
+    narration = load_narration(output_dir)
+
+    results = {}
+    for use_proxies in (False, True):
+        started = time.monotonic()
+        ok = render(
+            script, clips, narration, output_dir, use_proxies=use_proxies, force=True
+        )
+        results[use_proxies] = (time.monotonic() - started, bool(ok))
+
+    print(f"\n클립 {len(clips)}개")
+    for use_proxies, (elapsed, ok) in results.items():
+        label = "프록시 (변환 포함)" if use_proxies else "원본 클립"
+        print(f"  {label:<18} {elapsed:7.1f}초 {'OK' if ok else 'FAIL'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""CLI 시작 시간 벤치마크 — `python -X importtime` 기반 import 예산 검사
+
+사용법:
+    python scripts/bench_startup.py            # 예산 초과 시 exit 1
+    python scripts/bench_startup.py --runs 5   # 5회 측정 중 최솟값 사용
+"""
+import sys
+import json
+import argparse
+import subprocess
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+
+# 서브커맨드별: (시작 시 import되는 모듈, import 예산 ms, 로딩되면 안 되는 모듈)
+GOOGLE_SDKS = ["google.genai", "googleapiclient", "google_auth_oauthlib", "httplib2"]
+
+BUDGETS = {
+    "cli": (["main"], 250, GOOGLE_SDKS),
+    "trends": (["main", "modules.trends"], 400, GOOGLE_SDKS),
+    "upload": (["main", "modules.youtube_uploader"], 1500, ["google.genai"]),
+}
+
+
+def _measure(modules: list[str], forbidden: list[str]) -> tuple[float, list[str]]:
+    """모듈 import 시간(ms)과 로딩된 금지 모듈 목록 반환"""
+    code = (
+        "import sys, json\n"
+        + "".join(f"import {m}\n" for m in modules)
+        + f"print(json.dumps([m for m in {forbidden!r} if m in sys.modules]))\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=str(BASE_DIR),
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+
+    # "import time: self [us] | cumulative | imported package"
+    # 들여쓰기 없는 최상위 항목의 cumulative 합 = 전체 import 시간
+    total_us = 0
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3 or not parts[1].strip().isdigit():
+            continue
+        if parts[2].startswith("  "):
+            continue
+        total_us += int(parts[1])
+
+    loaded = json.loads(result.stdout.strip().splitlines()[-1])
+    return total_us / 1000, loaded
+
+
+def main():
+    parser = argparse.ArgumentParser(description="CLI import 시간 예산 검사")
+    parser.add_argument("--runs", type=int, default=3, help="측정 횟수 (최솟값 사용)")
+    args = parser.parse_args()
+
+    failed = False
+    for name, (modules, budget_ms, forbidden) in BUDGETS.items():
+        try:
+            samples = [_measure(modules, forbidden) for _ in range(args.runs)]
+        except RuntimeError as e:
+            print(f"  {name:<8} 측정 불가: {e}")
+            failed = True
+            continue
+        elapsed = min(ms for ms, _ in samples)
+        loaded = samples[0][1]
+
+        ok = elapsed <= budget_ms and not loaded
+        failed |= not ok
+        mark = "OK  " if ok else "FAIL"
+        print(f"  {mark} {name:<8} {elapsed:7.1f}ms / 예산 {budget_ms}ms")
+        if loaded:
+            print(f"       금지 모듈 로딩됨: {', '.join(loaded)}")
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""프롬프트 캐시 동작 확인 — 실제 API 대신 메모리 안의 가짜 클라이언트로 실행
+
+생성 → 재사용 → 만료 임박 시 TTL 연장 → 서버에서 삭제된 캐시 → 인라인 재시도
+→ 재생성, 그리고 캐시 생성 불가(최소 토큰 미달) 시 인라인 폴백을 확인한다.
+
+사용법:
+    python scripts/check_prompt_cache.py
+"""
+import sys
+import tempfile
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from config import Config  # noqa: E402
+from modules import prompt_registry  # noqa: E402
+from modules.response_parser import generate_json  # noqa: E402
+
+MODEL = "gemini-2.5-flash"
+
+
+class FakeCaches:
+    """client.caches 대역 — 이름/표시 이름/만료 시각만 관리"""
+
+    def __init__(self, min_chars: int = 0):
+        self.min_chars = min_chars
+        self.store: dict[str, SimpleNamespace] = {}
+        self.calls = {"create": 0, "update": 0, "list": 0}
+
+    def create(self, model, config):
+        self.calls["create"] += 1
+        if len(config["system_instruction"]) < self.min_chars:
+            raise ValueError("400 INVALID_ARGUMENT: cached content is too small")
+        name = f"cachedContents/{len(self.store) + 1}"
+        self.store[name] = SimpleNamespace(
+            name=name, display_name=config["display_name"], model=model,
+            system_instruction=config["system_instruction"],
+            expire_time=_expiry(config["ttl"]),
+        )
+        return self.store[name]
+
+    def update(self, name, config):
+        self.calls["update"] += 1
+        if name not in self.store:
+            raise ValueError(f"404 NOT_FOUND: {name}")
+        self.store[name].expire_time = _expiry(config["ttl"])
+        return self.store[name]
+
+    def list(self):
+        self.calls["list"] += 1
+        return list(self.store.values())
+
+
+class FakeModels:
+    """client.models 대역 — 받은 시스템 프롬프트(인라인/캐시)를 기록하고 고정 JSON 반환"""
+
+    def __init__(self, caches: FakeCaches):
+        self.caches = caches
+        self.seen: list[str] = []
+
+    def generate_content_stream(self, model, contents, config):
+        if "cached_content" in config:
+            if config["cached_content"] not in self.caches.store:
+                raise ValueError("403 PERMISSION_DENIED: CachedContent not found")
+            self.seen.append("cached")
+            cached = 1000
+        else:
+            self.seen.append("inline" if config.get("system_instruction") else "none")
+            cached = 0
+        usage = SimpleNamespace(
+            prompt_token_count=1200, candidates_token_count=20,
+            cached_content_token_count=cached,
+        )
+        yield SimpleNamespace(text='{"ok": ', usage_metadata=None)
+        yield SimpleNamespace(text="true}", usage_metadata=usage)
+
+
+def _expiry(ttl: str) -> datetime:
+    return datetime.now(timezone.utc) + timedelta(seconds=int(ttl.rstrip("s")))
+
+
+def _client(min_chars: int = 0) -> SimpleNamespace:
+    caches = FakeCaches(min_chars)
+    return SimpleNamespace(caches=caches, models=FakeModels(caches))
+
+
+def _check(label: str, ok: bool):
+    print(f"  {'OK  ' if ok else 'FAIL'} {label}")
+    if not ok:
+        _check.failed = True
+
+
+def main():
+    _check.failed = False
+    Config.COST_LEDGER_FILE = Path(tempfile.mkdtemp()) / "cost_ledger.db"
+    prompt = prompt_registry.load("script_writer.md")
+
+    print("\n캐시 생성/재사용/연장")
+    client = _client()
+    for _ in range(3):
+        generate_json(client, MODEL, "x", system_prompt=prompt)
+    _check("첫 호출에서 1회 생성 후 재사용", client.caches.calls["create"] == 1)
+    _check("모든 호출이 캐시 참조", client.models.seen == ["cached"] * 3)
+
+    (entry,) = [v for k, v in prompt_registry._caches.items() if k[0] == MODEL]
+    entry["expires"] = datetime.now(timezone.utc) + timedelta(seconds=10)
+    generate_json(client, MODEL, "x", system_prompt=prompt)
+    _check("만료 임박 시 TTL 연장", client.caches.calls["update"] == 1)
+
+    print("\n서버에서 캐시 삭제")
+    client.caches.store.clear()
+    prompt_registry._caches[(MODEL, prompt_registry.prompt_hash(prompt))]["expires"] += (
+        timedelta(hours=1)
+    )
+    result = generate_json(client, MODEL, "x", system_prompt=prompt)
+    _check("인라인으로 재시도해 응답", result == {"ok": True} and client.models.seen[-1] == "inline")
+    generate_json(client, MODEL, "x", system_prompt=prompt)
+    _check("다음 호출에서 재생성", client.caches.calls["create"] == 2 and client.models.seen[-1] == "cached")
+
+    print("\n다른 프로세스가 만든 캐시 재사용")
+    prompt_registry._caches.clear()
+    generate_json(client, MODEL, "x", system_prompt=prompt)
+    _check("목록에서 찾아 재사용 (생성 없음)", client.caches.calls["create"] == 2)
+
+    print("\n캐시 생성 불가 (최소 토큰 미달)")
+    prompt_registry._caches.clear()
+    client = _client(min_chars=10**6)
+    for _ in range(2):
+        generate_json(client, MODEL, "x", system_prompt=prompt)
+    _check("인라인 폴백", client.models.seen == ["inline", "inline"])
+    _check("생성은 한 번만 시도", client.caches.calls["create"] == 1)
+
+    sys.exit(1 if _check.failed else 0)
+
+
+if __name__ == "__main__":
+    main()